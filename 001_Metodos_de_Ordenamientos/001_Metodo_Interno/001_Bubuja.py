@@ -40,7 +40,8 @@ def bubble_sort_simulacion(arr):
     return arr
 
 # --- Ejemplo de Uso ---
-datos = [5, 1, 4, 2, 8]
-print("INICIO DEL ORDENAMIENTO BURBUJA\n")
-lista_ordenada = bubble_sort_simulacion(datos)
-print(f"\nResultado Final: {lista_ordenada}")
+if __name__ == "__main__":
+    datos = [5, 1, 4, 2, 8]
+    print("INICIO DEL ORDENAMIENTO BURBUJA\n")
+    lista_ordenada = bubble_sort_simulacion(datos)
+    print(f"\nResultado Final: {lista_ordenada}")
@@ -36,7 +36,8 @@ def insertion_sort_simulacion_corregida(arr):
     return arr
 
 # --- Ejemplo de Uso ---
-datos = [5, 1, 4, 2, 8]
-print("INICIO DEL ORDENAMIENTO POR INSERCIÓN (Corregido)\n")
-lista_ordenada = insertion_sort_simulacion_corregida(datos)
-print(f"\nResultado Final: {lista_ordenada}")
+if __name__ == "__main__":
+    datos = [5, 1, 4, 2, 8]
+    print("INICIO DEL ORDENAMIENTO POR INSERCIÓN (Corregido)\n")
+    lista_ordenada = insertion_sort_simulacion_corregida(datos)
+    print(f"\nResultado Final: {lista_ordenada}")
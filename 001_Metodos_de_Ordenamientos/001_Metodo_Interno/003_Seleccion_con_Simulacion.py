@@ -35,7 +35,8 @@ def selection_sort_simulacion(arr):
     return arr
 
 # --- Ejemplo de Uso ---
-datos = [64, 25, 12, 22, 11]
-print("INICIO DEL ORDENAMIENTO POR SELECCIÓN\n")
-lista_ordenada = selection_sort_simulacion(datos)
-print(f"\nResultado Final: {lista_ordenada}")
+if __name__ == "__main__":
+    datos = [64, 25, 12, 22, 11]
+    print("INICIO DEL ORDENAMIENTO POR SELECCIÓN\n")
+    lista_ordenada = selection_sort_simulacion(datos)
+    print(f"\nResultado Final: {lista_ordenada}")
@@ -57,10 +57,11 @@ def _partition(arr, low, high):
     return i + 1
 
 # --- Ejemplo de Uso ---
-datos = [10, 80, 30, 90, 40, 50, 70]
-print("INICIO DEL ORDENAMIENTO QUICK SORT")
-print(f"Lista inicial: {datos}")
+if __name__ == "__main__":
+    datos = [10, 80, 30, 90, 40, 50, 70]
+    print("INICIO DEL ORDENAMIENTO QUICK SORT")
+    print(f"Lista inicial: {datos}")
 
-lista_ordenada = quicksort(datos)
+    lista_ordenada = quicksort(datos)
 
-print(f"Resultado Final: {lista_ordenada}")
+    print(f"Resultado Final: {lista_ordenada}")
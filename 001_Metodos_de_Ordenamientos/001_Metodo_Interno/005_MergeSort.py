@@ -41,10 +41,11 @@ def merge_sort(arr):
             k += 1
 
 # --- Ejemplo de Uso ---
-datos = [38, 27, 43, 3, 9, 82, 10]
-print("INICIO DEL ORDENAMIENTO MERGESORT")
-print(f"Lista inicial: {datos}")
+if __name__ == "__main__":
+    datos = [38, 27, 43, 3, 9, 82, 10]
+    print("INICIO DEL ORDENAMIENTO MERGESORT")
+    print(f"Lista inicial: {datos}")
 
-merge_sort(datos)
+    merge_sort(datos)
 
-print(f"Resultado Final: {datos}")
+    print(f"Resultado Final: {datos}")
@@ -29,3 +29,30 @@ def counting_sort_by_digit(arr, exp):
     for i in range(n):
         arr[i] = output[i]
 
+def radix_sort(arr):
+    """
+    Implementa RadixSort (LSD) para enteros no negativos: aplica el
+    Ordenamiento por Cuentas dígito por dígito, desde las unidades
+    hasta el dígito más significativo del mayor valor.
+    """
+    if not arr:
+        return arr
+    if min(arr) < 0:
+        raise ValueError("radix_sort solo ordena enteros no negativos.")
+
+    max_val = max(arr)
+    exp = 1  # 1 = unidades, 10 = decenas, 100 = centenas, ...
+    while max_val // exp > 0:
+        counting_sort_by_digit(arr, exp)
+        exp *= 10
+    return arr
+
+# --- Ejemplo de Uso ---
+if __name__ == "__main__":
+    datos = [170, 45, 75, 90, 802, 24, 2, 66]
+    print("INICIO DEL ORDENAMIENTO RADIX SORT")
+    print(f"Lista inicial: {datos}")
+
+    lista_ordenada = radix_sort(datos)
+
+    print(f"Resultado Final: {lista_ordenada}")
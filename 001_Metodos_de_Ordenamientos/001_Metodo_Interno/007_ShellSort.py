@@ -43,9 +43,10 @@ def shell_sort_simulacion(arr):
     return arr
 
 # --- Ejemplo de Uso ---
-datos = [12, 34, 54, 2, 3]
-print("INICIO DEL ORDENAMIENTO SHELLSORT\n")
+if __name__ == "__main__":
+    datos = [12, 34, 54, 2, 3]
+    print("INICIO DEL ORDENAMIENTO SHELLSORT\n")
 
-lista_ordenada = shell_sort_simulacion(datos)
+    lista_ordenada = shell_sort_simulacion(datos)
 
-print(f"\nResultado Final: {lista_ordenada}")
+    print(f"\nResultado Final: {lista_ordenada}")
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+008_SampleSort_Paralelo.py
+
+Sample sort en paralelo para arreglos grandes en memoria (numpy).
+
+Los demás métodos de esta carpeta (quicksort, merge_sort, shell_sort, ...)
+usan un solo núcleo. Aquí el arreglo se reparte en cubetas por rango de
+valores y cada cubeta se ordena en un proceso distinto:
+
+  1. Muestreo: se toma una sobremuestra aleatoria (sobremuestreo elementos
+     por cubeta), se ordena y se eligen k-1 divisores equiespaciados.
+  2. Partición: cada proceso calcula la cubeta de su bloque con un solo
+     np.searchsorted vectorizado y su histograma; con las sumas prefijas
+     cada bloque sabe dónde escribir cada cubeta y copia sus elementos
+     directamente a su lugar en el búfer de salida.
+  3. Ordenamiento: cada cubeta es un tramo contiguo del búfer de salida y
+     se ordena en el lugar (ndarray.sort) en algún proceso del pool.
+  4. Concatenación: no hace falta; las cubetas ya quedaron una detrás de
+     otra. Solo se copia una vez el resultado fuera de la memoria compartida.
+
+Datos, cubetas y salida viven en multiprocessing.shared_memory (ver
+ArreglosCompartidos en ia3/compartido.py): los procesos no copian
+ni serializan el arreglo.
+
+El resultado es el mismo que sorted() (para claves numéricas sin NaN).
+
+Requisitos:
+- numpy
+
+Uso:
+  python 008_SampleSort_Paralelo.py                      -> ejemplo pequeño
+  python 008_SampleSort_Paralelo.py --benchmark          -> curva de aceleración, 1e7 claves int64
+  python 008_SampleSort_Paralelo.py --benchmark 1e7 1e8 1e9
+"""
+import os
+import sys
+import time
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from ia3 import crear_pool  # noqa: E402
+from ia3.compartido import ArreglosCompartidos, arreglos_trabajador, cerrar_trabajador, iniciar_trabajador  # noqa: E402
+
+MAX_CUBETAS = 1 << 16  # el número de cubeta se guarda en 16 bits
+
+
+# -------------------------
+# Trabajo por bloque / por cubeta
+# -------------------------
+def _clasificar_bloque(args) -> np.ndarray:
+    """Paso 2a: cubeta de cada elemento de datos[inicio:fin] y el histograma del bloque."""
+    inicio, fin = args
+    a = arreglos_trabajador()
+    divisores = a["divisores"]
+    ids = np.searchsorted(divisores, a["datos"][inicio:fin], side="right").astype(np.uint16)
+    a["cubeta"][inicio:fin] = ids
+    return np.bincount(ids, minlength=len(divisores) + 1)
+
+
+def _repartir_bloque(args):
+    """
+    Paso 2b: copia los elementos de datos[inicio:fin] a 'salida'. destinos[c]
+    es donde empieza, dentro de la cubeta c, el tramo que le toca a este bloque.
+    """
+    inicio, fin, destinos, conteo = args
+    a = arreglos_trabajador()
+    ids = a["cubeta"][inicio:fin]
+    # con claves de 16 bits el orden estable de numpy es radix sort (O(n))
+    valores = a["datos"][inicio:fin][np.argsort(ids, kind="stable")]
+    salida = a["salida"]
+    pos = 0
+    for destino, c in zip(destinos.tolist(), conteo.tolist()):
+        if c:
+            salida[destino:destino + c] = valores[pos:pos + c]
+            pos += c
+
+
+def _ordenar_cubeta(args) -> int:
+    """Paso 3: ordena en el lugar el tramo salida[inicio:fin]."""
+    inicio, fin = args
+    arreglos_trabajador()["salida"][inicio:fin].sort()
+    return fin - inicio
+
+
+# -------------------------
+# Sample sort
+# -------------------------
+def sample_sort(datos, procesos: Optional[int] = None, sobremuestreo: int = 32, cubetas_por_proceso: int = 4,
+                seed: int = 0, tiempos: Optional[Dict[str, float]] = None) -> np.ndarray:
+    """
+    Ordena 'datos' (lista o arreglo 1-D numérico) con sample sort en paralelo.
+
+    procesos: tamaño del pool (por defecto os.cpu_count(); 1 = sin pool).
+    sobremuestreo: elementos de la muestra por cubeta (más = cubetas más parejas).
+    cubetas_por_proceso: más cubetas que procesos reparten mejor la carga.
+    tiempos: si se pasa un dict, se llena con el tiempo de cada paso y el
+             tamaño de la cubeta más grande.
+
+    Devuelve un ndarray nuevo, ordenado; 'datos' no se modifica.
+    """
+    arr = np.asarray(datos)
+    if arr.ndim != 1:
+        raise ValueError("sample_sort ordena arreglos de una dimensión.")
+    n = len(arr)
+    procesos = procesos or os.cpu_count() or 1
+    k = max(1, min(procesos * cubetas_por_proceso, MAX_CUBETAS, n))
+    if tiempos is None:
+        tiempos = {}
+    if n < 2:
+        return arr.copy()
+
+    compartido = ArreglosCompartidos()
+    pool = None
+    try:
+        # 1. divisores a partir de una sobremuestra ordenada
+        t0 = time.perf_counter()
+        rng = np.random.default_rng(seed)
+        muestra = np.sort(arr[rng.integers(0, n, k * sobremuestreo)])
+        divisores = muestra[sobremuestreo::sobremuestreo][:k - 1]
+        compartido.crear("datos", arr)
+        compartido.crear("divisores", divisores)
+        compartido.crear_vacio("cubeta", n, np.uint16)
+        salida = compartido.crear_vacio("salida", n, arr.dtype)
+        if procesos > 1:
+            pool = crear_pool(procesos, initializer=iniciar_trabajador, initargs=(compartido.descriptor,))
+            mapear = pool.map
+        else:
+            iniciar_trabajador(compartido.descriptor)
+            mapear = lambda f, xs: [f(x) for x in xs]
+        t1 = time.perf_counter()
+
+        # 2. partición: histogramas por bloque -> desplazamientos -> reparto
+        tam = -(-n // (procesos * 4))
+        bloques = [(i, min(i + tam, n)) for i in range(0, n, tam)]
+        conteos = np.array(mapear(_clasificar_bloque, bloques), dtype=np.int64)  # bloques x cubetas
+        por_cubeta = conteos.sum(axis=0)
+        inicio_cubeta = np.concatenate(([0], np.cumsum(por_cubeta)))
+        # dentro de cada cubeta, los bloques escriben en orden: suma prefija por columnas
+        destinos = inicio_cubeta[:-1] + np.cumsum(conteos, axis=0) - conteos
+        mapear(_repartir_bloque, [(a, b, destinos[i], conteos[i]) for i, (a, b) in enumerate(bloques)])
+        t2 = time.perf_counter()
+
+        # 3. cada cubeta se ordena en su tramo (las grandes primero, para equilibrar)
+        tramos = [(int(inicio_cubeta[c]), int(inicio_cubeta[c + 1])) for c in np.argsort(-por_cubeta)
+                  if por_cubeta[c] > 1]
+        mapear(_ordenar_cubeta, tramos)
+        t3 = time.perf_counter()
+
+        # 4. las cubetas ya están concatenadas en 'salida'
+        resultado = salida.copy()
+        t4 = time.perf_counter()
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+        else:
+            cerrar_trabajador()
+        compartido.cerrar(liberar=True)
+
+    tiempos.update({"muestreo_s": t1 - t0, "particion_s": t2 - t1, "ordenamiento_s": t3 - t2,
+                    "copia_s": t4 - t3, "cubetas": k, "cubeta_max": int(por_cubeta.max())})
+    return resultado
+
+
+# -------------------------
+# Benchmark
+# -------------------------
+def _memoria_libre() -> Optional[int]:
+    try:
+        return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
+    except (ValueError, OSError, AttributeError):
+        return None
+
+
+def benchmark(tamaños: Sequence[int] = (10 ** 7,), seed: int = 0):
+    """Aceleración respecto a np.sort (un núcleo) para 1..cpu_count procesos."""
+    cpus = os.cpu_count() or 1
+    print(f"Benchmark sample sort paralelo (int64, {cpus} CPU)")
+    for n in tamaños:
+        # datos + búferes compartidos (datos, salida, cubetas) + resultado
+        necesaria = n * (8 * 4 + 2)
+        libre = _memoria_libre()
+        if libre is not None and necesaria > libre:
+            print(f"  n={n:.0e}: omitido, necesita ~{necesaria / 2 ** 30:.1f} GiB y hay {libre / 2 ** 30:.1f} GiB libres")
+            continue
+        rng = np.random.default_rng(seed)
+        datos = rng.integers(np.iinfo(np.int64).min, np.iinfo(np.int64).max, n, dtype=np.int64)
+        t0 = time.perf_counter()
+        esperado = np.sort(datos)
+        t_base = time.perf_counter() - t0
+        print(f"  n={n:.0e}: np.sort {t_base:.2f} s")
+        t_uno = None
+        for p in range(1, cpus + 1):
+            tiempos: Dict[str, float] = {}
+            t0 = time.perf_counter()
+            ordenado = sample_sort(datos, procesos=p, tiempos=tiempos)
+            t = time.perf_counter() - t0
+            t_uno = t_uno or t
+            if not np.array_equal(ordenado, esperado):
+                raise AssertionError("sample_sort no coincide con np.sort")
+            del ordenado
+            print(f"    procesos={p:<3} {t:7.2f} s  aceleración vs np.sort={t_base / t:5.2f}x, "
+                  f"vs 1 proceso={t_uno / t:5.2f}x  (partición {tiempos['particion_s']:.2f} s, "
+                  f"ordenamiento {tiempos['ordenamiento_s']:.2f} s, copia {tiempos['copia_s']:.2f} s, "
+                  f"cubeta máx. {tiempos['cubeta_max'] / n:.1%})")
+        del datos, esperado
+
+
+def ejemplo():
+    import random
+    datos = [random.randint(-1000, 1000) for _ in range(40)]
+    print(f"Lista inicial: {datos}")
+    tiempos: Dict[str, float] = {}
+    ordenado = sample_sort(datos, procesos=2, tiempos=tiempos)
+    print(f"Resultado Final: {ordenado.tolist()}")
+    print(f"Igual a sorted(): {ordenado.tolist() == sorted(datos)}; "
+          f"{tiempos['cubetas']} cubetas, la más grande con {tiempos['cubeta_max']} elementos")
+
+
+if __name__ == "__main__":
+    if "--benchmark" in sys.argv:
+        tamaños = [int(float(x)) for x in sys.argv[sys.argv.index("--benchmark") + 1:]]
+        benchmark(tamaños or (10 ** 7,))
+    else:
+        ejemplo()
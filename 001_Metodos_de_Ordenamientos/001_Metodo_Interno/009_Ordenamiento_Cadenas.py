@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+009_Ordenamiento_Cadenas.py
+
+Ordenamiento de cadenas y tuplas con prefijos comunes largos (URLs, rutas).
+
+006_RadixSort.py solo maneja enteros no negativos y _partition de
+004_QuickSort.py compara claves completas: con prefijos comunes largos cada
+comparación vuelve a recorrer los mismos primeros caracteres. Aquí las
+claves se tratan como secuencias (bytes de la cadena o campos de la tupla)
+y se examina un solo elemento por nivel:
+
+- msd_radix_sort: radix por el dígito más significativo (MSD). Reparte en
+  cubetas por el byte d, ordena las cubetas y sigue con d+1 en cada una.
+  Si todo el grupo cae en una sola cubeta, salta de una vez el prefijo
+  común del grupo (calculado con min/max) en lugar de avanzar byte a byte.
+  Los grupos chicos (<= cutoff) se terminan con inserción.
+- multikey_quicksort: quicksort de tres vías de Bentley-Sedgewick sobre el
+  elemento d: "<" y ">" siguen en d, "=" avanza a d+1 (con el mismo salto
+  de prefijo cuando todo el grupo es "=").
+- ordenar_cadenas(..., key=fn): decorate-sort-undecorate. key se evalúa una
+  sola vez por elemento (no en cada comparación) y se ordenan los pares
+  (clave, elemento).
+
+Las cadenas se codifican en UTF-8, cuyo orden de bytes es el mismo que el
+de los puntos de código, así que el resultado es idéntico a sorted() (los
+dos métodos son estables, también con reverse=True). Las tuplas se
+comparan campo por campo, como en sorted().
+
+En CPython sorted() compara cadenas en C y sigue siendo más rápido (ver
+--benchmark): estos métodos cuestan O(n) operaciones de Python por nivel.
+Lo que sí se gana frente a un comparador (functools.cmp_to_key) es evaluar
+key n veces en lugar de O(n log n).
+
+Uso:
+  python 009_Ordenamiento_Cadenas.py               -> ejemplo pequeño
+  python 009_Ordenamiento_Cadenas.py --benchmark   -> comparación con sorted() (200 000 claves)
+"""
+import functools
+import os
+import random
+import sys
+import time
+from typing import Any, Callable, Iterable, List, Optional, Sequence, Tuple
+
+Registro = Tuple[Sequence, Any]  # (clave como secuencia, elemento original)
+
+CUTOFF = 16
+
+
+def _decorar(items: Iterable, key: Optional[Callable]) -> List[Registro]:
+    """Calcula cada clave una sola vez; las str pasan a bytes UTF-8 (mismo orden)."""
+    regs = []
+    for x in items:
+        k = x if key is None else key(x)
+        if isinstance(k, str):
+            k = k.encode("utf-8", "surrogatepass")
+        regs.append((k, x))
+    return regs
+
+
+def _insercion(grupo: List[Registro]) -> List[Registro]:
+    """Inserción estable comparando la clave completa (el prefijo ya es común)."""
+    for i in range(1, len(grupo)):
+        r = grupo[i]
+        k = r[0]
+        j = i - 1
+        while j >= 0 and k < grupo[j][0]:
+            grupo[j + 1] = grupo[j]
+            j -= 1
+        grupo[j + 1] = r
+    return grupo
+
+
+def _prefijo_comun(a: Sequence, b: Sequence, desde: int) -> int:
+    """Primera posición >= desde en la que a y b difieren (o el largo del más corto)."""
+    fin = min(len(a), len(b))
+    i = desde
+    while i < fin and a[i] == b[i]:
+        i += 1
+    return i
+
+
+# -------------------------
+# MSD radix
+# -------------------------
+def _msd(regs: List[Registro], cutoff: int) -> List[Registro]:
+    salida: List[Registro] = []
+    # pila explícita (sin límite de recursión); las cubetas se apilan en orden
+    # inverso para que la menor se procese y se emita primero
+    pila = [(regs, 0)]
+    while pila:
+        grupo, d = pila.pop()
+        if len(grupo) <= cutoff:
+            salida.extend(_insercion(grupo))
+            continue
+        cubetas = {}
+        terminados = []
+        for r in grupo:
+            k = r[0]
+            if len(k) > d:
+                c = k[d]
+                cubeta = cubetas.get(c)
+                if cubeta is None:
+                    cubetas[c] = [r]
+                else:
+                    cubeta.append(r)
+            else:
+                terminados.append(r)  # la clave termina aquí: va antes que las demás
+        salida.extend(terminados)
+        if len(cubetas) == 1 and not terminados:
+            # todo el grupo comparte el elemento d: saltar el prefijo común entero
+            claves = [r[0] for r in grupo]
+            pila.append((grupo, _prefijo_comun(min(claves), max(claves), d + 1)))
+            continue
+        for c in sorted(cubetas, reverse=True):
+            pila.append((cubetas[c], d + 1))
+    return salida
+
+
+# -------------------------
+# Multikey quicksort (Bentley-Sedgewick)
+# -------------------------
+def _mkqs(regs: List[Registro], cutoff: int) -> List[Registro]:
+    salida: List[Registro] = []
+    pila = [(regs, 0)]
+    while pila:
+        grupo, d = pila.pop()
+        if len(grupo) > cutoff and any(len(r[0]) <= d for r in grupo):
+            terminados = [r for r in grupo if len(r[0]) <= d]
+            salida.extend(terminados)
+            grupo = [r for r in grupo if len(r[0]) > d]
+        if len(grupo) <= cutoff:
+            salida.extend(_insercion(grupo))
+            continue
+        # pivote: mediana de tres del elemento d
+        a, b, c = grupo[0][0][d], grupo[len(grupo) // 2][0][d], grupo[-1][0][d]
+        pivote = sorted((a, b, c))[1]
+        menores, iguales, mayores = [], [], []
+        for r in grupo:
+            x = r[0][d]
+            if x < pivote:
+                menores.append(r)
+            elif x == pivote:
+                iguales.append(r)
+            else:
+                mayores.append(r)
+        if len(iguales) == len(grupo):
+            # el pivote era el único valor: saltar el prefijo común entero, como en _msd
+            claves = [r[0] for r in grupo]
+            pila.append((grupo, _prefijo_comun(min(claves), max(claves), d + 1)))
+            continue
+        pila.append((mayores, d))
+        pila.append((iguales, d + 1))
+        pila.append((menores, d))
+    return salida
+
+
+# -------------------------
+# Interfaz
+# -------------------------
+METODOS = {"radix": _msd, "multikey": _mkqs}
+
+
+def ordenar_cadenas(items: Iterable, key: Optional[Callable] = None, reverse: bool = False,
+                    metodo: str = "radix", cutoff: int = CUTOFF) -> list:
+    """
+    Como sorted(items, key=key, reverse=reverse) para cadenas (str o bytes)
+    y tuplas, con metodo="radix" (MSD) o "multikey" (quicksort de tres vías).
+    key se llama exactamente una vez por elemento.
+    """
+    if metodo not in METODOS:
+        raise ValueError(f"metodo debe ser uno de {tuple(METODOS)}.")
+    items = list(items)
+    if reverse:
+        items.reverse()  # así los iguales conservan su orden, como en sorted()
+    regs = METODOS[metodo](_decorar(items, key), cutoff)
+    resultado = [x for _, x in regs]
+    if reverse:
+        resultado.reverse()
+    return resultado
+
+
+def msd_radix_sort(items: Iterable, key: Optional[Callable] = None, cutoff: int = CUTOFF) -> list:
+    return ordenar_cadenas(items, key=key, metodo="radix", cutoff=cutoff)
+
+
+def multikey_quicksort(items: Iterable, key: Optional[Callable] = None, cutoff: int = CUTOFF) -> list:
+    return ordenar_cadenas(items, key=key, metodo="multikey", cutoff=cutoff)
+
+
+# -------------------------
+# Benchmark
+# -------------------------
+def datos_benchmark(n: int, seed: int = 0):
+    """Conjuntos con prefijos comunes largos (y uno sin prefijos, de referencia)."""
+    rnd = random.Random(seed)
+    carpetas = ["datos", "modelos", "resultados", "figuras", "cache"]
+    urls = [f"https://www.ejemplo.com/api/v2/usuarios/{rnd.randrange(10 ** 6):07d}/pedidos/{rnd.randrange(500)}"
+            for _ in range(n)]
+    rutas = [f"/home/alumno/proyectos/ia3/{rnd.choice(carpetas)}/{rnd.randrange(2020, 2026)}/"
+             f"{rnd.choice(carpetas)}/archivo_{rnd.randrange(10 ** 5):05d}.csv" for _ in range(n)]
+    letras = "abcdefghijklmnopqrstuvwxyz"
+    aleatorias = ["".join(rnd.choices(letras, k=rnd.randint(8, 20))) for _ in range(n)]
+    tuplas = [(rnd.choice(carpetas), rnd.randrange(100), f"id{rnd.randrange(10 ** 4)}") for _ in range(n)]
+    return {"urls": urls, "rutas": rutas, "aleatorias": aleatorias, "tuplas": tuplas}
+
+
+def benchmark(n: int = 200_000, seed: int = 0):
+    print(f"Benchmark ordenamiento de cadenas: n={n}")
+    print(f"  {'datos':<24} {'método':<18} {'tiempo (s)':>10} {'vs sorted':>10}")
+    for nombre, datos in datos_benchmark(n, seed).items():
+        t0 = time.perf_counter()
+        esperado = sorted(datos)
+        t_ref = time.perf_counter() - t0
+        print(f"  {nombre:<24} {'sorted()':<18} {t_ref:>10.3f} {1:>9.2f}x")
+        for metodo in METODOS:
+            t0 = time.perf_counter()
+            r = ordenar_cadenas(datos, metodo=metodo)
+            t = time.perf_counter() - t0
+            assert r == esperado, (nombre, metodo)
+            print(f"  {'':<24} {metodo:<18} {t:>10.3f} {t_ref / t:>9.2f}x")
+
+    # key costosa: DSU la evalúa n veces; un comparador la evalúa en cada comparación
+    from urllib.parse import urlsplit
+    llamadas = [0]
+
+    def ruta(u):
+        llamadas[0] += 1
+        return urlsplit(u).path
+
+    def cmp(a, b):
+        ka, kb = ruta(a), ruta(b)
+        return (ka > kb) - (ka < kb)
+
+    urls = datos_benchmark(n, seed)["urls"]
+    print(f"  {'urls, key=urlsplit.path':<24} {'método':<18} {'tiempo (s)':>10} {'llamadas a key':>15}")
+    esperado = sorted(urls, key=lambda u: urlsplit(u).path)
+    for etiqueta, ordenar in (("sorted(key=)", lambda: sorted(urls, key=ruta)),
+                              ("comparador", lambda: sorted(urls, key=functools.cmp_to_key(cmp))),
+                              ("radix (DSU)", lambda: ordenar_cadenas(urls, key=ruta)),
+                              ("multikey (DSU)", lambda: ordenar_cadenas(urls, key=ruta, metodo="multikey"))):
+        llamadas[0] = 0
+        t0 = time.perf_counter()
+        r = ordenar()
+        t = time.perf_counter() - t0
+        assert r == esperado, etiqueta
+        print(f"  {'':<24} {etiqueta:<18} {t:>10.3f} {llamadas[0]:>15}")
+
+
+def ejemplo():
+    urls = [
+        "https://www.ejemplo.com/api/v2/usuarios/17/pedidos",
+        "https://www.ejemplo.com/api/v2/usuarios/17",
+        "https://www.ejemplo.com/api/v1/usuarios/3",
+        "https://www.ejemplo.com/api/v2/usuarios/170/pedidos",
+        "https://www.ejemplo.com/api/v2/productos/9",
+        "https://www.ejemplo.com/api/v2/usuarios/17/pedidos",
+        "https://www.ejemplo.com/",
+        "https://www.ejemplo.com/api/v2/usuarios/ñandú",
+    ]
+    print("Lista inicial:")
+    for u in urls:
+        print(f"  {u}")
+    for metodo in METODOS:
+        r = ordenar_cadenas(urls, metodo=metodo, cutoff=2)
+        print(f"\n{metodo}: igual a sorted() = {r == sorted(urls)}")
+    print("\nResultado Final:")
+    for u in msd_radix_sort(urls, cutoff=2):
+        print(f"  {u}")
+
+    tuplas = [("b", 2, "x"), ("a", 10, "z"), ("b", 1, "y"), ("a", 10, "a"), ("a",)]
+    print(f"\nTuplas: {multikey_quicksort(tuplas, cutoff=1)}")
+    print(f"Por la última parte de la ruta (key=, reverse=True): "
+          f"{ordenar_cadenas(urls, key=lambda u: os.path.basename(u), reverse=True)[:3]}")
+
+
+if __name__ == "__main__":
+    if "--benchmark" in sys.argv:
+        benchmark()
+    else:
+        ejemplo()
@@ -1,4 +1,14 @@
+import heapq
+import os
 import random
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from ia3 import cargar  # noqa: E402
+
+
+# Runs en disco con compresión (parámetro codec=, ver 006_Codec_Runs.py)
+_codec = cargar("codec_runs")
 
 # --- Función Auxiliar 1: Ordenamiento Interno (Para ordenar los 'runs' iniciales) ---
 def merge_sort_interno(arr):
@@ -26,10 +36,15 @@ def merge_sort_interno(arr):
     return arr
 
 # --- Función Auxiliar 2: Función de Mezcla (Merge) ---
-def merge(run1, run2):
+def merge(run1, run2, unique=False, reduce=None):
     """
     Combina (intercala) dos secuencias ordenadas en una sola secuencia ordenada.
+    unique=True: los elementos iguales quedan una sola vez.
+    reduce=fn: los elementos son pares (clave, valor) y los de igual clave se
+    combinan en (clave, fn(v1, v2)) (ver combinar_iguales en 006_Codec_Runs.py).
     """
+    if unique or reduce is not None:
+        return list(_codec.combinar_iguales(heapq.merge(run1, run2), unique, reduce))
     merged = []
     i = j = 0
     while i < len(run1) and j < len(run2):
@@ -45,13 +60,67 @@ def merge(run1, run2):
     merged.extend(run2[j:])
     return merged
 
+def merge_en_disco(run1, run2, escritor, unique=False):
+    """
+    Como merge, pero las runs se leen en streaming (un bloque a la vez) y el
+    resultado se escribe en 'escritor' (un EscritorRun). Devuelve la run nueva.
+    """
+    if unique:
+        escritor.extender(_codec.combinar_iguales(heapq.merge(run1, run2), unique=True))
+        return escritor.cerrar()
+    fin = object()
+    it1, it2 = iter(run1), iter(run2)
+    a, b = next(it1, fin), next(it2, fin)
+    while a is not fin and b is not fin:
+        if a < b:
+            escritor.escribir(a)
+            a = next(it1, fin)
+        else:
+            escritor.escribir(b)
+            b = next(it2, fin)
+
+    # Agrega los elementos restantes (solo una de las dos runs tendrá sobrantes)
+    if a is not fin:
+        escritor.escribir(a)
+        escritor.extender(it1)
+    if b is not fin:
+        escritor.escribir(b)
+        escritor.extender(it2)
+    return escritor.cerrar()
+
+def _run_inicial(bloque, unique, reduce):
+    """Ordena un bloque en "RAM" y, si se pide, junta ahí mismo las claves repetidas."""
+    run = merge_sort_interno(bloque)
+    if unique or reduce is not None:
+        run = list(_codec.combinar_iguales(run, unique, reduce))
+    return run
+
 # --- Función Principal: Straight Merging Sort ---
-def straight_merging_sort(external_data, run_size):
+def straight_merging_sort(external_data, run_size, codec=None, directorio=None, unique=False, reduce=None,
+                          stats=None, procesos=None):
     """
     Implementa el Straight Merging (Mezcla Directa).
     'run_size' simula el tamaño de bloque que cabe en memoria.
+    'codec' ("raw", "varint", "for", con "+zlib" opcional): las runs se guardan
+    en archivos comprimidos (en 'directorio' o en uno temporal) y las mezclas
+    los leen por bloques. Sin codec, las runs son listas en memoria.
+    Con codec y 'directorio', ver reanudar_straight_merging.
+    'unique' / 'reduce': las claves repetidas se juntan al generar las runs y
+    en cada mezcla (ver merge), así cada pasada mueve menos datos. 'stats'
+    (dict) recibe "ahorro_por_pasada": bytes ahorrados en la generación de
+    runs (posición 0) y en cada pasada de mezcla.
+    'procesos': la mezcla de la última pasada se reparte por rangos de claves
+    entre ese número de procesos (ver 008_Mezcla_Particionada.py); el
+    resultado es el mismo.
     """
+    if procesos is not None and (unique or reduce is not None):
+        raise ValueError("procesos= no se puede usar con unique= ni reduce=: los tramos se mezclan por separado.")
+    if codec is not None:
+        if reduce is not None:
+            raise ValueError("reduce= no se puede usar con codec=: los archivos de runs guardan claves enteras.")
+        return _straight_merging_en_disco(external_data, run_size, codec, directorio, unique, stats, procesos)
     n = len(external_data)
+    ahorro = []  # elementos eliminados por pasada (0 = generación de runs)
     
     # 1. Fase Inicial: Distribución y Ordenamiento de Runs (Bloques internos)
     runs = []
@@ -60,16 +129,19 @@ def straight_merging_sort(external_data, run_size):
         # Lee un bloque (run) del "disco"
         run = external_data[i:i + run_size]
         # Ordena el bloque en "RAM"
-        run_ordenada = merge_sort_interno(run)
+        run_ordenada = _run_inicial(run, unique, reduce)
         # Escribe el bloque ordenado de vuelta al "disco"
         runs.append(run_ordenada)
         print(f"  Run ordenada: {run_ordenada}")
+    ahorro.append(n - sum(len(run) for run in runs))
+    if unique or reduce is not None:
+        _codec.informar_ahorro(ahorro, reduce)
     
     # 2. Fase de Mezcla Repetitiva (Merges Sucesivos)
     longitud_secuencia = run_size # La longitud de las secuencias a mezclar
     
     # Bucle que se ejecuta mientras no todas las runs estén en una sola secuencia
-    while len(runs) > 1 or (len(runs) == 1 and len(runs[0]) < n):
+    while len(runs) > 1:
         new_runs = []
         print(f"\nFASE 2: Mezcla (Merge) - Mezclando secuencias de tamaño {longitud_secuencia}")
         
@@ -80,27 +152,138 @@ def straight_merging_sort(external_data, run_size):
             # Intenta tomar la run2; si no existe, run2 es una lista vacía
             run2 = runs[i + 1] if i + 1 < len(runs) else []
             
-            merged_run = merge(run1, run2)
+            if procesos is not None and len(runs) == 2:
+                merged_run = cargar("mezcla_particionada").mezcla_particionada(runs, procesos=procesos)
+            else:
+                merged_run = merge(run1, run2, unique, reduce)
             new_runs.append(merged_run)
             
             print(f"  Mezclando: {run1} y {run2} -> {merged_run}")
             
+        ahorro.append(sum(len(run) for run in runs) - sum(len(run) for run in new_runs))
+        if unique or reduce is not None:
+            _codec.informar_ahorro(ahorro, reduce)
         runs = new_runs
         
         # La longitud de las secuencias ordenadas se duplica en cada pasada
         longitud_secuencia *= 2 
 
+    if stats is not None:
+        stats["ahorro_por_pasada"] = [_codec.bytes_elementos(a, reduce) for a in ahorro]
     return runs[0] if runs else []
 
+def _straight_merging_en_disco(external_data, run_size, codec, directorio, unique=False, stats=None, procesos=None):
+    """
+    straight_merging_sort con las runs en archivos (ver 006_Codec_Runs.py).
+    Con un 'directorio' propio guarda un manifiesto después de cada mezcla,
+    para poder seguir con reanudar_straight_merging si el proceso se interrumpe.
+    """
+    almacen = _codec.almacen_para(codec, directorio)
+    try:
+        n = len(external_data)
+        runs = []
+        print(f"FASE 1: Ordenamiento Interno de Runs Iniciales (codec {almacen.codec.nombre})")
+        for i in range(0, n, run_size):
+            run = almacen.escribir(_run_inicial(external_data[i:i + run_size], unique, None))
+            runs.append(run)
+            print(f"  Run ordenada: {run}")
+        estado = {"fase": "mezcla", "pasada": 1, "longitud_secuencia": run_size, "runs": runs, "nuevas": [],
+                  "unique": unique, "ahorro": [n - sum(len(run) for run in runs)]}
+        if unique:
+            _codec.informar_ahorro(estado["ahorro"])
+        estado["ahorro"].append(0)
+        _codec.guardar_manifiesto(almacen, "straight_merging", estado)
+        return _mezclar_en_disco(almacen, estado, stats, procesos)
+    finally:
+        if almacen is not codec:
+            almacen.cerrar()
+
+def _mezclar_en_disco(almacen, estado, stats=None, procesos=None):
+    """
+    FASE 2 en disco. 'runs' son las runs que faltan mezclar en esta pasada y
+    'nuevas' las que ya produjo; el manifiesto se actualiza tras cada par y
+    recién después se borran las dos runs de entrada. 'ahorro' lleva los
+    elementos eliminados por pasada (con unique=True).
+    """
+    unique = estado.get("unique", False)
+    estado.setdefault("ahorro", [0, 0])  # manifiestos anteriores a unique=
+    while len(estado["runs"]) + len(estado["nuevas"]) > 1:
+        runs = estado["runs"]
+        if not runs:
+            # fin de la pasada: las secuencias nuevas son la entrada de la siguiente
+            if unique:
+                _codec.informar_ahorro(estado["ahorro"])
+            estado = {"fase": "mezcla", "pasada": estado["pasada"] + 1,
+                      "longitud_secuencia": estado["longitud_secuencia"] * 2, "runs": estado["nuevas"], "nuevas": [],
+                      "unique": unique, "ahorro": estado["ahorro"] + [0]}
+            _codec.guardar_manifiesto(almacen, "straight_merging", estado)
+            continue
+        if not estado["nuevas"]:
+            print(f"\nFASE 2: Mezcla (Merge) - Mezclando secuencias de tamaño {estado['longitud_secuencia']}")
+        if len(runs) == 2 and not estado["nuevas"] and procesos is not None:
+            merged_run = cargar("mezcla_particionada").mezcla_particionada(runs, almacen, procesos)
+            print(f"  Mezclando en {procesos} procesos: {runs[0]} y {runs[1]} -> {merged_run}")
+            consumidas = runs[:2]
+        elif len(runs) >= 2:
+            merged_run = merge_en_disco(runs[0], runs[1], almacen.escritor(), unique)
+            print(f"  Mezclando: {runs[0]} y {runs[1]} -> {merged_run}")
+            consumidas = runs[:2]
+            estado["ahorro"][-1] += len(runs[0]) + len(runs[1]) - len(merged_run)
+        else:
+            merged_run = runs[0]  # la run impar pasa tal cual, sin reescribirla
+            consumidas = []
+        estado["nuevas"].append(merged_run)
+        estado["runs"] = runs[max(len(consumidas), 1):]
+        _codec.guardar_manifiesto(almacen, "straight_merging", estado)
+        for run in consumidas:
+            run.borrar()
+
+    ahorro = estado["ahorro"]
+    if unique and estado["nuevas"]:
+        _codec.informar_ahorro(ahorro)
+    final = (estado["runs"] + estado["nuevas"])[:1]
+    _codec.guardar_manifiesto(almacen, "straight_merging", {"fase": "terminado", "pasada": estado["pasada"],
+                                                            "runs": final, "nuevas": [],
+                                                            "unique": unique, "ahorro": ahorro})
+    if stats is not None:
+        stats["ahorro_por_pasada"] = [_codec.bytes_elementos(a) for a in ahorro]
+    resultado = final[0].leer() if final else []
+    print(almacen.resumen())
+    return resultado
+
+def reanudar_straight_merging(directorio, procesos=None):
+    """
+    Sigue un straight_merging_sort(..., codec=..., directorio=directorio)
+    interrumpido desde su último manifiesto; no vuelve a leer la entrada.
+    """
+    almacen, estado = _codec.cargar_manifiesto(directorio, "straight_merging")
+    print(f"REANUDANDO Straight Merging: pasada {estado['pasada']}, "
+          f"{len(estado['runs'])} runs por mezclar y {len(estado['nuevas'])} ya mezcladas")
+    return _mezclar_en_disco(almacen, estado, procesos=procesos)
+
 # --- Ejemplo de Uso (Simulación de datos en un "Archivo Externo") ---
-# Simular un archivo de 20 elementos
-datos_externos = random.sample(range(1, 100), 20)
-# Simular que solo caben 4 elementos en la memoria principal (run_size)
-TAMAÑO_RAM = 4
+if __name__ == "__main__":
+    # Simular un archivo de 20 elementos
+    datos_externos = random.sample(range(1, 100), 20)
+    # Simular que solo caben 4 elementos en la memoria principal (run_size)
+    TAMAÑO_RAM = 4
+
+    print("INICIO DEL ORDENAMIENTO EXTERNO: Straight Merging")
+    print(f"Datos originales (Simulación de Archivo): {datos_externos}")
+
+    lista_ordenada = straight_merging_sort(datos_externos, TAMAÑO_RAM)
 
-print("INICIO DEL ORDENAMIENTO EXTERNO: Straight Merging")
-print(f"Datos originales (Simulación de Archivo): {datos_externos}")
+    print(f"\nResultado Final (Archivo Ordenado): {lista_ordenada}")
 
-lista_ordenada = straight_merging_sort(datos_externos, TAMAÑO_RAM)
+    # Las mismas runs, ahora en archivos comprimidos (delta + varint + zlib)
+    print("\nCON RUNS EN DISCO (codec varint+zlib)")
+    print(f"Resultado Final: {straight_merging_sort(datos_externos, TAMAÑO_RAM, codec='varint+zlib')}")
 
-print(f"\nResultado Final (Archivo Ordenado): {lista_ordenada}")
+    # Con claves repetidas: unique= y reduce= las juntan en cada pasada
+    repetidos = [x % 7 for x in datos_externos]
+    print("\nCON CLAVES REPETIDAS (unique=True)")
+    stats = {}
+    print(f"Resultado Final: {straight_merging_sort(repetidos, TAMAÑO_RAM, unique=True, stats=stats)}")
+    print(f"Bytes ahorrados por pasada: {stats['ahorro_por_pasada']}")
+    conteo = straight_merging_sort([(x, 1) for x in repetidos], TAMAÑO_RAM, reduce=lambda a, b: a + b)
+    print(f"Conteo por clave (reduce=suma): {conteo}")
@@ -1,9 +1,26 @@
-def get_natural_runs(data):
+import heapq
+import itertools
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from ia3 import cargar  # noqa: E402
+
+
+# en_rango (ver 006_Codec_Runs.py)
+_codec = cargar("codec_runs")
+
+
+def get_natural_runs(data, key_range=None, limit=None):
     """
     Identifica y devuelve una lista de secuencias naturales (sublistas ordenadas)
     de tamaño variable de los datos.
+    key_range: solo se leen los elementos dentro del rango (ver en_rango en 006_Codec_Runs.py).
+    limit: de cada run se guardan solo sus primeros 'limit' elementos (los menores).
     """
     runs = []
+    if key_range is not None:
+        data = [x for x in data if _codec.en_rango(x, key_range)]
     n = len(data)
     if n == 0:
         return runs
@@ -16,19 +33,20 @@ def get_natural_runs(data):
             end += 1
         
         # Agrega la secuencia natural encontrada a la lista de runs
-        runs.append(data[start:end])
+        runs.append(data[start:end if limit is None else min(end, start + limit)])
         start = end
         
     return runs
 
 # --- Función Auxiliar 2: Función de Mezcla (Merge) ---
-def merge(run1, run2):
+def merge(run1, run2, limit=None):
     """
     Combina (intercala) dos secuencias ordenadas en una sola secuencia ordenada.
+    Con 'limit' se detiene al tener los 'limit' menores.
     """
     merged = []
     i = j = 0
-    while i < len(run1) and j < len(run2):
+    while i < len(run1) and j < len(run2) and (limit is None or len(merged) < limit):
         if run1[i] < run2[j]:
             merged.append(run1[i])
             i += 1
@@ -38,24 +56,32 @@ def merge(run1, run2):
             
     merged.extend(run1[i:])
     merged.extend(run2[j:])
-    return merged
+    return merged if limit is None else merged[:limit]
 
 # --- Función Principal: Natural Merging Sort ---
-def natural_merging_sort(external_data):
+def natural_merging_sort(external_data, limit=None, key_range=None):
     """
     Implementa el Natural Merging (Mezcla Natural).
+    Consultas: con limit=N (los N menores) o key_range=(lo, hi) (solo
+    lo <= x < hi; None = sin cota) devuelve un iterador en lugar de una
+    lista. El rango se filtra al leer las runs, cada run y cada mezcla se
+    cortan en N elementos, y la última mezcla es perezosa: se detiene al
+    entregar el elemento N o al agotarse las runs.
     """
+    consulta = limit is not None or key_range is not None
+    if limit is not None and limit < 0:
+        raise ValueError("limit debe ser >= 0.")
     
     print("FASE 1: Identificación de Secuencias Naturales (Runs de tamaño variable)")
-    runs = get_natural_runs(external_data)
+    runs = get_natural_runs(external_data, key_range, limit)
     print(f"Secuencias Iniciales (Runs Naturales): {runs}")
 
     if not runs:
-        return []
+        return iter([]) if consulta else []
     
-    # 2. Fase de Mezcla Repetitiva
+    # 2. Fase de Mezcla Repetitiva (en una consulta, las dos últimas runs se mezclan al recorrer el iterador)
     pasada = 1
-    while len(runs) > 1:
+    while len(runs) > (2 if consulta else 1):
         new_runs = []
         print(f"\n--- PASADA DE MEZCLA {pasada} ---")
         
@@ -66,7 +92,7 @@ def natural_merging_sort(external_data):
             
             # Mezcla las dos secuencias ordenadas
             if run2:
-                merged_run = merge(run1, run2)
+                merged_run = merge(run1, run2, limit)
                 print(f"  Mezclando: {run1} y {run2} -> {merged_run}")
             else:
                 merged_run = run1 # Transfiere la última run impar
@@ -77,16 +103,24 @@ def natural_merging_sort(external_data):
         runs = new_runs
         pasada += 1
 
+    if consulta:
+        print(f"\n--- MEZCLA FINAL (al recorrer el resultado, hasta {limit if limit is not None else 'el final'}) ---")
+        return itertools.islice(heapq.merge(*runs), limit)
     return runs[0] if runs else []
 
 # --- Ejemplo de Uso (Simulación con secuencias pre-ordenadas) ---
-# Simular un archivo donde ya existen segmentos ordenados
-datos_externos = [10, 20, 30, 5, 15, 25, 40, 50, 2] 
-# Las secuencias naturales son: [10, 20, 30], [5, 15, 25, 40, 50], [2]
+if __name__ == "__main__":
+    # Simular un archivo donde ya existen segmentos ordenados
+    datos_externos = [10, 20, 30, 5, 15, 25, 40, 50, 2] 
+    # Las secuencias naturales son: [10, 20, 30], [5, 15, 25, 40, 50], [2]
+
+    print("INICIO DEL ORDENAMIENTO EXTERNO: Natural Merging")
+    print(f"Datos originales (Simulación de Archivo): {datos_externos}")
 
-print("INICIO DEL ORDENAMIENTO EXTERNO: Natural Merging")
-print(f"Datos originales (Simulación de Archivo): {datos_externos}")
+    lista_ordenada = natural_merging_sort(datos_externos)
 
-lista_ordenada = natural_merging_sort(datos_externos)
+    print(f"\nResultado Final (Archivo Ordenado): {lista_ordenada}")
 
-print(f"\nResultado Final (Archivo Ordenado): {lista_ordenada}")
+    # Consulta: solo la primera página (3 elementos) de las claves en [10, 45)
+    pagina = natural_merging_sort(datos_externos, limit=3, key_range=(10, 45))
+    print(f"\nPrimera página de [10, 45): {list(pagina)}")
@@ -1,7 +1,28 @@
-def distribute_runs(data, k_devices, run_size):
+import heapq
+import itertools
+import os
+import sys
+import weakref
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from ia3 import cargar  # noqa: E402
+
+
+# Runs en disco con compresión (parámetro codec=, ver 006_Codec_Runs.py)
+_codec = cargar("codec_runs")
+
+
+def distribute_runs(data, k_devices, run_size, codec=None, directorio=None, unique=False, reduce=None,
+                    key_range=None, limit=None):
     """
     Simula la Fase Inicial: Distribuye los runs ordenados
     equilibradamente entre los dispositivos de salida (simulados).
+    Con 'codec' las runs son archivos comprimidos (ArchivoRun, ver 006_Codec_Runs.py)
+    en 'directorio' (obligatorio, salvo que codec sea un AlmacenRuns).
+    'unique' / 'reduce': las claves repetidas de cada run se juntan antes de
+    escribirla (ver combinar_iguales en 006_Codec_Runs.py).
+    'key_range': cada bloque leído se filtra antes de ordenarlo; 'limit': de
+    cada run se escriben solo sus primeros 'limit' elementos.
     """
     n = len(data)
     
@@ -9,9 +30,21 @@ def distribute_runs(data, k_devices, run_size):
     initial_runs = []
     for i in range(0, n, run_size):
         run = data[i:i + run_size]
+        if key_range is not None:
+            run = [x for x in run if _codec.en_rango(x, key_range)]
+            if not run:
+                continue
         run_ordenada = sorted(run)  # Usamos 'sorted' para simplificar el ordenamiento interno
+        if unique or reduce is not None:
+            run_ordenada = list(_codec.combinar_iguales(run_ordenada, unique, reduce))
+        if limit is not None:
+            run_ordenada = run_ordenada[:limit]
         initial_runs.append(run_ordenada)
 
+    if codec is not None:
+        almacen = _codec.almacen_de_runs(codec, directorio, "distribute_runs")
+        initial_runs = [almacen.escribir(run) for run in initial_runs]
+
     # Distribuye las runs a los K dispositivos de salida (Simulación)
     devices = [[] for _ in range(k_devices)]
     for i, run in enumerate(initial_runs):
@@ -20,15 +53,18 @@ def distribute_runs(data, k_devices, run_size):
         
     return devices
 
-def multiway_merge(input_devices):
+def multiway_merge(input_devices, escritor=None, unique=False, reduce=None, limit=None):
     """
     Realiza la mezcla de múltiples secuencias (K-way merge).
     input_devices es una lista de listas de runs (los dispositivos de lectura).
+    Las runs se leen con iteradores: si son archivos (ArchivoRun) se
+    decodifican de a un bloque mientras avanza la mezcla. Con 'escritor'
+    (un EscritorRun) el resultado va a ese archivo en lugar de a una lista.
+    'unique' / 'reduce': los iguales se juntan a la salida del heap, antes de escribirlos.
+    'limit': la mezcla se detiene después de escribir 'limit' elementos.
     """
-    import heapq
-    
     # Inicializa el heap de prioridad (min-heap)
-    # Almacenará tuplas: (valor, índice_run, índice_dispositivo)
+    # Almacenará tuplas: (valor, índice_run)
     heap = []
     
     # Simplificación: Combina todas las runs de todos los dispositivos de entrada en un solo pool para la mezcla
@@ -36,86 +72,241 @@ def multiway_merge(input_devices):
     for device_runs in input_devices:
         all_runs.extend(device_runs)
     
-    # Inicializa índices para cada run
-    run_indices = [0] * len(all_runs)
+    # Un iterador (lector) para cada run
+    readers = [iter(run) for run in all_runs]
+    fin = object()
     
     # Introduce el primer elemento de cada run al heap
-    for i, run in enumerate(all_runs):
-        if run:
-            heapq.heappush(heap, (run[0], i)) # (valor, índice_run)
+    for i, reader in enumerate(readers):
+        first = next(reader, fin)
+        if first is not fin:
+            heapq.heappush(heap, (first, i)) # (valor, índice_run)
+
+    def extraer():
+        while heap:
+            # Extrae el elemento más pequeño del heap
+            value, run_index = heapq.heappop(heap)
+            yield value
+
+            # Si la run aún tiene elementos, agrega el siguiente al heap
+            next_value = next(readers[run_index], fin)
+            if next_value is not fin:
+                heapq.heappush(heap, (next_value, run_index))
+
+    salida = extraer()
+    if unique or reduce is not None:
+        salida = _codec.combinar_iguales(salida, unique, reduce)
+    if limit is not None:
+        salida = itertools.islice(salida, limit)
 
     final_merged_run = []
-    
-    while heap:
-        # Extrae el elemento más pequeño del heap
-        value, run_index = heapq.heappop(heap)
-        final_merged_run.append(value)
-        
-        # Mueve el puntero de esa run al siguiente elemento
-        run_indices[run_index] += 1
-        
-        # Si la run aún tiene elementos, agrega el siguiente al heap
-        next_index = run_indices[run_index]
-        if next_index < len(all_runs[run_index]):
-            next_value = all_runs[run_index][next_index]
-            heapq.heappush(heap, (next_value, run_index))
-            
+    if escritor is None:
+        final_merged_run.extend(salida)
+    else:
+        escritor.extender(salida)
+
+    if escritor is not None:
+        return [escritor.cerrar()]
     return [final_merged_run] # Devuelve una única run grande (el resultado de la pasada)
 
 
 # --- Función Principal: Balanced Multiway Merging ---
-def balanced_multiway_sort(external_data, run_size, k_devices=3):
+def balanced_multiway_sort(external_data, run_size, k_devices=3, codec=None, directorio=None, stats=None,
+                           unique=False, reduce=None, procesos=None, limit=None, key_range=None):
     """
     Simula el Balanced Multiway Merging.
+    Cada mezcla toma la primera run de cada uno de los K dispositivos de
+    entrada (K-way merge) y la escribe en uno de los K dispositivos de salida,
+    por turno. Al terminar la pasada los de salida pasan a ser de entrada,
+    hasta que queda una sola run.
+    Con 'codec' las runs son archivos (ver 006_Codec_Runs.py); con codec y
+    'directorio', ver reanudar_balanced_multiway.
+    'stats' (dict): se llena con pasadas, mezclas y transferencias (elementos
+    escritos en algún dispositivo, contando la distribución inicial).
+    'unique' / 'reduce': las claves repetidas se juntan al generar las runs y
+    en cada mezcla (ver multiway_merge); stats recibe además
+    "ahorro_por_pasada", en bytes (posición 0: generación de runs).
+    'procesos': la mezcla que produce la run final se reparte por rangos de
+    claves entre ese número de procesos (ver 008_Mezcla_Particionada.py).
+    Consultas: con limit=N (los N menores) o key_range=(lo, hi) (solo
+    lo <= x < hi; None = sin cota) devuelve un iterador en lugar de una
+    lista. El rango se filtra al generar las runs, cada run y cada mezcla se
+    cortan en N elementos, y la última mezcla no se escribe: se hace al
+    recorrer el iterador y se detiene en el elemento N o al agotarse las runs.
     """
+    if k_devices < 2:
+        raise ValueError("Balanced Multiway Merging requiere al menos 2 dispositivos.")
+    if limit is not None and limit < 0:
+        raise ValueError("limit debe ser >= 0.")
+    consulta = limit is not None or key_range is not None
+    if procesos is not None and (unique or reduce is not None):
+        raise ValueError("procesos= no se puede usar con unique= ni reduce=: los tramos se mezclan por separado.")
+    if codec is not None and reduce is not None:
+        raise ValueError("reduce= no se puede usar con codec=: los archivos de runs guardan claves enteras.")
     print("INICIO DEL ORDENAMIENTO EXTERNO: Balanced Multiway Merging")
     print(f"Número de dispositivos de mezcla (K): {k_devices}")
-    
-    # FASE 1: Distribución Inicial de Runs Ordenadas
-    # devices_in_use[0] a [k-1] simulan los dispositivos.
-    devices = distribute_runs(external_data, k_devices, run_size)
-    print("\nFASE 1: Runs Iniciales Ordenadas y Distribuidas (Tamaño de Run = %d)" % run_size)
-    for i, dev in enumerate(devices):
-        print(f"  Dispositivo {i+1} (Salida): {dev}")
-    
-    # FASE 2: Mezcla Iterativa (K-way Merges)
-    pasada = 1
-    # Bucle principal: Simula la alternancia entre dispositivos de entrada/salida
-    while sum(len(dev) for dev in devices) > 1 or (len(devices) == 1 and len(devices[0][0]) < len(external_data)):
-        
-        # Simulación de alternancia: Los dispositivos que eran de Salida ahora son de Entrada, y viceversa.
-        # En la práctica, se usarían K/2 para entrada y K/2 para salida.
-        
-        # Aquí, por simplicidad, los mezclamos todos en una única pasada y redistribuimos.
-        
-        all_runs_to_merge = [run for dev in devices for run in dev]
-        
-        if len(all_runs_to_merge) <= 1:
-             break # Finaliza si solo queda una única run
+    almacen = _codec.almacen_para(codec, directorio) if codec is not None else None
+    propio = almacen is not None and almacen is not codec
+    try:
+        # FASE 1: Distribución Inicial de Runs Ordenadas
+        # devices[0] a [k-1] simulan los dispositivos.
+        devices = distribute_runs(external_data, k_devices, run_size, codec=almacen, unique=unique, reduce=reduce,
+                                  key_range=key_range, limit=limit)
+        print("\nFASE 1: Runs Iniciales Ordenadas y Distribuidas (Tamaño de Run = %d)" % run_size)
+        for i, dev in enumerate(devices):
+            print(f"  Dispositivo {i+1} (Salida): {dev}")
+        # ahorro: elementos eliminados por pasada (0 = generación de runs)
+        ahorro = [len(external_data) - sum(len(run) for dev in devices for run in dev), 0]
+        if unique or reduce is not None:
+            _codec.informar_ahorro(ahorro[:1], reduce)
 
-        # Realiza la mezcla K-way
-        print(f"\n--- PASADA DE MEZCLA {pasada} (Mezclando {len(all_runs_to_merge)} runs) ---")
-        
-        # Mezcla todas las runs para formar una única gran run
-        merged_result = multiway_merge([all_runs_to_merge])
-        
-        # Redistribución del resultado (para simular la preparación de la siguiente pasada)
-        devices = distribute_runs(merged_result[0], k_devices, len(merged_data))
-        print("  Resultado de la Mezcla Total (Redistribución):", merged_result[0])
-        
-        pasada += 1
-        # Detiene la simulación si el resultado ya es un único arreglo ordenado
-        if len(merged_result[0]) == len(external_data):
-             return merged_result[0] 
+        estado = {"fase": "mezcla", "pasada": 1, "entrada": devices,
+                  "salida": [[] for _ in range(k_devices)], "siguiente": 0,
+                  "unique": unique, "ahorro": ahorro, "consulta": consulta, "limit": limit}
+        if almacen is not None:
+            _codec.guardar_manifiesto(almacen, "balanced_multiway", estado)
+        if stats is not None:
+            stats.update(pasadas=0, mezclas=0,
+                         transferencias=sum(len(run) for dev in devices for run in dev))
+        resultado = _mezclar_pasadas(estado, almacen, stats, reduce, procesos)
+        if consulta and propio:
+            # el iterador todavía lee las runs: el almacén temporal se borra cuando termina
+            resultado, propio = _cerrar_al_terminar(resultado, almacen.cerrar), False
+        return resultado
+    finally:
+        if propio:
+            almacen.cerrar()
+
+def _cerrar_al_terminar(iterador, cerrar):
+    """Recorre 'iterador' y llama a 'cerrar' al agotarlo, al descartarlo o al salir del programa."""
+    def recorrer():
+        try:
+            yield from iterador
+        finally:
+            fin()
+    generador = recorrer()
+    fin = weakref.finalize(generador, cerrar)
+    return generador
 
-    return devices[0][0] if devices[0] else []
+def _mezcla_perezosa(runs, unique, reduce, limit):
+    """Última mezcla de una consulta: no se escribe, se produce al recorrerla."""
+    salida = heapq.merge(*runs)
+    if unique or reduce is not None:
+        salida = _codec.combinar_iguales(salida, unique, reduce)
+    return itertools.islice(salida, limit)
+
+def _mezclar_pasadas(estado, almacen, stats=None, reduce=None, procesos=None):
+    """
+    FASE 2: Mezcla Iterativa (K-way Merges). 'entrada' son las runs que faltan
+    leer en esta pasada y 'salida' las ya escritas; con runs en disco el
+    manifiesto se actualiza tras cada mezcla, antes de borrar sus entradas.
+    'ahorro' lleva los elementos eliminados por pasada (con unique/reduce).
+    En una consulta ('consulta', 'limit') la última mezcla es perezosa.
+    """
+    k_devices = len(estado["entrada"])
+    unique = estado.get("unique", False)
+    consulta, limit = estado.get("consulta", False), estado.get("limit")
+    combina = unique or reduce is not None
+    estado.setdefault("ahorro", [0, 0])  # manifiestos anteriores a unique=
+    while sum(len(dev) for dev in estado["entrada"] + estado["salida"]) > 1:
+        entrada, salida = estado["entrada"], estado["salida"]
+        if not any(entrada):
+            # Alternancia: los dispositivos de Salida ahora son de Entrada, y viceversa.
+            if combina:
+                _codec.informar_ahorro(estado["ahorro"], reduce)
+            estado = {"fase": "mezcla", "pasada": estado["pasada"] + 1, "entrada": salida,
+                      "salida": [[] for _ in range(k_devices)], "siguiente": 0,
+                      "unique": unique, "ahorro": estado["ahorro"] + [0], "consulta": consulta, "limit": limit}
+            if almacen is not None:
+                _codec.guardar_manifiesto(almacen, "balanced_multiway", estado)
+            continue
+        if not any(salida):
+            print(f"\n--- PASADA DE MEZCLA {estado['pasada']} "
+                  f"(Mezclando {sum(len(dev) for dev in entrada)} runs) ---")
+
+        # Toma la primera run de cada dispositivo de entrada que todavía tenga runs
+        ultima = not any(salida) and all(len(dev) <= 1 for dev in entrada)
+        if ultima and consulta:
+            group = [dev[0] for dev in entrada if dev]
+            print(f"  Mezcla final al recorrer el resultado (hasta {limit if limit is not None else 'el final'}): {group}")
+            if stats is not None:
+                stats["pasadas"] = estado["pasada"] - 1
+                stats["ahorro_por_pasada"] = [_codec.bytes_elementos(a, reduce) for a in estado["ahorro"][:-1]]
+            if almacen is not None:
+                print(almacen.resumen())
+            return _mezcla_perezosa(group, unique, reduce, limit)
+        group = [dev.pop(0) for dev in entrada if dev]
+        if len(group) == 1:
+            merged_run = group[0]  # Run sin pareja: pasa a la salida tal cual
+            print(f"  Transferido (Run sin pareja): {merged_run}")
+        elif ultima and procesos is not None:
+            # Esta mezcla produce la run final: se reparte por rangos de claves
+            merged_run = cargar("mezcla_particionada").mezcla_particionada(group, almacen, procesos)
+            print(f"  Mezclando en {procesos} procesos: {group} -> {merged_run}")
+            if stats is not None:
+                stats["mezclas"] += 1
+                stats["transferencias"] += len(merged_run)
+        else:
+            escritor = almacen.escritor() if almacen is not None else None
+            merged_run = multiway_merge([group], escritor, unique, reduce, limit)[0]
+            print(f"  Mezclando: {group} -> {merged_run}")
+            estado["ahorro"][-1] += sum(len(run) for run in group) - len(merged_run)
+            if stats is not None:
+                stats["mezclas"] += 1
+                stats["transferencias"] += len(merged_run)
+        salida[estado["siguiente"]].append(merged_run)
+        estado["siguiente"] = (estado["siguiente"] + 1) % k_devices
+        if almacen is not None:
+            _codec.guardar_manifiesto(almacen, "balanced_multiway", estado)
+            if len(group) > 1:
+                for run in group:
+                    run.borrar()
+
+    final = [run for dev in estado["entrada"] + estado["salida"] for run in dev]
+    ahorro = estado["ahorro"] if any(estado["salida"]) else estado["ahorro"][:-1]
+    if combina and any(estado["salida"]):
+        _codec.informar_ahorro(ahorro, reduce)
+    if stats is not None:
+        stats["pasadas"] = estado["pasada"] if any(estado["salida"]) else estado["pasada"] - 1
+        stats["ahorro_por_pasada"] = [_codec.bytes_elementos(a, reduce) for a in ahorro]
+    if consulta:
+        return itertools.islice(iter(final[0] if final else []), limit)
+    if almacen is None:
+        return final[0] if final else []
+    _codec.guardar_manifiesto(almacen, "balanced_multiway", {
+        "fase": "terminado", "pasada": estado["pasada"], "entrada": [final],
+        "salida": [[] for _ in range(k_devices)], "siguiente": 0, "unique": unique, "ahorro": ahorro})
+    print(almacen.resumen())
+    return final[0].leer() if final else []
+
+def reanudar_balanced_multiway(directorio, procesos=None):
+    """
+    Sigue un balanced_multiway_sort(..., codec=..., directorio=directorio)
+    interrumpido desde su último manifiesto; no vuelve a leer la entrada.
+    """
+    almacen, estado = _codec.cargar_manifiesto(directorio, "balanced_multiway")
+    print(f"REANUDANDO Balanced Multiway Merging: pasada {estado['pasada']}, "
+          f"{sum(len(dev) for dev in estado['entrada'])} runs por mezclar")
+    return _mezclar_pasadas(estado, almacen, procesos=procesos)
 
 
 # --- Ejemplo de Uso ---
-datos_externos = [3, 15, 8, 20, 1, 12, 18, 5, 14, 2, 7, 10]
-TAMAÑO_RAM = 4  # Capacidad de la memoria para ordenar inicialmente
-K_DISPOSITIVOS = 3 # Número de cintas/discos usados para la mezcla
+if __name__ == "__main__":
+    datos_externos = [3, 15, 8, 20, 1, 12, 18, 5, 14, 2, 7, 10]
+    TAMAÑO_RAM = 4  # Capacidad de la memoria para ordenar inicialmente
+    K_DISPOSITIVOS = 3 # Número de cintas/discos usados para la mezcla
+
+    lista_ordenada = balanced_multiway_sort(datos_externos, TAMAÑO_RAM, K_DISPOSITIVOS)
+
+    print(f"\nResultado Final (Archivo Ordenado): {lista_ordenada}")
 
-lista_ordenada = balanced_multiway_sort(datos_externos, TAMAÑO_RAM, K_DISPOSITIVOS)
+    # Con claves repetidas: cada pasada mueve menos datos
+    stats = {}
+    repetidos = [x % 5 for x in datos_externos]
+    lista_unica = balanced_multiway_sort(repetidos, TAMAÑO_RAM, K_DISPOSITIVOS, stats=stats, unique=True)
+    print(f"\nSin repetidos (unique=True): {lista_unica}")
+    print(f"Bytes ahorrados por pasada: {stats['ahorro_por_pasada']}")
 
-print(f"\nResultado Final (Archivo Ordenado): {lista_ordenada}")
+    # Consulta: la primera página (3 elementos) de las claves en [5, 18)
+    pagina = balanced_multiway_sort(datos_externos, TAMAÑO_RAM, K_DISPOSITIVOS, limit=3, key_range=(5, 18))
+    print(f"\nPrimera página de [5, 18): {list(pagina)}")
@@ -1,4 +1,15 @@
+import heapq
+import os
 import random
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from ia3 import cargar  # noqa: E402
+
+
+# Runs en disco con compresión (parámetro codec=, ver 006_Codec_Runs.py)
+_codec = cargar("codec_runs")
+
 
 # --- Función Auxiliar: Mezcla (Merge) ---
 def merge(run1, run2):
@@ -17,11 +28,28 @@ def merge(run1, run2):
     merged.extend(run2[j:])
     return merged
 
-# --- Función Auxiliar: Distribución Inicial (Simulación con 3 dispositivos, K=3) ---
-# En un Polyphase real, esta distribución inicial sería desigual y precisa.
-def distribute_runs_initial(data, run_size, k_devices=3):
+# --- Función Auxiliar: Distribución Inicial (Simulación con K dispositivos) ---
+def distribucion_perfecta(n_runs, k_entrada):
+    """
+    Runs por dispositivo de entrada en la primera distribución "perfecta"
+    (Fibonacci de orden k_entrada) con al menos n_runs runs. Solo con una
+    distribución perfecta cada pasada vacía exactamente un dispositivo.
+    """
+    dist = [1] * k_entrada
+    while sum(dist) < n_runs:
+        a0 = dist[0]
+        dist = [a0 + dist[i + 1] for i in range(k_entrada - 1)] + [a0]
+    return dist
+
+def distribute_runs_initial(data, run_size, k_devices=3, codec=None, directorio=None,
+                            distribucion=distribucion_perfecta):
     """
     Simula la distribución inicial de runs ordenadas en K-1 dispositivos.
+    Las runs se reparten según 'distribucion' (la perfecta del polifásico, o
+    la de cascada); lo que falta se completa con runs ficticias (vacías, []),
+    al principio de cada dispositivo.
+    Con 'codec' las runs son archivos comprimidos (ArchivoRun, ver 006_Codec_Runs.py)
+    en 'directorio' (obligatorio, salvo que codec sea un AlmacenRuns).
     """
     initial_runs = []
     # Crea las runs iniciales ordenadas internamente
@@ -29,85 +57,157 @@ def distribute_runs_initial(data, run_size, k_devices=3):
         run = data[i:i + run_size]
         initial_runs.append(sorted(run))
 
-    # Distribuye las runs a K-1 dispositivos (Dispositivo 0 y 1 en este caso)
+    if codec is not None:
+        almacen = _codec.almacen_de_runs(codec, directorio, "distribute_runs_initial")
+        initial_runs = [almacen.escribir(run) for run in initial_runs]
+
+    # Distribuye las runs a K-1 dispositivos; el último queda vacío (será la primera salida)
     devices = [[] for _ in range(k_devices)]
-    k_minus_1 = k_devices - 1 
-    
-    # Distribución simple: Alterna las runs entre K-1 dispositivos
-    for i, run in enumerate(initial_runs):
-        devices[i % k_minus_1].append(run)
+    k_minus_1 = k_devices - 1
+    if not initial_runs:
+        return devices
+    objetivo = distribucion(len(initial_runs), k_minus_1)
+
+    # Reparte las runs reales por turno entre los dispositivos que aún tienen lugar
+    reales = [[] for _ in range(k_minus_1)]
+    i = 0
+    for run in initial_runs:
+        while len(reales[i]) == objetivo[i]:
+            i = (i + 1) % k_minus_1
+        reales[i].append(run)
+        i = (i + 1) % k_minus_1
+    for d in range(k_minus_1):
+        devices[d] = [[] for _ in range(objetivo[d] - len(reales[d]))] + reales[d]
         
     return devices
 
+def mezclar_runs(runs, almacen=None, stats=None):
+    """
+    Mezcla las runs de un paso; las ficticias ([]) no cuestan nada. Con
+    'almacen' (AlmacenRuns) el resultado es un archivo. 'stats' (dict) suma
+    las mezclas y los elementos escritos ("transferencias").
+    """
+    reales = [run for run in runs if len(run) > 0]
+    if not reales:
+        return []  # solo ficticias: el resultado también es ficticio
+    if len(reales) == 1:
+        return reales[0]  # una sola run real: pasa a la salida tal cual
+    if almacen is not None:
+        escritor = almacen.escritor()
+        escritor.extender(heapq.merge(*reales))  # lee cada run en streaming
+        merged_run = escritor.cerrar()
+    else:
+        # Mezcla las runs (aquí se simplifica a una mezcla binaria)
+        merged_run = reales[0]
+        for run in reales[1:]:
+            merged_run = merge(merged_run, run)
+    if stats is not None:
+        stats["mezclas"] = stats.get("mezclas", 0) + 1
+        stats["transferencias"] = stats.get("transferencias", 0) + len(merged_run)
+    return merged_run
+
 # --- Función Principal: Polyphase Sort (Simulación) ---
-def polyphase_sort(external_data, run_size, k_devices=3):
+def polyphase_sort(external_data, run_size, k_devices=3, codec=None, directorio=None, stats=None):
     """
     Simula el proceso iterativo de Polyphase Sort con K dispositivos.
+    Con 'codec' las runs son archivos (ver 006_Codec_Runs.py); con codec y
+    'directorio', ver reanudar_polyphase.
+    'stats' (dict): se llena con pasadas, mezclas y transferencias (elementos
+    escritos en algún dispositivo, contando la distribución inicial).
     """
-    if k_devices < 2:
-        raise ValueError("Polyphase Sort requiere al menos 2 dispositivos (cintas).")
+    if k_devices < 3:
+        raise ValueError("Polyphase Sort requiere al menos 3 dispositivos (cintas): "
+                         "con 2, la única cinta de entrada no tiene con qué mezclarse.")
     
     print("INICIO DEL ORDENAMIENTO EXTERNO: Polyphase Sort")
     print(f"Dispositivos (K): {k_devices}")
-    
-    # Inicializa K dispositivos. Los K-1 primeros tendrán datos. El último (K-1) estará vacío.
-    devices = distribute_runs_initial(external_data, run_size, k_devices)
-    
-    print("\nFASE 1: Distribución Inicial")
-    for i, dev in enumerate(devices):
-        print(f"  Dispositivo D{i} (Runs: {len(dev)}): {dev}")
-        
-    pasada = 1
-    # Bucle principal: Continúa hasta que todas las runs estén en un solo dispositivo.
+    almacen = _codec.almacen_para(codec, directorio) if codec is not None else None
+    try:
+        # Inicializa K dispositivos. Los K-1 primeros tendrán datos. El último (K-1) estará vacío.
+        devices = distribute_runs_initial(external_data, run_size, k_devices, codec=almacen)
+
+        print("\nFASE 1: Distribución Inicial")
+        for i, dev in enumerate(devices):
+            print(f"  Dispositivo D{i} (Runs: {len(dev)}): {dev}")
+
+        estado = {"fase": "mezcla", "pasada": 1, "dispositivos": devices, "salida": k_devices - 1, "mezclas": 0}
+        if almacen is not None:
+            _codec.guardar_manifiesto(almacen, "polyphase", estado)
+        if stats is not None:
+            stats.update(pasadas=0, mezclas=0, transferencias=len(external_data))
+        return _mezclar_polifasico(estado, almacen, stats)
+    finally:
+        if almacen is not None and almacen is not codec:
+            almacen.cerrar()
+
+def _mezclar_polifasico(estado, almacen, stats=None):
+    """
+    Pasadas de mezcla. Una pasada sigue mientras todos los dispositivos de
+    ENTRADA tengan runs; el que se vacía es la SALIDA de la siguiente. Con
+    runs en disco el manifiesto se actualiza tras cada mezcla.
+    """
+    devices = estado["dispositivos"]
+    k_devices = len(devices)
+    # Bucle principal: Continúa hasta que quede una sola run.
     while sum(len(dev) for dev in devices) > 1:
-        
-        # Identifica el dispositivo VACÍO (el que actuará como SALIDA)
-        output_device_index = next(i for i, dev in enumerate(devices) if not dev)
-        
+        output_device_index = estado["salida"]
         # Los otros K-1 dispositivos actúan como ENTRADA
         input_device_indices = [i for i in range(k_devices) if i != output_device_index]
-        
-        print(f"\n--- PASADA {pasada} ---")
-        print(f"  Dispositivo de SALIDA: D{output_device_index}")
-        print(f"  Dispositivos de ENTRADA: {[f'D{i}' for i in input_device_indices]}")
-        
-        # Determina cuántas runs se pueden mezclar: el mínimo número de runs presentes en CADA dispositivo de ENTRADA.
-        num_merges = min(len(devices[i]) for i in input_device_indices)
-        
-        merged_runs = 0
-        
-        # Realiza las mezclas
-        for _ in range(num_merges):
-            
-            # Toma la primera run de cada dispositivo de entrada
-            run_to_merge = [devices[i].pop(0) for i in input_device_indices]
-            
-            # Mezcla las runs (aquí se simplifica a una mezcla binaria)
-            # En la realidad, se haría una K-way merge de las runs.
-            merged_run = run_to_merge[0]
-            for run in run_to_merge[1:]:
-                merged_run = merge(merged_run, run)
-
-            # Escribe la run mezclada al dispositivo de SALIDA
-            devices[output_device_index].append(merged_run)
-            merged_runs += 1
-            
-        print(f"  Mezclas realizadas: {merged_runs}. Runs restantes en entrada: {len(devices[input_device_indices[0]])}")
-        
-        # Al finalizar la pasada, el dispositivo de SALIDA se vacía (se convierte en ENTRADA)
-        # y uno de los dispositivos de ENTRADA se vacía (se convierte en SALIDA).
-        # En esta simulación, la lógica es implícita: el dispositivo de SALIDA ahora tiene runs.
-        
-        pasada += 1
-        
-    return devices[output_device_index][0] if devices[output_device_index] else devices[input_device_indices[0]][0]
+
+        if any(not devices[i] for i in input_device_indices):
+            # Fin de la pasada: el dispositivo de ENTRADA que se vació es la nueva SALIDA
+            print(f"  Mezclas realizadas: {estado['mezclas']}. "
+                  f"Runs por dispositivo: {[len(dev) for dev in devices]}")
+            estado["salida"] = next(i for i in input_device_indices if not devices[i])
+            estado["pasada"] += 1
+            estado["mezclas"] = 0
+            if almacen is not None:
+                _codec.guardar_manifiesto(almacen, "polyphase", estado)
+            continue
+
+        if estado["mezclas"] == 0:
+            print(f"\n--- PASADA {estado['pasada']} ---")
+            print(f"  Dispositivo de SALIDA: D{output_device_index}")
+            print(f"  Dispositivos de ENTRADA: {[f'D{i}' for i in input_device_indices]}")
+
+        # Toma la primera run de cada dispositivo de entrada y escribe la mezcla en la SALIDA
+        run_to_merge = [devices[i].pop(0) for i in input_device_indices]
+        merged_run = mezclar_runs(run_to_merge, almacen, stats)
+        devices[output_device_index].append(merged_run)
+        estado["mezclas"] += 1
+        if almacen is not None:
+            _codec.guardar_manifiesto(almacen, "polyphase", estado)
+            for run in run_to_merge:
+                if run is not merged_run and len(run) > 0:
+                    run.borrar()
+
+    final = [run for dev in devices for run in dev]
+    if stats is not None:
+        stats["pasadas"] = estado["pasada"] if estado["mezclas"] else estado["pasada"] - 1
+    if almacen is None:
+        return final[0] if final else []
+    _codec.guardar_manifiesto(almacen, "polyphase", {"fase": "terminado", "pasada": estado["pasada"],
+                                                     "dispositivos": [final], "salida": 0, "mezclas": 0})
+    print(almacen.resumen())
+    return final[0].leer() if final else []
+
+def reanudar_polyphase(directorio):
+    """
+    Sigue un polyphase_sort(..., codec=..., directorio=directorio)
+    interrumpido desde su último manifiesto; no vuelve a leer la entrada.
+    """
+    almacen, estado = _codec.cargar_manifiesto(directorio, "polyphase")
+    print(f"REANUDANDO Polyphase Sort: pasada {estado['pasada']}, "
+          f"runs por dispositivo {[len(dev) for dev in estado['dispositivos']]}")
+    return _mezclar_polifasico(estado, almacen)
 
 
 # --- Ejemplo de Uso (Simulación) ---
-datos_externos = [10, 80, 30, 90, 40, 50, 70, 20, 100, 5, 25, 45]
-TAMAÑO_RAM = 2  # Tamaño del bloque para el ordenamiento interno inicial
-K_DISPOSITIVOS = 3 # Usaremos 3 "cintas" o dispositivos
+if __name__ == "__main__":
+    datos_externos = [10, 80, 30, 90, 40, 50, 70, 20, 100, 5, 25, 45]
+    TAMAÑO_RAM = 2  # Tamaño del bloque para el ordenamiento interno inicial
+    K_DISPOSITIVOS = 3 # Usaremos 3 "cintas" o dispositivos
 
-lista_ordenada = polyphase_sort(datos_externos, TAMAÑO_RAM, K_DISPOSITIVOS)
+    lista_ordenada = polyphase_sort(datos_externos, TAMAÑO_RAM, K_DISPOSITIVOS)
 
-print(f"\nResultado Final (Archivo Ordenado): {lista_ordenada}")
+    print(f"\nResultado Final (Archivo Ordenado): {lista_ordenada}")
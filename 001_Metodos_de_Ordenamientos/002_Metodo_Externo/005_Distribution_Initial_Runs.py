@@ -1,4 +1,14 @@
+import os
 import random
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from ia3 import cargar  # noqa: E402
+
+
+# Runs en disco con compresión (parámetro codec=, ver 006_Codec_Runs.py)
+_codec = cargar("codec_runs")
+
 
 # Función para ordenar internamente cada run (simulando que está en RAM)
 def internal_sort(run):
@@ -9,13 +19,17 @@ def internal_sort(run):
     return sorted(run)
 
 # --- Función Principal: Distribución de Secuencias Iniciales ---
-def distribution_of_initial_runs(external_data, ram_capacity):
+def distribution_of_initial_runs(external_data, ram_capacity, codec=None, directorio=None):
     """
     Simula la fase de distribución y ordenamiento de las runs iniciales.
     'ram_capacity' simula el tamaño máximo de bloque que la memoria principal puede manejar.
+    Con 'codec' ("raw", "varint", "for", con "+zlib" opcional) cada run se escribe
+    comprimida en un archivo de 'directorio' (obligatorio, salvo que codec sea
+    un AlmacenRuns) y se devuelven objetos ArchivoRun, que se recorren como listas.
     """
     n = len(external_data)
     runs_almacenadas = []
+    almacen = _codec.almacen_de_runs(codec, directorio, "distribution_of_initial_runs") if codec is not None else None
     
     print("INICIO: Distribución de Secuencias Iniciales")
     print(f"Capacidad de RAM simulada (Run Size): {ram_capacity}")
@@ -31,20 +45,25 @@ def distribution_of_initial_runs(external_data, ram_capacity):
         sorted_run = internal_sort(current_block)
         
         # 3. ESCRITURA: Escribe la secuencia ordenada de vuelta al "Almacenamiento Externo"
-        runs_almacenadas.append(sorted_run)
         print(f"  > Ordenamiento Interno (RAM): {sorted_run}")
+        if almacen is not None:
+            sorted_run = almacen.escribir(sorted_run)
+        runs_almacenadas.append(sorted_run)
         print(f"  > Escribiendo RUN {i // ram_capacity + 1} a dispositivo de mezcla.")
         
     print("\nFASE TERMINADA.")
+    if almacen is not None:
+        print(f"{almacen.resumen()}; archivos en {almacen.directorio}")
     print("Secuencias Iniciales (Runs) Creadas:", runs_almacenadas)
     
     return runs_almacenadas
 
 # --- Ejemplo de Uso ---
-datos_externos = [50, 10, 40, 20, 60, 30, 80, 70, 90, 5]
-CAPACIDAD_RAM = 3 # Simulamos que la memoria solo puede ordenar 3 elementos a la vez
+if __name__ == "__main__":
+    datos_externos = [50, 10, 40, 20, 60, 30, 80, 70, 90, 5]
+    CAPACIDAD_RAM = 3 # Simulamos que la memoria solo puede ordenar 3 elementos a la vez
 
-runs_finales = distribution_of_initial_runs(datos_externos, CAPACIDAD_RAM)
+    runs_finales = distribution_of_initial_runs(datos_externos, CAPACIDAD_RAM)
 
-# Estas 'runs_finales' serían las que el Straight Merging o Polyphase Sort comenzarían a mezclar.
-print(f"Ready for Merging: {runs_finales}")
+    # Estas 'runs_finales' serían las que el Straight Merging o Polyphase Sort comenzarían a mezclar.
+    print(f"Ready for Merging: {runs_finales}")
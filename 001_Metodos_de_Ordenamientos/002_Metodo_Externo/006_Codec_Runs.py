@@ -0,0 +1,736 @@
+#!/usr/bin/env python3
+"""
+006_Codec_Runs.py
+
+Runs en disco (archivos) con compresión de claves enteras.
+
+Los demás scripts de esta carpeta simulan los dispositivos con listas. Aquí
+una run es un archivo que se escribe y se lee por bloques, y como la run
+está ordenada, las claves consecutivas son cercanas: se guardan las
+diferencias en lugar de los valores.
+
+Codecs (por bloque de BLOQUE claves):
+  raw     int64 little-endian, sin compresión (referencia)
+  varint  primera clave y diferencias en zigzag + LEB128 (1 byte si |d| < 64)
+  for     frame of reference: primera clave, diferencia mínima del bloque y
+          (diferencia - mínima) empaquetada con el ancho de bits justo
+A cualquiera se le puede agregar zlib por bloque: "varint+zlib", "for+zlib:9".
+
+Formato del archivo:
+  cabecera  b"RUN1", id del codec (1 byte), nivel de zlib (1 byte, 0 = sin zlib)
+  bloques   n_claves (uint32), n_bytes (uint32), carga útil
+
+La lectura es en streaming: iter(run) decodifica un bloque a la vez, así
+las mezclas nunca tienen la run entera en memoria. EstadisticasCodec suma
+bytes crudos (8 por clave) y en disco, y el tiempo de (de)codificación.
+
+Uso desde los otros scripts (parámetro codec=):
+  straight_merging_sort(datos, run_size, codec="varint+zlib")
+  distribution_of_initial_runs(datos, ram, codec="for", directorio="runs")  -> lista de ArchivoRun
+
+Puntos de control: si además se da un directorio propio, straight, balanced
+y polyphase guardan manifiesto.json (fase, pasada, runs de cada dispositivo
+con largo y CRC) después de cada mezcla, y reanudar_...(directorio) sigue
+desde el último estado consistente sin volver a leer la entrada:
+  straight_merging_sort(datos, 1000, codec="varint", directorio="tmp_sort")
+  reanudar_straight_merging("tmp_sort")        # si lo anterior se interrumpió
+
+Uso:
+  python 006_Codec_Runs.py               -> ejemplo pequeño
+  python 006_Codec_Runs.py --benchmark   -> ratio y MB/s netos por codec (straight merging)
+  python 006_Codec_Runs.py --benchmark 20  -> idem, suponiendo un disco de 20 MB/s
+"""
+import contextlib
+import io
+import itertools
+import json
+import os
+import shutil
+import struct
+import sys
+import tempfile
+import time
+import zlib
+from array import array
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from ia3 import cargar  # noqa: E402
+
+BLOQUE = 4096  # claves por bloque
+MAGIA = b"RUN1"
+_CABECERA = struct.Struct("<4sBB")
+_BLOQUE = struct.Struct("<II")
+
+
+# -------------------------
+# Enteros: zigzag + LEB128
+# -------------------------
+def _zigzag(v: int) -> int:
+    return v << 1 if v >= 0 else ((-v) << 1) - 1
+
+
+def _dezigzag(z: int) -> int:
+    return z >> 1 if not z & 1 else -((z + 1) >> 1)
+
+
+def _poner_varint(out: bytearray, z: int):
+    while z >= 0x80:
+        out.append((z & 0x7F) | 0x80)
+        z >>= 7
+    out.append(z)
+
+
+def _sacar_varint(buf, pos: int):
+    b = buf[pos]
+    pos += 1
+    if b < 0x80:
+        return b, pos
+    z = b & 0x7F
+    desplazamiento = 7
+    while True:
+        b = buf[pos]
+        pos += 1
+        z |= (b & 0x7F) << desplazamiento
+        if b < 0x80:
+            return z, pos
+        desplazamiento += 7
+
+
+# -------------------------
+# Codecs
+# -------------------------
+class Codec:
+    """Codifica un bloque de enteros a bytes y vuelta. Ver el docstring del módulo."""
+    IDS = {"raw": 0, "varint": 1, "for": 2}
+
+    def __init__(self, tipo: str = "varint", zlib_nivel: int = 0):
+        if tipo not in self.IDS:
+            raise ValueError(f"codec desconocido {tipo!r}; opciones: {tuple(self.IDS)}.")
+        if not 0 <= zlib_nivel <= 9:
+            raise ValueError("el nivel de zlib va de 0 (sin zlib) a 9.")
+        self.tipo = tipo
+        self.zlib_nivel = zlib_nivel
+
+    @property
+    def nombre(self) -> str:
+        return self.tipo + (f"+zlib:{self.zlib_nivel}" if self.zlib_nivel else "")
+
+    def __repr__(self):
+        return f"Codec({self.nombre!r})"
+
+    def codificar(self, valores: List[int]) -> bytes:
+        datos = getattr(self, "_codificar_" + self.tipo)(valores)
+        return zlib.compress(datos, self.zlib_nivel) if self.zlib_nivel else datos
+
+    def decodificar(self, datos: bytes, n: int) -> List[int]:
+        if self.zlib_nivel:
+            datos = zlib.decompress(datos)
+        return getattr(self, "_decodificar_" + self.tipo)(datos, n)
+
+    def primera_clave(self, datos: bytes) -> int:
+        """Primera clave de un bloque no vacío, sin decodificar el resto."""
+        if self.zlib_nivel:
+            datos = zlib.decompressobj().decompress(datos, 16)
+        if self.tipo == "raw":
+            return self._decodificar_raw(datos[:8], 1)[0]
+        # varint y for empiezan con la primera clave en zigzag + LEB128
+        return _dezigzag(_sacar_varint(datos, 0)[0])
+
+    # raw
+    @staticmethod
+    def _codificar_raw(valores):
+        a = array("q", valores)
+        if sys.byteorder == "big":
+            a.byteswap()
+        return a.tobytes()
+
+    @staticmethod
+    def _decodificar_raw(datos, n):
+        a = array("q")
+        a.frombytes(datos)
+        if sys.byteorder == "big":
+            a.byteswap()
+        return a.tolist()
+
+    # varint
+    @staticmethod
+    def _codificar_varint(valores):
+        out = bytearray()
+        anterior = 0
+        for v in valores:
+            d = v - anterior
+            anterior = v
+            z = d << 1 if d >= 0 else ((-d) << 1) - 1
+            while z >= 0x80:
+                out.append((z & 0x7F) | 0x80)
+                z >>= 7
+            out.append(z)
+        return bytes(out)
+
+    @staticmethod
+    def _decodificar_varint(datos, n):
+        valores = [0] * n
+        anterior = 0
+        pos = 0
+        for i in range(n):
+            z, pos = _sacar_varint(datos, pos)
+            anterior += z >> 1 if not z & 1 else -((z + 1) >> 1)
+            valores[i] = anterior
+        return valores
+
+    # frame of reference sobre las diferencias
+    @staticmethod
+    def _codificar_for(valores):
+        out = bytearray()
+        if not valores:
+            return bytes(out)
+        difs = [b - a for a, b in zip(valores, valores[1:])]
+        minimo = min(difs) if difs else 0
+        desvios = [d - minimo for d in difs]
+        ancho = max(desvios).bit_length() if desvios else 0
+        _poner_varint(out, _zigzag(valores[0]))
+        _poner_varint(out, _zigzag(minimo))
+        _poner_varint(out, ancho)
+        if ancho:
+            # el desvío i ocupa los bits [i*ancho, (i+1)*ancho): se arma el
+            # número entero como texto binario (el último desvío a la izquierda)
+            bits = "".join([format(x, f"0{ancho}b") for x in reversed(desvios)])
+            out += int(bits, 2).to_bytes((len(bits) + 7) // 8, "little")
+        return bytes(out)
+
+    @staticmethod
+    def _decodificar_for(datos, n):
+        if n == 0:
+            return []
+        z, pos = _sacar_varint(datos, 0)
+        actual = _dezigzag(z)
+        z, pos = _sacar_varint(datos, pos)
+        minimo = _dezigzag(z)
+        ancho, pos = _sacar_varint(datos, pos)
+        valores = [actual]
+        m = n - 1
+        if not ancho:
+            valores.extend(actual + minimo * i for i in range(1, n))
+            return valores
+        total = m * ancho
+        bits = format(int.from_bytes(datos[pos:], "little"), f"0{total}b")
+        for fin in range(total, 0, -ancho):
+            actual += minimo + int(bits[fin - ancho:fin], 2)
+            valores.append(actual)
+        return valores
+
+
+def obtener_codec(codec: Union[str, Codec]) -> Codec:
+    """Acepta un Codec o un nombre: "raw", "varint", "for", con "+zlib" o "+zlib:N" opcional."""
+    if isinstance(codec, Codec):
+        return codec
+    tipo, _, capa = codec.partition("+")
+    nivel = 0
+    if capa:
+        nombre, _, valor = capa.partition(":")
+        if nombre != "zlib":
+            raise ValueError(f"capa desconocida {capa!r}; la única es 'zlib' (o 'zlib:N').")
+        nivel = int(valor) if valor else 6
+    return Codec(tipo, nivel)
+
+
+def _codec_por_id(tipo_id: int, nivel: int) -> Codec:
+    for tipo, i in Codec.IDS.items():
+        if i == tipo_id:
+            return Codec(tipo, nivel)
+    raise ValueError(f"id de codec desconocido: {tipo_id}.")
+
+
+# -------------------------
+# Estadísticas
+# -------------------------
+class EstadisticasCodec:
+    def __init__(self):
+        self.claves_escritas = 0
+        self.bytes_crudos = 0        # 8 bytes por clave escrita (int64 sin comprimir)
+        self.bytes_disco = 0         # bytes escritos de verdad (cabeceras incluidas)
+        self.bytes_leidos = 0
+        self.codificacion_s = 0.0
+        self.decodificacion_s = 0.0
+
+    @property
+    def ratio(self) -> float:
+        return self.bytes_crudos / self.bytes_disco if self.bytes_disco else 1.0
+
+    def sumar(self, otra: "EstadisticasCodec") -> "EstadisticasCodec":
+        self.claves_escritas += otra.claves_escritas
+        self.bytes_crudos += otra.bytes_crudos
+        self.bytes_disco += otra.bytes_disco
+        self.bytes_leidos += otra.bytes_leidos
+        self.codificacion_s += otra.codificacion_s
+        self.decodificacion_s += otra.decodificacion_s
+        return self
+
+    def __repr__(self):
+        mb = 1 << 20
+        return (f"EstadisticasCodec(crudos={self.bytes_crudos / mb:.2f} MB, disco={self.bytes_disco / mb:.2f} MB, "
+                f"ratio={self.ratio:.2f}x, leídos={self.bytes_leidos / mb:.2f} MB, "
+                f"codificación={self.codificacion_s:.2f} s, decodificación={self.decodificacion_s:.2f} s)")
+
+
+# -------------------------
+# Archivos de runs
+# -------------------------
+class ArchivoRun:
+    """
+    Run ordenada guardada en disco. Se recorre como una lista (for v in run,
+    len(run)) pero decodifica un bloque a la vez. crc es el CRC-32 de los
+    bloques tal como están en disco.
+    """
+    def __init__(self, ruta: str, n: int, codec: Codec, tam: int, crc: int,
+                 stats: Optional[EstadisticasCodec] = None):
+        self.ruta = ruta
+        self.n = n
+        self.codec = codec
+        self.tam = tam
+        self.crc = crc
+        self.stats = stats
+
+    @classmethod
+    def escribir(cls, ruta: str, valores: Iterable[int], codec: Union[str, Codec] = "varint",
+                 bloque: int = BLOQUE, stats: Optional[EstadisticasCodec] = None) -> "ArchivoRun":
+        with EscritorRun(ruta, codec, bloque, stats) as escritor:
+            escritor.extender(valores)
+        return escritor.run
+
+    @classmethod
+    def abrir(cls, ruta: str, stats: Optional[EstadisticasCodec] = None) -> "ArchivoRun":
+        """Abre una run existente: recorre las cabeceras de bloque para obtener n y el CRC."""
+        with open(ruta, "rb") as f:
+            magia, tipo_id, nivel = _CABECERA.unpack(f.read(_CABECERA.size))
+            if magia != MAGIA:
+                raise ValueError(f"{ruta}: no es un archivo de run.")
+            n, crc = 0, 0
+            while True:
+                cab = f.read(_BLOQUE.size)
+                if not cab:
+                    break
+                cuenta, tam = _BLOQUE.unpack(cab)
+                crc = zlib.crc32(f.read(tam), zlib.crc32(cab, crc))
+                n += cuenta
+        return cls(ruta, n, _codec_por_id(tipo_id, nivel), os.path.getsize(ruta), crc, stats)
+
+    def indice(self) -> List[Tuple[int, int, int]]:
+        """
+        (posición en bytes, claves, primera clave) de cada bloque. Sin zlib
+        solo lee el comienzo de cada bloque; bloques(desde=posición) sigue
+        desde cualquiera de ellos.
+        """
+        indice = []
+        with open(self.ruta, "rb") as f:
+            pos = _CABECERA.size
+            f.seek(pos)
+            while True:
+                cab = f.read(_BLOQUE.size)
+                if not cab:
+                    return indice
+                cuenta, tam = _BLOQUE.unpack(cab)
+                datos = f.read(tam if self.codec.zlib_nivel else min(tam, 16))
+                indice.append((pos, cuenta, self.codec.primera_clave(datos)))
+                pos += _BLOQUE.size + tam
+                f.seek(pos)
+
+    def bloques(self, desde: Optional[int] = None) -> Iterator[List[int]]:
+        with open(self.ruta, "rb") as f:
+            f.seek(_CABECERA.size if desde is None else desde)
+            while True:
+                cab = f.read(_BLOQUE.size)
+                if not cab:
+                    return
+                cuenta, tam = _BLOQUE.unpack(cab)
+                datos = f.read(tam)
+                t0 = time.perf_counter()
+                valores = self.codec.decodificar(datos, cuenta)
+                if self.stats is not None:
+                    self.stats.decodificacion_s += time.perf_counter() - t0
+                    self.stats.bytes_leidos += _BLOQUE.size + tam
+                yield valores
+
+    def __iter__(self) -> Iterator[int]:
+        return itertools.chain.from_iterable(self.bloques())
+
+    def __len__(self):
+        return self.n
+
+    def leer(self) -> List[int]:
+        return list(self)
+
+    def borrar(self):
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(self.ruta)
+
+    def __repr__(self):
+        return f"ArchivoRun({os.path.basename(self.ruta)!r}, n={self.n}, {self.codec.nombre}, {self.tam} bytes)"
+
+
+class EscritorRun:
+    """Escribe una run de a una clave (escribir) o de a muchas (extender), por bloques."""
+    def __init__(self, ruta: str, codec: Union[str, Codec] = "varint", bloque: int = BLOQUE,
+                 stats: Optional[EstadisticasCodec] = None):
+        self.ruta = ruta
+        self.codec = obtener_codec(codec)
+        self.bloque = bloque
+        self.stats = stats
+        self.n = 0
+        self.crc = 0
+        self.run: Optional[ArchivoRun] = None
+        self._pendientes: List[int] = []
+        self._f = open(ruta, "wb")
+        self._f.write(_CABECERA.pack(MAGIA, Codec.IDS[self.codec.tipo], self.codec.zlib_nivel))
+
+    def escribir(self, valor: int):
+        self._pendientes.append(valor)
+        if len(self._pendientes) >= self.bloque:
+            self._volcar()
+
+    def extender(self, valores: Iterable[int]):
+        for valor in valores:
+            self._pendientes.append(valor)
+            if len(self._pendientes) >= self.bloque:
+                self._volcar()
+
+    def _volcar(self):
+        valores = self._pendientes
+        self._pendientes = []
+        if not valores:
+            return
+        t0 = time.perf_counter()
+        datos = self.codec.codificar(valores)
+        t = time.perf_counter() - t0
+        cab = _BLOQUE.pack(len(valores), len(datos))
+        self._f.write(cab)
+        self._f.write(datos)
+        self.crc = zlib.crc32(datos, zlib.crc32(cab, self.crc))
+        self.n += len(valores)
+        if self.stats is not None:
+            self.stats.codificacion_s += t
+            self.stats.claves_escritas += len(valores)
+            self.stats.bytes_crudos += 8 * len(valores)
+            self.stats.bytes_disco += len(cab) + len(datos)
+
+    def cerrar(self) -> ArchivoRun:
+        if self.run is None:
+            self._volcar()
+            self._f.close()
+            if self.stats is not None:
+                self.stats.bytes_disco += _CABECERA.size
+            self.run = ArchivoRun(self.ruta, self.n, self.codec, os.path.getsize(self.ruta), self.crc, self.stats)
+        return self.run
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+
+def concatenar_runs(runs: Sequence[ArchivoRun], ruta: str, codec: Union[str, Codec] = "varint",
+                    stats: Optional[EstadisticasCodec] = None, borrar: bool = False) -> ArchivoRun:
+    """
+    Escribe en 'ruta' los bloques de las runs uno detrás de otro, sin
+    decodificarlos. Las runs tienen que estar escritas con 'codec' y ya en
+    orden entre sí (la última clave de cada una <= la primera de la siguiente).
+    Con borrar=True borra cada run después de copiarla.
+    """
+    codec = obtener_codec(codec)
+    for run in runs:
+        if run.codec.nombre != codec.nombre:
+            raise ValueError(f"{run.ruta}: codec {run.codec.nombre}, se esperaba {codec.nombre}.")
+    crc = 0
+    n = 0
+    with open(ruta, "wb") as out:
+        out.write(_CABECERA.pack(MAGIA, Codec.IDS[codec.tipo], codec.zlib_nivel))
+        for run in runs:
+            with open(run.ruta, "rb") as f:
+                f.seek(_CABECERA.size)
+                for trozo in iter(lambda: f.read(1 << 20), b""):
+                    crc = zlib.crc32(trozo, crc)
+                    out.write(trozo)
+            n += run.n
+            if borrar:
+                run.borrar()
+    if stats is not None:
+        stats.bytes_disco += _CABECERA.size
+    return ArchivoRun(ruta, n, codec, os.path.getsize(ruta), crc, stats)
+
+
+class AlmacenRuns:
+    """
+    Directorio de runs con un codec y estadísticas comunes. Sin 'directorio'
+    crea uno temporal, que cerrar() borra.
+    """
+    def __init__(self, codec: Union[str, Codec] = "varint", directorio: Optional[str] = None,
+                 bloque: int = BLOQUE):
+        self.codec = obtener_codec(codec)
+        self.bloque = bloque
+        self.stats = EstadisticasCodec()
+        self.temporal = directorio is None
+        self.directorio = tempfile.mkdtemp(prefix="runs_") if directorio is None else directorio
+        os.makedirs(self.directorio, exist_ok=True)
+        self._contador = itertools.count()
+
+    def nueva_ruta(self, prefijo: str = "run") -> str:
+        return os.path.join(self.directorio, f"{prefijo}_{next(self._contador):06d}.run")
+
+    def escritor(self, prefijo: str = "run") -> EscritorRun:
+        return EscritorRun(self.nueva_ruta(prefijo), self.codec, self.bloque, self.stats)
+
+    def escribir(self, valores: Iterable[int], prefijo: str = "run") -> ArchivoRun:
+        return ArchivoRun.escribir(self.nueva_ruta(prefijo), valores, self.codec, self.bloque, self.stats)
+
+    def cerrar(self):
+        if self.temporal:
+            shutil.rmtree(self.directorio, ignore_errors=True)
+
+    def resumen(self) -> str:
+        s = self.stats
+        return (f"Codec {self.codec.nombre}: {s.bytes_crudos / 2 ** 20:.2f} MB crudos -> "
+                f"{s.bytes_disco / 2 ** 20:.2f} MB en disco (ratio {s.ratio:.2f}x); "
+                f"codificación {s.codificacion_s:.2f} s, decodificación {s.decodificacion_s:.2f} s")
+
+
+def almacen_para(codec: Union[str, Codec, AlmacenRuns], directorio: Optional[str] = None) -> AlmacenRuns:
+    """El parámetro codec= de los ordenamientos: un nombre, un Codec o un AlmacenRuns ya creado."""
+    return codec if isinstance(codec, AlmacenRuns) else AlmacenRuns(codec, directorio)
+
+
+def almacen_de_runs(codec: Union[str, Codec, AlmacenRuns], directorio: Optional[str], funcion: str) -> AlmacenRuns:
+    """
+    almacen_para de las funciones que devuelven las runs en disco (las de
+    distribución inicial): sin un AlmacenRuns, 'directorio' es obligatorio,
+    porque nadie cerraría (borraría) un directorio temporal.
+    """
+    if not isinstance(codec, AlmacenRuns) and directorio is None:
+        raise ValueError(f"{funcion}: con codec={codec!r} hace falta 'directorio' (o pasar un AlmacenRuns); "
+                         f"las runs devueltas quedan en él.")
+    return almacen_para(codec, directorio)
+
+
+# -------------------------
+# Claves repetidas
+# -------------------------
+def combinar_iguales(elementos: Iterable, unique: bool = False, reduce=None) -> Iterator:
+    """
+    Recorre una secuencia ordenada y junta los elementos iguales consecutivos:
+    unique=True deja uno solo; reduce=fn recibe pares (clave, valor) y combina
+    los de igual clave en (clave, fn(v1, v2)). Como las mezclas combinan en
+    cualquier orden, fn debe ser asociativa y conmutativa (suma, max, ...).
+    """
+    it = iter(elementos)
+    fin = object()
+    actual = next(it, fin)
+    if actual is fin:
+        return
+    if reduce is None:
+        for x in it:
+            if x != actual:
+                yield actual
+                actual = x
+        yield actual
+        return
+    clave, valor = actual
+    for c, v in it:
+        if c == clave:
+            valor = reduce(valor, v)
+        else:
+            yield clave, valor
+            clave, valor = c, v
+    yield clave, valor
+
+
+def bytes_elementos(n: int, reduce=None) -> int:
+    """Tamaño de n elementos sin comprimir: 8 bytes por clave (16 por par clave, valor)."""
+    return n * (16 if reduce is not None else 8)
+
+
+def informar_ahorro(ahorro: List[int], reduce=None):
+    """Imprime el ahorro de la última pasada (ahorro: elementos eliminados por pasada)."""
+    print(f"  Ahorro de la pasada: {ahorro[-1]} elementos ({bytes_elementos(ahorro[-1], reduce)} bytes)")
+
+
+# -------------------------
+# Rangos de claves
+# -------------------------
+def en_rango(x, key_range) -> bool:
+    """key_range = (lo, hi): lo <= x < hi; None en un extremo = sin cota."""
+    lo, hi = key_range
+    return (lo is None or not x < lo) and (hi is None or x < hi)
+
+
+# -------------------------
+# Manifiesto (puntos de control)
+# -------------------------
+MANIFIESTO = "manifiesto.json"
+VERSION_MANIFIESTO = 1
+
+
+def _a_json(x):
+    if isinstance(x, ArchivoRun):
+        return {"archivo": os.path.basename(x.ruta), "n": x.n, "crc": x.crc}
+    if isinstance(x, (list, tuple)):
+        return [_a_json(y) for y in x]
+    if isinstance(x, dict):
+        return {k: _a_json(v) for k, v in x.items()}
+    return x
+
+
+def _de_json(x, almacen: AlmacenRuns, usados: set):
+    if isinstance(x, list):
+        return [_de_json(y, almacen, usados) for y in x]
+    if isinstance(x, dict) and "archivo" in x:
+        ruta = os.path.join(almacen.directorio, x["archivo"])
+        if not os.path.exists(ruta):
+            raise ValueError(f"{x['archivo']}: falta el archivo de la run.")
+        run = ArchivoRun.abrir(ruta, almacen.stats)
+        if (run.n, run.crc) != (x["n"], x["crc"]):
+            raise ValueError(f"{x['archivo']}: largo o checksum distintos a los del manifiesto.")
+        usados.add(x["archivo"])
+        return run
+    if isinstance(x, dict):
+        return {k: _de_json(v, almacen, usados) for k, v in x.items()}
+    return x
+
+
+def guardar_manifiesto(almacen: AlmacenRuns, algoritmo: str, estado: Dict[str, Any]):
+    """
+    Guarda el estado de un ordenamiento (fase, pasada, qué runs hay en cada
+    dispositivo, con su largo y CRC) en almacen.directorio/manifiesto.json.
+    Se reemplaza de forma atómica: si el proceso muere a mitad de escritura,
+    queda el manifiesto anterior. Con un directorio temporal no hace nada
+    (no habría desde dónde reanudar).
+    """
+    if almacen.temporal:
+        return
+    doc = {"version": VERSION_MANIFIESTO, "algoritmo": algoritmo, "codec": almacen.codec.nombre,
+           "bloque": almacen.bloque, "estado": _a_json(estado)}
+    ruta = os.path.join(almacen.directorio, MANIFIESTO)
+    with open(ruta + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(doc, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(ruta + ".tmp", ruta)
+
+
+def cargar_manifiesto(directorio: str, algoritmo: str) -> Tuple[AlmacenRuns, Dict[str, Any]]:
+    """
+    Lee el manifiesto de 'directorio' y verifica cada run (que exista y que
+    su largo y su CRC coincidan). Borra las runs que el manifiesto no nombra
+    (la salida a medias de la mezcla interrumpida). Devuelve el almacén, listo
+    para seguir escribiendo runs, y el estado con las runs como ArchivoRun.
+    """
+    ruta = os.path.join(directorio, MANIFIESTO)
+    if not os.path.exists(ruta):
+        raise ValueError(f"no hay un manifiesto en {directorio!r}.")
+    with open(ruta, encoding="utf-8") as f:
+        doc = json.load(f)
+    if doc.get("version") != VERSION_MANIFIESTO:
+        raise ValueError(f"versión de manifiesto no soportada: {doc.get('version')!r}.")
+    if doc.get("algoritmo") != algoritmo:
+        raise ValueError(f"el manifiesto es de {doc.get('algoritmo')!r}, no de {algoritmo!r}.")
+    almacen = AlmacenRuns(doc["codec"], directorio, doc["bloque"])
+    usados: set = set()
+    estado = _de_json(doc["estado"], almacen, usados)
+    ultimo = -1
+    for nombre in os.listdir(directorio):
+        if not nombre.endswith(".run"):
+            continue
+        if nombre not in usados:
+            os.remove(os.path.join(directorio, nombre))
+            continue
+        sufijo = nombre[:-len(".run")].rpartition("_")[2]
+        if sufijo.isdigit():
+            ultimo = max(ultimo, int(sufijo))
+    almacen._contador = itertools.count(ultimo + 1)  # no pisar las runs que siguen vivas
+    return almacen, estado
+
+
+# -------------------------
+# Benchmark
+# -------------------------
+CODECS_BENCHMARK = ("raw", "raw+zlib", "varint", "varint+zlib", "for", "for+zlib")
+
+
+def benchmark(n: int = 200_000, run_size: int = 20_000, ancho_banda_mb: float = 100.0, seed: int = 0):
+    """
+    Ratio de compresión, velocidad del codec y MB/s netos de straight_merging_sort
+    por codec. El disco de la máquina suele estar en caché, así que además del
+    tiempo medido se informa uno estimado para un disco de 'ancho_banda_mb' MB/s:
+    tiempo de CPU + bytes escritos y leídos / ancho de banda, y el ancho de
+    banda por debajo del cual cada codec gana frente a raw. Los codecs son
+    Python puro: el ahorro solo compensa con discos (o redes) lentos.
+    """
+    import random
+    # como script este módulo es __main__: el AlmacenRuns tiene que ser el de codec_runs, que usa straight
+    codec_runs = cargar("codec_runs")
+    straight = cargar("straight_merging")
+    rnd = random.Random(seed)
+    datos = [rnd.randrange(10 ** 9) for _ in range(n)]
+    run = sorted(datos[:run_size])
+    mb_crudos = 8 * n / 2 ** 20
+    print(f"Benchmark codecs de runs: n={n}, run_size={run_size}, disco supuesto {ancho_banda_mb:.0f} MB/s")
+    print(f"  {'codec':<12} {'ratio':>6} {'cod. MB/s':>10} {'dec. MB/s':>10} {'sort (s)':>9} "
+          f"{'E/S MB':>8} {'estimado (s)':>13} {'MB/s netos':>11}  conviene con disco de menos de")
+    base = None
+    for nombre in CODECS_BENCHMARK:
+        codec = obtener_codec(nombre)
+        t0 = time.perf_counter()
+        datos_run = codec.codificar(run)
+        t_cod = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        assert codec.decodificar(datos_run, len(run)) == run
+        t_dec = time.perf_counter() - t0
+        mb_run = 8 * len(run) / 2 ** 20
+
+        almacen = codec_runs.AlmacenRuns(nombre)
+        try:
+            t0 = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                ordenado = straight.straight_merging_sort(datos, run_size, codec=almacen)
+            t_sort = time.perf_counter() - t0
+        finally:
+            almacen.cerrar()
+        assert ordenado == sorted(datos), nombre
+        s = almacen.stats
+        mb_es = (s.bytes_disco + s.bytes_leidos) / 2 ** 20
+        estimado = t_sort + mb_es / ancho_banda_mb
+        netos = mb_crudos / estimado
+        if base is None:
+            base = (netos, t_sort, mb_es)  # raw: la referencia
+        # ancho de banda en el que el tiempo de CPU extra se paga con la E/S ahorrada
+        ahorro_mb, extra_s = base[2] - mb_es, t_sort - base[1]
+        equilibrio = ("-" if nombre == "raw" else "nunca" if ahorro_mb <= 0
+                      else "siempre" if extra_s <= 0 else f"{ahorro_mb / extra_s:.1f} MB/s")
+        print(f"  {nombre:<12} {s.ratio:>5.2f}x {mb_run / t_cod:>10.1f} {mb_run / t_dec:>10.1f} {t_sort:>9.2f} "
+              f"{mb_es:>8.1f} {estimado:>13.2f} {netos:>7.2f} ({netos / base[0] - 1:+.0%})  {equilibrio}")
+
+
+def ejemplo():
+    import random
+    datos = sorted(random.sample(range(10 ** 6), 20))
+    print(f"Run (ordenada): {datos}")
+    for nombre in ("raw", "varint", "for", "for+zlib"):
+        codec = obtener_codec(nombre)
+        datos_cod = codec.codificar(datos)
+        print(f"  {nombre:<9} {len(datos_cod):>4} bytes (crudos: {8 * len(datos)}), "
+              f"decodifica bien: {codec.decodificar(datos_cod, len(datos)) == datos}")
+    almacen = AlmacenRuns("varint+zlib")
+    try:
+        run = almacen.escribir(datos)
+        print(f"\n{run}: {run.leer() == datos}; reabierta: {ArchivoRun.abrir(run.ruta)}")
+        print(almacen.resumen())
+    finally:
+        almacen.cerrar()
+
+
+if __name__ == "__main__":
+    if "--benchmark" in sys.argv:
+        extra = sys.argv[sys.argv.index("--benchmark") + 1:]
+        benchmark(ancho_banda_mb=float(extra[0])) if extra else benchmark()
+    else:
+        ejemplo()
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+007_Cascade_Oscilante.py
+
+Cascade merge y oscillating sort, con la misma representación que
+polyphase_sort (004_Polyphase_sort..py): K dispositivos que son listas de
+runs, runs ficticias ([]) para completar la distribución, y mezclar_runs
+para cada paso (en memoria o, con codec=, en archivos).
+
+- cascade_sort: la distribución inicial es la "perfecta de cascada" sobre
+  K-1 dispositivos. En cada pasada se mezcla (K-1)-way hasta vaciar el
+  dispositivo más corto, después (K-2)-way sobre el que se vació, y así
+  hasta 2-way; la copia 1-way final se evita dejando las runs donde están.
+  Para K >= 5 Knuth (5.4.3) muestra que escribe menos que el polifásico.
+- oscillating_sort: no separa distribución y mezcla. Para dejar una run de
+  nivel L en el dispositivo t se arma una de nivel L-1 en cada uno de los
+  otros K-1 dispositivos y se mezclan (K-1)-way en t. Los dispositivos son
+  pilas (cintas leídas hacia atrás): cada mezcla toma la última run de cada
+  uno, que es justo la que se acaba de generar. Cada elemento se escribe
+  una vez por nivel, y los niveles son ceil(log_(K-1) runs).
+
+stats (dict) se llena igual que en polyphase_sort y balanced_multiway_sort:
+pasadas (niveles, en el oscilante), mezclas y transferencias (elementos
+escritos en algún dispositivo, incluida la distribución inicial).
+
+Uso:
+  python 007_Cascade_Oscilante.py               -> ejemplo pequeño
+  python 007_Cascade_Oscilante.py --benchmark   -> pasadas, transferencias y tiempo por método, K y runs
+"""
+import contextlib
+import io
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from ia3 import cargar  # noqa: E402
+
+
+_codec = cargar("codec_runs")
+_poly = cargar("polyphase")
+mezclar_runs = _poly.mezclar_runs
+
+
+# --- Cascade Merge ---
+def distribucion_cascada(n_runs, k_entrada):
+    """
+    Runs por dispositivo en la primera distribución perfecta de cascada con
+    al menos n_runs runs: de (a1 >= ... >= aP) se pasa a
+    (a1+...+aP, a1+...+a(P-1), ..., a1). Con 2 dispositivos de entrada
+    coincide con la de Fibonacci del polifásico.
+    """
+    dist = [1] * k_entrada
+    while sum(dist) < n_runs:
+        dist = [sum(dist[:k_entrada - i]) for i in range(k_entrada)]
+    return dist
+
+def cascade_sort(external_data, run_size, k_devices=4, codec=None, directorio=None, stats=None):
+    """
+    Cascade merge con K dispositivos (ver el docstring del módulo).
+    """
+    if k_devices < 3:
+        raise ValueError("Cascade merge requiere al menos 3 dispositivos (cintas).")
+    print("INICIO DEL ORDENAMIENTO EXTERNO: Cascade Merge")
+    print(f"Dispositivos (K): {k_devices}")
+    almacen = _codec.almacen_para(codec, directorio) if codec is not None else None
+    try:
+        devices = _poly.distribute_runs_initial(external_data, run_size, k_devices, codec=almacen,
+                                                distribucion=distribucion_cascada)
+        print("\nFASE 1: Distribución Inicial (perfecta de cascada)")
+        for i, dev in enumerate(devices):
+            print(f"  Dispositivo D{i} (Runs: {len(dev)}): {dev}")
+        if stats is not None:
+            stats.update(pasadas=0, mezclas=0, transferencias=len(external_data))
+
+        pasada = 0
+        output_device_index = k_devices - 1
+        while sum(len(dev) for dev in devices) > 1:
+            pasada += 1
+            print(f"\n--- PASADA {pasada} ---")
+            # Las entradas de la pasada son los dispositivos con runs al empezarla
+            entradas = [i for i in range(k_devices) if i != output_device_index and devices[i]]
+            if len(entradas) < 2:
+                raise RuntimeError("la distribución de cascada quedó desbalanceada.")
+            while len(entradas) >= 2:
+                # (len(entradas))-way hasta que se vacíe la entrada más corta
+                num_merges = min(len(devices[i]) for i in entradas)
+                for _ in range(num_merges):
+                    run_to_merge = [devices[i].pop(0) for i in entradas]
+                    merged_run = mezclar_runs(run_to_merge, almacen, stats)
+                    devices[output_device_index].append(merged_run)
+                    if almacen is not None:
+                        for run in run_to_merge:
+                            if len(run) > 0 and run is not merged_run:
+                                run.borrar()
+                print(f"  {len(entradas)}-way x {num_merges} -> D{output_device_index}")
+                vacias = [i for i in entradas if not devices[i]]
+                entradas = [i for i in entradas if devices[i]]
+                # El que se vació recibe la mezcla de orden siguiente (y es la
+                # salida de la próxima pasada, si esta ya no tiene más mezclas)
+                output_device_index = vacias[0]
+            # La entrada que queda (si queda) conserva sus runs: la copia 1-way se evita
+            print(f"  Runs por dispositivo: {[len(dev) for dev in devices]}")
+
+        if stats is not None:
+            stats["pasadas"] = pasada
+        final = [run for dev in devices for run in dev]
+        if almacen is None:
+            return final[0] if final else []
+        print(almacen.resumen())
+        return final[0].leer() if final else []
+    finally:
+        if almacen is not None and almacen is not codec:
+            almacen.cerrar()
+
+
+# --- Oscillating Sort ---
+def oscillating_sort(external_data, run_size, k_devices=4, codec=None, directorio=None, stats=None):
+    """
+    Oscillating sort con K dispositivos (ver el docstring del módulo). Las
+    runs iniciales se leen de la entrada recién cuando la recursión las pide.
+    """
+    if k_devices < 3:
+        raise ValueError("Oscillating sort requiere al menos 3 dispositivos (cintas).")
+    print("INICIO DEL ORDENAMIENTO EXTERNO: Oscillating Sort")
+    print(f"Dispositivos (K): {k_devices}")
+    n = len(external_data)
+    n_runs = -(-n // run_size)
+    niveles = 0
+    while (k_devices - 1) ** niveles < n_runs:
+        niveles += 1
+    print(f"Runs iniciales: {n_runs}, niveles de mezcla: {niveles}")
+    almacen = _codec.almacen_para(codec, directorio) if codec is not None else None
+    devices = [[] for _ in range(k_devices)]  # pilas: se escribe y se lee por el final
+    siguiente = [0]  # posición de la próxima run en la entrada
+    if stats is not None:
+        stats.update(pasadas=niveles, mezclas=0, transferencias=0)
+
+    def generar(nivel, t):
+        """Deja exactamente una run de nivel 'nivel' encima del dispositivo t."""
+        if nivel == 0:
+            i = siguiente[0]
+            if i >= n:
+                devices[t].append([])  # entrada agotada: run ficticia
+                return
+            siguiente[0] = i + run_size
+            run = sorted(external_data[i:i + run_size])
+            if stats is not None:
+                stats["transferencias"] += len(run)
+            devices[t].append(almacen.escribir(run) if almacen is not None else run)
+            return
+        otros = [d for d in range(k_devices) if d != t]
+        for d in otros:
+            generar(nivel - 1, d)
+        run_to_merge = [devices[d].pop() for d in otros]
+        merged_run = mezclar_runs(run_to_merge, almacen, stats)
+        devices[t].append(merged_run)
+        if nivel >= niveles - 1:
+            print(f"  Nivel {nivel}: {len([r for r in run_to_merge if len(r) > 0])} runs -> D{t} "
+                  f"({len(merged_run)} elementos)")
+        if almacen is not None:
+            for run in run_to_merge:
+                if len(run) > 0 and run is not merged_run:
+                    run.borrar()
+
+    try:
+        generar(niveles, 0)
+        final = devices[0].pop()
+        if almacen is None:
+            return final
+        print(almacen.resumen())
+        return final.leer() if len(final) > 0 else []
+    finally:
+        if almacen is not None and almacen is not codec:
+            almacen.cerrar()
+
+
+# --- Benchmark ---
+def benchmark(dispositivos=(3, 4, 5, 6, 8), cantidades_runs=(10, 100, 1000), run_size=50, seed=0):
+    """
+    Pasadas, transferencias (también por elemento) y tiempo de cada método.
+    Con T dispositivos, balanced usa T//2 de entrada y T//2 de salida (así
+    que necesita T >= 4); los demás usan los T. Se marca con * el de menos
+    transferencias.
+    """
+    balanced = cargar("balanced_merging")
+    metodos = {
+        "balanced": lambda d, k, s: balanced.balanced_multiway_sort(d, run_size, k // 2, stats=s),
+        "polyphase": lambda d, k, s: _poly.polyphase_sort(d, run_size, k, stats=s),
+        "cascade": lambda d, k, s: cascade_sort(d, run_size, k, stats=s),
+        "oscillating": lambda d, k, s: oscillating_sort(d, run_size, k, stats=s),
+    }
+    rnd = random.Random(seed)
+    print(f"Benchmark de mezcla externa (run_size={run_size})")
+    print(f"  {'K':>2} {'runs':>5} {'método':<12} {'pasadas':>7} {'mezclas':>7} {'transferencias':>14} "
+          f"{'por elemento':>12} {'tiempo (s)':>10}")
+    for runs in cantidades_runs:
+        datos = [rnd.randrange(10 ** 9) for _ in range(runs * run_size)]
+        esperado = sorted(datos)
+        for k in dispositivos:
+            filas = []
+            for nombre, ordenar in metodos.items():
+                if nombre == "balanced" and k < 4:
+                    continue
+                stats = {}
+                t0 = time.perf_counter()
+                with contextlib.redirect_stdout(io.StringIO()):
+                    resultado = ordenar(datos, k, stats)
+                t = time.perf_counter() - t0
+                assert resultado == esperado, (nombre, k, runs)
+                filas.append((nombre, stats, t))
+            mejor = min(f[1]["transferencias"] for f in filas)
+            for nombre, stats, t in filas:
+                marca = "*" if stats["transferencias"] == mejor else " "
+                print(f"  {k:>2} {runs:>5} {nombre:<12} {stats['pasadas']:>7} {stats['mezclas']:>7} "
+                      f"{stats['transferencias']:>14} {stats['transferencias'] / len(datos):>11.2f}{marca} {t:>10.3f}")
+
+
+# --- Ejemplo de Uso ---
+if __name__ == "__main__":
+    if "--benchmark" in sys.argv:
+        benchmark()
+    else:
+        datos_externos = [10, 80, 30, 90, 40, 50, 70, 20, 100, 5, 25, 45, 60, 15, 35, 85]
+        TAMAÑO_RAM = 2
+        K_DISPOSITIVOS = 4
+
+        for ordenar in (cascade_sort, oscillating_sort):
+            stats = {}
+            lista_ordenada = ordenar(datos_externos, TAMAÑO_RAM, K_DISPOSITIVOS, stats=stats)
+            print(f"\nResultado Final (Archivo Ordenado): {lista_ordenada}")
+            print(f"Estadísticas: {stats}\n")
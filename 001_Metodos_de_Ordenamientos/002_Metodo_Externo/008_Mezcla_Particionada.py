@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+"""
+008_Mezcla_Particionada.py
+
+Mezcla final particionada por rangos de claves, en paralelo.
+
+La última mezcla de multiway_merge (003_Balanced_MM.py) y de
+straight_merging_sort (001_Staright_Merging.py) es un solo flujo
+secuencial: aunque las runs se hayan generado en paralelo, un solo núcleo
+lee y escribe todo el archivo. Aquí la mezcla se reparte en P tramos
+contiguos de la salida:
+
+  1. Muestreo: la primera clave de cada bloque de cada run (ArchivoRun.indice;
+     en una lista, un elemento cada 'bloque') es una muestra ordenada de la
+     run. Con ella se busca la clave de rango exacto i*N/P de la salida:
+     búsqueda binaria sobre la muestra y después sobre un solo bloque por run.
+  2. Cortes: en cada run, búsqueda binaria de la posición del corte. Las
+     claves iguales al divisor se reparten empezando por la primera run,
+     que es el orden en que las emite multiway_merge.
+  3. Mezcla: cada tramo (las mismas claves de todas las runs entre dos cortes)
+     se mezcla en un proceso distinto y se escribe en su propio segmento.
+  4. Concatenación: los segmentos se copian uno detrás de otro, sin decodificar
+     (concatenar_runs de 006_Codec_Runs.py).
+
+Con runs en disco cada corte cae en un múltiplo del tamaño de bloque del
+almacén, así los bloques de los segmentos son exactamente los que escribiría
+la mezcla secuencial y el archivo final es idéntico byte a byte (también el
+CRC). Con listas el resultado es la misma lista que multiway_merge.
+
+Requisitos: ninguno (multiprocessing de la biblioteca estándar).
+
+Uso:
+  python 008_Mezcla_Particionada.py                  -> ejemplo pequeño
+  python 008_Mezcla_Particionada.py --benchmark      -> tiempo de la mezcla final con 1..cpu_count procesos
+  python 008_Mezcla_Particionada.py --benchmark 5e6  -> idem con 5 millones de claves
+"""
+import bisect
+import contextlib
+import filecmp
+import heapq
+import io
+import itertools
+import os
+import random
+import sys
+import time
+from typing import Dict, List, Optional, Sequence
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from ia3 import cargar, crear_pool  # noqa: E402
+
+
+_codec = cargar("codec_runs")
+
+
+# -------------------------
+# Acceso por posición a una run (lista o ArchivoRun)
+# -------------------------
+class _Run:
+    """
+    Una run ordenada vista como bloques: 'inicios' (posición del primer
+    elemento de cada bloque) y 'primeras' (su clave). Los bloques de un
+    archivo se decodifican solo cuando una búsqueda los necesita.
+    """
+    def __init__(self, run, bloque: int):
+        self.run = run
+        self.n = len(run)
+        if isinstance(run, _codec.ArchivoRun):
+            self.indice = run.indice()
+            self.inicios = list(itertools.accumulate([0] + [cuenta for _, cuenta, _ in self.indice]))[:-1]
+            self.primeras = [primera for _, _, primera in self.indice]
+        else:
+            self.indice = None
+            self.inicios = list(range(0, self.n, bloque))
+            self.primeras = [run[i] for i in self.inicios]
+        self.bloque_tam = bloque
+        self._cache = {}
+
+    def bloque(self, b: int) -> list:
+        if self.indice is None:
+            inicio = self.inicios[b]
+            return self.run[inicio:inicio + self.bloque_tam]
+        valores = self._cache.get(b)
+        if valores is None:
+            if len(self._cache) >= 8:
+                self._cache.clear()
+            valores = next(self.run.bloques(desde=self.indice[b][0]))
+            self._cache[b] = valores
+        return valores
+
+    def contar(self, v, hasta_iguales: bool = False) -> int:
+        """Elementos < v (o <= v, con hasta_iguales)."""
+        buscar = bisect.bisect_right if hasta_iguales else bisect.bisect_left
+        b = buscar(self.primeras, v)
+        if b == 0:
+            return 0
+        return self.inicios[b - 1] + buscar(self.bloque(b - 1), v)
+
+    def tramo(self, inicio: int, fin: int):
+        """Lo que necesita un proceso para leer run[inicio:fin] por su cuenta."""
+        if self.indice is None:
+            return self.run[inicio:fin]
+        b = bisect.bisect_right(self.inicios, inicio) - 1
+        r = self.run
+        return r.ruta, r.n, r.codec.nombre, r.tam, r.crc, self.indice[b][0], inicio - self.inicios[b], fin - inicio
+
+
+def _seleccionar(runs: List[_Run], muestra: list, rango: int) -> List[int]:
+    """
+    Posiciones de corte de cada run tales que a la izquierda quedan
+    exactamente 'rango' elementos, los mismos que dejaría la mezcla secuencial.
+    """
+    # la mayor clave de la muestra con a lo sumo 'rango' elementos menores
+    lo, hi = 0, len(muestra) - 1
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if sum(r.contar(muestra[mid]) for r in runs) <= rango:
+            lo = mid
+        else:
+            hi = mid - 1
+    s = muestra[lo]
+    hasta_s = [r.contar(s, hasta_iguales=True) for r in runs]
+    if sum(hasta_s) > rango:
+        v = s
+    else:
+        # la clave buscada está entre s y la siguiente de la muestra: como
+        # ningún bloque empieza en ese intervalo, en cada run está en el
+        # mismo bloque que el último elemento <= s
+        siguiente = muestra[lo + 1] if lo + 1 < len(muestra) else None
+        candidatos = []
+        for r, c in zip(runs, hasta_s):
+            if c == 0 or c == r.n:
+                continue
+            b = bisect.bisect_right(r.inicios, c - 1) - 1
+            for x in r.bloque(b)[c - r.inicios[b]:]:
+                if siguiente is not None and not x < siguiente:
+                    break
+                candidatos.append(x)
+        candidatos.sort()
+        v = candidatos[rango - sum(hasta_s)]
+    cortes = [r.contar(v) for r in runs]
+    resto = rango - sum(cortes)
+    for i, r in enumerate(runs):
+        if resto == 0:
+            break
+        iguales = min(r.contar(v, hasta_iguales=True) - cortes[i], resto)
+        cortes[i] += iguales
+        resto -= iguales
+    return cortes
+
+
+def calcular_cortes(runs: Sequence, particiones: int, bloque: int = _codec.BLOQUE) -> List[List[int]]:
+    """
+    Pasos 1 y 2: cortes[j][i] es donde empieza el tramo j en la run i (el
+    último elemento de la lista es el largo de cada run). Los rangos de corte
+    son múltiplos de 'bloque' (y sin cortes repetidos).
+    """
+    return _cortes([_Run(run, bloque) for run in runs if len(run) > 0], particiones, bloque)
+
+
+def _cortes(vistas: List[_Run], particiones: int, alineacion: int) -> List[List[int]]:
+    if not vistas:
+        return [[], []]
+    n = sum(r.n for r in vistas)
+    muestra = sorted(set(itertools.chain.from_iterable(r.primeras for r in vistas)))
+    rangos = sorted({(n * j // particiones) // alineacion * alineacion for j in range(1, particiones)} - {0})
+    cortes = [[0] * len(vistas)]
+    for rango in rangos:
+        if rango < n:
+            cortes.append(_seleccionar(vistas, muestra, rango))
+    cortes.append([r.n for r in vistas])
+    return cortes
+
+
+# -------------------------
+# Trabajo de cada proceso
+# -------------------------
+def _leer_tramo(tramo):
+    if isinstance(tramo, list):
+        return tramo
+    ruta, n, codec, tam, crc, desde, salto, cantidad = tramo
+    run = _codec.ArchivoRun(ruta, n, _codec.obtener_codec(codec), tam, crc)
+    return itertools.islice(itertools.chain.from_iterable(run.bloques(desde=desde)), salto, salto + cantidad)
+
+
+def _mezclar_tramo(args):
+    """Paso 3: mezcla un tramo de cada run. Sin ruta devuelve la lista; con ruta, el segmento escrito."""
+    tramos, ruta, codec, bloque = args
+    mezcla = heapq.merge(*[_leer_tramo(t) for t in tramos])
+    if ruta is None:
+        return list(mezcla)
+    stats = _codec.EstadisticasCodec()
+    with _codec.EscritorRun(ruta, codec, bloque, stats) as escritor:
+        escritor.extender(mezcla)
+    return escritor.run, stats
+
+
+# -------------------------
+# Mezcla particionada
+# -------------------------
+def mezcla_particionada(runs: Sequence, almacen=None, procesos: Optional[int] = None,
+                        particiones: Optional[int] = None, tiempos: Optional[Dict[str, float]] = None):
+    """
+    Mezcla las runs (listas o ArchivoRun) en 'particiones' tramos (por
+    defecto 2 por proceso), cada uno en un proceso del pool. Devuelve una
+    lista o, con 'almacen' (un AlmacenRuns), un ArchivoRun idéntico byte a
+    byte al que escribiría multiway_merge(runs, almacen.escritor()).
+
+    procesos: tamaño del pool (por defecto os.cpu_count(); 1 = sin pool).
+    tiempos: si se pasa un dict, se llena con el tiempo de cada paso, el
+             número de tramos y el tamaño del más grande.
+    """
+    runs = [run for run in runs if len(run) > 0]
+    procesos = procesos or os.cpu_count() or 1
+    particiones = particiones or 2 * procesos
+    if tiempos is None:
+        tiempos = {}
+    t0 = time.perf_counter()
+    if almacen is not None:
+        bloque = almacen.bloque
+        vistas = [_Run(run, bloque) for run in runs]
+        cortes = _cortes(vistas, particiones, bloque)
+    else:
+        # en memoria no hay bloques que respetar: muestra de ~64 claves por tramo y cortes exactos
+        bloque = max(1, sum(len(run) for run in runs) // (particiones * 64))
+        vistas = [_Run(run, bloque) for run in runs]
+        cortes = _cortes(vistas, particiones, 1)
+    segmentos = [[v.tramo(a, b) for v, a, b in zip(vistas, inicio, fin) if b > a]
+                 for inicio, fin in zip(cortes, cortes[1:])]
+    if almacen is None:
+        tareas = [(tramos, None, None, bloque) for tramos in segmentos]
+    else:
+        tareas = [(tramos, almacen.nueva_ruta("seg"), almacen.codec.nombre, bloque) for tramos in segmentos]
+    t1 = time.perf_counter()
+
+    if procesos > 1 and len(tareas) > 1:
+        with crear_pool(min(procesos, len(tareas))) as pool:
+            resultados = pool.map(_mezclar_tramo, tareas)
+    else:
+        resultados = [_mezclar_tramo(t) for t in tareas]
+    t2 = time.perf_counter()
+
+    if almacen is None:
+        salida = [x for r in resultados for x in r]
+        largos = [len(r) for r in resultados]
+    else:
+        for _, stats in resultados:
+            almacen.stats.sumar(stats)
+        salida = _codec.concatenar_runs([seg for seg, _ in resultados], almacen.nueva_ruta(), almacen.codec,
+                                        almacen.stats, borrar=True)
+        largos = [seg.n for seg, _ in resultados]
+    t3 = time.perf_counter()
+
+    tiempos.update({"cortes_s": t1 - t0, "mezcla_s": t2 - t1, "concatenacion_s": t3 - t2,
+                    "tramos": len(tareas), "tramo_max": max(largos, default=0)})
+    return salida
+
+
+# -------------------------
+# Benchmark
+# -------------------------
+def benchmark(n: int = 2_000_000, n_runs: int = 16, codec: str = "varint", seed: int = 0):
+    """
+    Mezcla final de n_runs runs en disco: multiway_merge secuencial contra
+    mezcla_particionada con 1..cpu_count procesos. Verifica que los archivos
+    sean idénticos.
+    """
+    balanced = cargar("balanced_merging")
+    cpus = os.cpu_count() or 1
+    rnd = random.Random(seed)
+    print(f"Benchmark mezcla final particionada: {n} claves en {n_runs} runs, codec {codec}, {cpus} CPU")
+    almacen = _codec.AlmacenRuns(codec)
+    try:
+        tam = -(-n // n_runs)
+        runs = [almacen.escribir(sorted(rnd.randrange(10 ** 9) for _ in range(min(tam, n - i))))
+                for i in range(0, n, tam)]
+        t0 = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            secuencial = balanced.multiway_merge([runs], almacen.escritor())[0]
+        t_sec = time.perf_counter() - t0
+        print(f"  multiway_merge secuencial: {t_sec:7.2f} s  ({n / t_sec / 1e6:.2f} M claves/s)")
+        for p in range(1, cpus + 1):
+            tiempos: Dict[str, float] = {}
+            t0 = time.perf_counter()
+            run = mezcla_particionada(runs, almacen, procesos=p, tiempos=tiempos)
+            t = time.perf_counter() - t0
+            if not filecmp.cmp(run.ruta, secuencial.ruta, shallow=False) or run.crc != secuencial.crc:
+                raise AssertionError("la mezcla particionada no es idéntica a la secuencial")
+            print(f"  procesos={p:<3} {t:7.2f} s  aceleración={t_sec / t:5.2f}x  "
+                  f"(cortes {tiempos['cortes_s']:.2f} s, mezcla {tiempos['mezcla_s']:.2f} s, "
+                  f"concatenación {tiempos['concatenacion_s']:.2f} s, {tiempos['tramos']} tramos, "
+                  f"el mayor {tiempos['tramo_max'] / n:.1%})")
+            run.borrar()
+    finally:
+        almacen.cerrar()
+
+
+def ejemplo():
+    rnd = random.Random(1)
+    runs = [sorted(rnd.randrange(50) for _ in range(rnd.randrange(5, 15))) for _ in range(4)]
+    for i, run in enumerate(runs):
+        print(f"Run {i}: {run}")
+    cortes = calcular_cortes(runs, 3, bloque=4)
+    print(f"Cortes por run (3 tramos, rangos múltiplos de 4): {cortes}")
+    tiempos: Dict[str, float] = {}
+    resultado = mezcla_particionada(runs, procesos=2, particiones=3, tiempos=tiempos)
+    print(f"Resultado Final: {resultado}")
+    print(f"Igual a sorted(): {resultado == sorted(x for run in runs for x in run)}; {tiempos['tramos']} tramos")
+
+    almacen = _codec.AlmacenRuns("for+zlib", bloque=4)
+    try:
+        archivos = [almacen.escribir(run) for run in runs]
+        run = mezcla_particionada(archivos, almacen, procesos=2, particiones=3)
+        print(f"\nEn disco: {run} -> {run.leer()}")
+    finally:
+        almacen.cerrar()
+
+
+if __name__ == "__main__":
+    if "--benchmark" in sys.argv:
+        args = sys.argv[sys.argv.index("--benchmark") + 1:]
+        benchmark(int(float(args[0]))) if args else benchmark()
+    else:
+        ejemplo()
@@ -0,0 +1,482 @@
+#!/usr/bin/env python3
+"""
+002_Cargador_Grafos.py
+
+Carga de grafos desde disco para dijkstra y un formato binario propio.
+
+dijkstra (001_Algoritmo de Dijkstra.py) recibe un diccionario
+{nodo: [(vecino, peso), ...]} escrito a mano. Aquí los grafos se leen de
+archivos de texto por bloques (tam_bloque bytes a la vez) y cada bloque
+se convierte con numpy en arreglos de origenes, destinos y pesos, sin
+armar una tupla por arista. Al final se construye el CSR (indptr,
+indices, pesos) con un conteo por vértice, como aristas_a_csr de
+002_Prim_CSR.py.
+
+Formatos de texto (también comprimidos con gzip, si terminan en .gz):
+- DIMACS .gr (9th DIMACS Challenge): "c ..." comentario, "p sp n m",
+  "a u v w" arco dirigido. Los vértices 1..n pasan a ser 0..n-1.
+- Lista de aristas, "u v [w]" separados por espacios o, con separador=",",
+  CSV. '#' inicia un comentario; sin peso vale 1. Si todos los extremos son
+  enteros se usan como índices; si no, son etiquetas.
+
+Formato binario (.grb), versión 1, todo little-endian:
+  cabecera  64 bytes: b"GRFB", versión (uint16), flags (uint16), relleno,
+            n (uint64), m (uint64, arcos), posición y largo de las etiquetas
+  flags     bit 0 dirigido, bit 1 pesos float64 (si no, int64),
+            bit 2 destinos int64 (si no, int32)
+  indptr    int64[n + 1]
+  indices   int32 / int64[m], con relleno hasta un múltiplo de 8 bytes
+  pesos     int64 / float64[m]
+  etiquetas UTF-8 separadas por "\n" (opcional)
+abrir_binario usa np.memmap en modo de solo lectura: abrir un grafo de
+50M aristas no lee los arreglos (tarda milisegundos) y varios procesos que
+abren el mismo archivo comparten las páginas en la caché del sistema.
+
+Requisitos:
+- numpy
+
+Uso:
+  python 002_Cargador_Grafos.py                    -> ejemplo pequeño
+  python 002_Cargador_Grafos.py --benchmark        -> carga DIMACS, escritura y apertura del binario (2e6 aristas)
+  python 002_Cargador_Grafos.py --benchmark 5e7
+"""
+import gzip
+import heapq
+import math
+import os
+import struct
+import sys
+import tempfile
+import time
+import warnings
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from ia3 import cargar  # noqa: E402
+
+MAGIA = b"GRFB"
+VERSION = 1
+_CABECERA = struct.Struct("<4sHHIQQQQ")
+TAM_CABECERA = 64
+DIRIGIDO, PESOS_FLOAT, INDICES_64 = 1, 2, 4
+TAM_BLOQUE = 1 << 24  # bytes de texto por bloque
+
+
+# -------------------------
+# Grafo CSR
+# -------------------------
+class GrafoBinario:
+	"""
+	Grafo en formato CSR con arreglos numpy (o np.memmap, si viene de abrir_binario):
+	  - indptr[i] .. indptr[i+1] delimita los arcos que salen del vértice i
+	  - indices[k] es el destino, pesos[k] el peso de ese arco
+	  - etiquetas[i] es el nombre original del vértice i (None = el índice)
+	Un grafo no dirigido guarda cada arista en ambos sentidos.
+	"""
+	def __init__(self, indptr: np.ndarray, indices: np.ndarray, pesos: np.ndarray, dirigido: bool = True,
+	             etiquetas: Optional[List[str]] = None):
+		self.indptr = indptr
+		self.indices = indices
+		self.pesos = pesos
+		self.dirigido = dirigido
+		self.etiquetas = etiquetas
+
+	@property
+	def n(self) -> int:
+		return len(self.indptr) - 1
+
+	@property
+	def m(self) -> int:
+		return len(self.indices)
+
+	def __repr__(self):
+		return f"GrafoBinario(n={self.n}, m={self.m}, {'dirigido' if self.dirigido else 'no dirigido'})"
+
+	def nombre(self, i: int) -> Any:
+		return i if self.etiquetas is None else self.etiquetas[i]
+
+	def indice(self, nodo: Any) -> int:
+		"""Índice de un nodo dado por su etiqueta (o por su índice, si no hay etiquetas)."""
+		if self.etiquetas is None:
+			return int(nodo)
+		if not hasattr(self, "_indices_por_etiqueta"):
+			self._indices_por_etiqueta = {e: i for i, e in enumerate(self.etiquetas)}
+		return self._indices_por_etiqueta[nodo]
+
+	def vecinos(self, i: int) -> List[Tuple[int, Any]]:
+		a, b = int(self.indptr[i]), int(self.indptr[i + 1])
+		return list(zip(self.indices[a:b].tolist(), self.pesos[a:b].tolist()))
+
+	def a_dict(self) -> Dict[Any, List[Tuple[Any, Any]]]:
+		"""Diccionario {nodo: [(vecino, peso), ...]} en el formato de dijkstra (con las etiquetas)."""
+		indptr, indices, pesos = self.indptr.tolist(), self.indices.tolist(), self.pesos.tolist()
+		nombre = self.nombre
+		return {nombre(i): [(nombre(v), w) for v, w in zip(indices[indptr[i]:indptr[i + 1]],
+		                                                  pesos[indptr[i]:indptr[i + 1]])]
+		        for i in range(self.n)}
+
+
+def _csr(n: int, u: np.ndarray, v: np.ndarray, w: np.ndarray, dirigido: bool,
+         etiquetas: Optional[List[str]] = None) -> GrafoBinario:
+	"""Arreglos de arcos -> CSR con un conteo por vértice (orden estable por origen)."""
+	if not dirigido:
+		u, v, w = np.concatenate((u, v)), np.concatenate((v, u)), np.concatenate((w, w))
+	orden = np.argsort(u, kind="stable")
+	indptr = np.zeros(n + 1, dtype=np.int64)
+	np.cumsum(np.bincount(u, minlength=n), out=indptr[1:])
+	tipo = np.int32 if n < 2 ** 31 else np.int64
+	return GrafoBinario(indptr, v[orden].astype(tipo), w[orden], dirigido, etiquetas)
+
+
+def desde_dict(grafo: Dict[Any, List[Tuple[Any, Any]]]) -> GrafoBinario:
+	"""El diccionario de dijkstra (dirigido: cada (vecino, peso) es un arco) como GrafoBinario."""
+	etiquetas = list(grafo)
+	ids = {e: i for i, e in enumerate(etiquetas)}
+	for arcos in grafo.values():
+		for v, _ in arcos:
+			if v not in ids:
+				ids[v] = len(etiquetas)
+				etiquetas.append(v)
+	u = np.array([ids[a] for a, arcos in grafo.items() for _ in arcos], dtype=np.int64)
+	v = np.array([ids[b] for arcos in grafo.values() for b, _ in arcos], dtype=np.int64)
+	w = np.array([p for arcos in grafo.values() for _, p in arcos])
+	if w.dtype.kind not in "if":
+		w = w.astype(np.int64)
+	return _csr(len(etiquetas), u, v, w, True, [str(e) for e in etiquetas])
+
+
+# -------------------------
+# Lectura por bloques
+# -------------------------
+def _abrir_texto(ruta: str):
+	return gzip.open(ruta, "rb") if ruta.endswith(".gz") else open(ruta, "rb")
+
+
+def _bloques_de_lineas(ruta: str, tam_bloque: int = TAM_BLOQUE) -> Iterator[List[bytes]]:
+	"""Líneas completas de a ~tam_bloque bytes (la línea cortada pasa al bloque siguiente)."""
+	resto = b""
+	with _abrir_texto(ruta) as f:
+		while True:
+			datos = f.read(tam_bloque)
+			if not datos:
+				break
+			datos = resto + datos
+			corte = datos.rfind(b"\n") + 1
+			resto = datos[corte:]
+			yield datos[:corte].splitlines()
+	if resto:
+		yield [resto]
+
+
+def _pesos_de(campos: np.ndarray) -> np.ndarray:
+	"""Campos de texto (dtype S) -> int64 si todos son enteros, si no float64."""
+	try:
+		return campos.astype(np.int64)
+	except ValueError:
+		return campos.astype(np.float64)
+
+
+def _numeros(texto: bytes, columnas: int) -> Optional[np.ndarray]:
+	"""
+	Números separados por blancos -> matriz de 'columnas' columnas, int64 si
+	todos son enteros, si no float64. None si hay un campo que no es número.
+	"""
+	with warnings.catch_warnings():
+		# numpy avisa (y deja de leer) en el primer campo que no puede convertir
+		warnings.simplefilter("error", DeprecationWarning)
+		for tipo in (np.int64, np.float64):
+			try:
+				datos = np.fromstring(texto, dtype=tipo, sep=" ")
+			except (ValueError, DeprecationWarning):
+				continue
+			if len(datos) % columnas == 0:
+				return datos.reshape(-1, columnas)
+	return None
+
+
+def _unir_pesos(partes: List[np.ndarray]) -> np.ndarray:
+	if not partes:
+		return np.empty(0, dtype=np.int64)
+	if any(p.dtype.kind == "f" for p in partes):
+		return np.concatenate([p.astype(np.float64) for p in partes])
+	return np.concatenate(partes)
+
+
+def cargar_dimacs(ruta: str, tam_bloque: int = TAM_BLOQUE) -> GrafoBinario:
+	"""Grafo dirigido de un archivo DIMACS .gr (vértices 1..n -> 0..n-1)."""
+	n = m_declarado = None
+	partes_u, partes_v, partes_w = [], [], []
+	for lineas in _bloques_de_lineas(ruta, tam_bloque):
+		arcos = [l for l in lineas if l[:1] == b"a"]
+		if n is None:
+			for l in lineas:
+				if l[:1] == b"p":
+					_, _, n, m_declarado = l.split()
+					n, m_declarado = int(n), int(m_declarado)
+					break
+		if not arcos:
+			continue
+		campos = _numeros(b" ".join([l[1:] for l in arcos]), 3)
+		if campos is None or len(campos) != len(arcos):
+			raise ValueError(f"{ruta}: se esperaba 'a u v w' en cada arco.")
+		partes_u.append(campos[:, 0].astype(np.int64) - 1)
+		partes_v.append(campos[:, 1].astype(np.int64) - 1)
+		partes_w.append(campos[:, 2])
+	if n is None:
+		raise ValueError(f"{ruta}: falta la línea 'p sp n m'.")
+	u = np.concatenate(partes_u) if partes_u else np.empty(0, dtype=np.int64)
+	v = np.concatenate(partes_v) if partes_v else np.empty(0, dtype=np.int64)
+	if len(u) != m_declarado:
+		raise ValueError(f"{ruta}: la línea 'p' declara {m_declarado} arcos y hay {len(u)}.")
+	if len(u) and (min(u.min(), v.min()) < 0 or max(u.max(), v.max()) >= n):
+		raise ValueError(f"{ruta}: hay arcos con vértices fuera de 1..{n}.")
+	return _csr(n, u, v, _unir_pesos(partes_w), True)
+
+
+def cargar_lista_aristas(ruta: str, separador: Optional[str] = None, dirigido: bool = True,
+                         etiquetas: Optional[bool] = None, tam_bloque: int = TAM_BLOQUE) -> GrafoBinario:
+	"""
+	Grafo de una lista de aristas "u v [w]" (separador=None: espacios; ","
+	para CSV). etiquetas=None decide con el primer bloque: si los extremos
+	son enteros son índices (n = máximo + 1); si no, etiquetas. Con
+	dirigido=False cada arista se guarda en ambos sentidos.
+	"""
+	sep = separador.encode() if separador else None
+	ids: Dict[bytes, int] = {}
+	partes_u, partes_v, partes_w = [], [], []
+	for lineas in _bloques_de_lineas(ruta, tam_bloque):
+		lineas = [l for l in lineas if l.strip() and l.lstrip()[:1] != b"#"]
+		if not lineas:
+			continue
+		texto = b"\n".join(lineas)
+		if sep:
+			texto = texto.replace(sep, b" ")
+		k = len((lineas[0].replace(sep, b" ") if sep else lineas[0]).split())
+		if k not in (2, 3):
+			raise ValueError(f"{ruta}: cada línea debe tener 'u v' o 'u v w'.")
+		numeros = None if etiquetas else _numeros(texto, k)
+		if etiquetas is None:
+			# sin números enteros en los extremos, son etiquetas
+			etiquetas = numeros is None or numeros.dtype.kind == "f" and not np.all(numeros[:, :2] % 1 == 0)
+		if not etiquetas:
+			if numeros is None or len(numeros) != len(lineas):
+				raise ValueError(f"{ruta}: cada línea debe tener {k} números; si los extremos son nombres, "
+				                 f"use etiquetas=True.")
+			partes_u.append(numeros[:, 0].astype(np.int64))
+			partes_v.append(numeros[:, 1].astype(np.int64))
+			partes_w.append(numeros[:, 2] if k == 3 else np.ones(len(numeros), dtype=np.int64))
+			continue
+		campos = np.array(texto.split())
+		if len(campos) != k * len(lineas):
+			raise ValueError(f"{ruta}: cada línea debe tener 'u v' o 'u v w' (todas igual).")
+		campos = campos.reshape(-1, k)
+		# un diccionario por etiqueta distinta del bloque, no por arista
+		distintas, inversa = np.unique(campos[:, :2], return_inverse=True)
+		mapa = np.array([ids.setdefault(e, len(ids)) for e in distintas.tolist()], dtype=np.int64)
+		uv = mapa[inversa.reshape(-1)].reshape(-1, 2)
+		partes_u.append(uv[:, 0])
+		partes_v.append(uv[:, 1])
+		partes_w.append(_pesos_de(campos[:, 2]) if k == 3 else np.ones(len(campos), dtype=np.int64))
+	u = np.concatenate(partes_u) if partes_u else np.empty(0, dtype=np.int64)
+	v = np.concatenate(partes_v) if partes_v else np.empty(0, dtype=np.int64)
+	if etiquetas:
+		nombres = [e.decode("utf-8") for e in ids]
+		return _csr(len(nombres), u, v, _unir_pesos(partes_w), dirigido, nombres)
+	if len(u) and min(u.min(), v.min()) < 0:
+		raise ValueError(f"{ruta}: hay índices de vértice negativos.")
+	n = int(max(u.max(), v.max())) + 1 if len(u) else 0
+	return _csr(n, u, v, _unir_pesos(partes_w), dirigido)
+
+
+def cargar_csv(ruta: str, dirigido: bool = True, etiquetas: Optional[bool] = None,
+               tam_bloque: int = TAM_BLOQUE) -> GrafoBinario:
+	return cargar_lista_aristas(ruta, ",", dirigido, etiquetas, tam_bloque)
+
+
+# -------------------------
+# Formato binario
+# -------------------------
+def guardar_binario(grafo: GrafoBinario, ruta: str):
+	"""Escribe el grafo en el formato .grb (ver el docstring del módulo)."""
+	pesos_float = grafo.pesos.dtype.kind == "f"
+	indices_64 = grafo.indices.dtype.itemsize == 8
+	flags = (DIRIGIDO if grafo.dirigido else 0) | (PESOS_FLOAT if pesos_float else 0) | (INDICES_64 if indices_64 else 0)
+	indices = np.ascontiguousarray(grafo.indices, dtype="<i8" if indices_64 else "<i4")
+	pesos = np.ascontiguousarray(grafo.pesos, dtype="<f8" if pesos_float else "<i8")
+	relleno = -indices.nbytes % 8
+	texto = "\n".join(map(str, grafo.etiquetas)).encode("utf-8") if grafo.etiquetas is not None else b""
+	pos_etiquetas = TAM_CABECERA + 8 * (grafo.n + 1) + indices.nbytes + relleno + pesos.nbytes
+	cabecera = _CABECERA.pack(MAGIA, VERSION, flags, 0, grafo.n, grafo.m,
+	                          pos_etiquetas if grafo.etiquetas is not None else 0, len(texto))
+	with open(ruta, "wb") as f:
+		f.write(cabecera.ljust(TAM_CABECERA, b"\0"))
+		f.write(np.ascontiguousarray(grafo.indptr, dtype="<i8").tobytes())
+		f.write(indices.tobytes())
+		f.write(b"\0" * relleno)
+		f.write(pesos.tobytes())
+		f.write(texto)
+
+
+def abrir_binario(ruta: str, mmap: bool = True) -> GrafoBinario:
+	"""
+	Abre un .grb. Con mmap=True los arreglos son np.memmap de solo lectura
+	(no se leen hasta usarlos); con mmap=False se cargan en memoria.
+	"""
+	with open(ruta, "rb") as f:
+		cabecera = f.read(TAM_CABECERA)
+		if len(cabecera) < TAM_CABECERA:
+			raise ValueError(f"{ruta}: archivo demasiado corto para un grafo binario.")
+		magia, version, flags, _, n, m, pos_etiquetas, tam_etiquetas = _CABECERA.unpack_from(cabecera)
+		if magia != MAGIA:
+			raise ValueError(f"{ruta}: no es un grafo binario (.grb).")
+		if version != VERSION:
+			raise ValueError(f"{ruta}: versión {version} del formato; se soporta la {VERSION}.")
+		etiquetas = None
+		if pos_etiquetas:
+			f.seek(pos_etiquetas)
+			texto = f.read(tam_etiquetas).decode("utf-8")
+			etiquetas = texto.split("\n") if n else []
+	tipo_indices = np.dtype("<i8" if flags & INDICES_64 else "<i4")
+	tipo_pesos = np.dtype("<f8" if flags & PESOS_FLOAT else "<i8")
+	pos = TAM_CABECERA
+	arreglos = []
+	for tipo, cantidad in ((np.dtype("<i8"), n + 1), (tipo_indices, m), (tipo_pesos, m)):
+		if cantidad == 0:
+			arreglos.append(np.empty(0, dtype=tipo))
+		elif mmap:
+			arreglos.append(np.memmap(ruta, dtype=tipo, mode="r", offset=pos, shape=(cantidad,)))
+		else:
+			arreglos.append(np.fromfile(ruta, dtype=tipo, count=cantidad, offset=pos))
+		pos += tipo.itemsize * cantidad
+		pos += -pos % 8
+	indptr, indices, pesos = arreglos
+	return GrafoBinario(indptr, indices, pesos, bool(flags & DIRIGIDO), etiquetas)
+
+
+# -------------------------
+# Dijkstra sobre el CSR
+# -------------------------
+def dijkstra_csr(grafo: GrafoBinario, origen: Any) -> Tuple[np.ndarray, np.ndarray]:
+	"""
+	Dijkstra con heap (lazy deletion) sobre un GrafoBinario, sin pasar a
+	diccionario. origen es una etiqueta (o un índice, si no hay etiquetas).
+	Devuelve (dist, prev): dist[i] float64 (inf = inalcanzable), prev[i] el
+	índice del predecesor (-1 = ninguno).
+	"""
+	n = grafo.n
+	s = grafo.indice(origen)
+	dist = [math.inf] * n
+	prev = [-1] * n
+	visitado = [False] * n
+	indptr, indices, pesos = grafo.indptr, grafo.indices, grafo.pesos
+	dist[s] = 0
+	heap = [(0, s)]
+	while heap:
+		d_u, u = heapq.heappop(heap)
+		if visitado[u]:
+			continue
+		visitado[u] = True
+		a, b = int(indptr[u]), int(indptr[u + 1])
+		for v, w in zip(indices[a:b].tolist(), pesos[a:b].tolist()):
+			alt = d_u + w
+			if alt < dist[v]:
+				dist[v] = alt
+				prev[v] = u
+				heapq.heappush(heap, (alt, v))
+	return np.array(dist, dtype=np.float64), np.array(prev, dtype=np.int64)
+
+
+# -------------------------
+# Benchmark
+# -------------------------
+def escribir_dimacs(ruta: str, n: int, u: np.ndarray, v: np.ndarray, w: np.ndarray, lote: int = 1_000_000):
+	"""Escribe arcos (índices 0..n-1) como DIMACS .gr, de a 'lote' líneas."""
+	with open(ruta, "w") as f:
+		f.write(f"c generado por 002_Cargador_Grafos.py\np sp {n} {len(u)}\n")
+		for i in range(0, len(u), lote):
+			f.write("".join(f"a {a} {b} {c}\n" for a, b, c in zip((u[i:i + lote] + 1).tolist(),
+			                                                      (v[i:i + lote] + 1).tolist(),
+			                                                      w[i:i + lote].tolist())))
+
+
+def benchmark(m: int = 2_000_000, seed: int = 0):
+	generador = cargar("generador_grafos")
+	n = max(m // 10, 2)
+	print(f"Benchmark carga de grafos: n={n}, m={m} arcos")
+	g = generador.gnm(n, m, seed=seed)
+	with tempfile.TemporaryDirectory() as d:
+		ruta_gr, ruta_grb = os.path.join(d, "grafo.gr"), os.path.join(d, "grafo.grb")
+		t0 = time.perf_counter()
+		escribir_dimacs(ruta_gr, n, g.u, g.v, g.w)
+		print(f"  escribir DIMACS:           {time.perf_counter() - t0:7.2f} s  ({os.path.getsize(ruta_gr) / 2 ** 20:.0f} MB)")
+		t0 = time.perf_counter()
+		grafo = cargar_dimacs(ruta_gr)
+		t = time.perf_counter() - t0
+		print(f"  cargar DIMACS por bloques: {t:7.2f} s  ({m / t / 1e6:.2f} M arcos/s) -> {grafo}")
+		t0 = time.perf_counter()
+		guardar_binario(grafo, ruta_grb)
+		print(f"  guardar .grb:              {time.perf_counter() - t0:7.2f} s  ({os.path.getsize(ruta_grb) / 2 ** 20:.0f} MB)")
+		t0 = time.perf_counter()
+		abierto = abrir_binario(ruta_grb)
+		print(f"  abrir .grb (memmap):       {(time.perf_counter() - t0) * 1e3:7.2f} ms")
+		t0 = time.perf_counter()
+		leido = abrir_binario(ruta_grb, mmap=False)
+		print(f"  leer .grb completo:        {time.perf_counter() - t0:7.2f} s")
+		assert np.array_equal(abierto.indptr, grafo.indptr) and np.array_equal(leido.indices, grafo.indices)
+		assert np.array_equal(abierto.pesos, grafo.pesos)
+		t0 = time.perf_counter()
+		dist, _ = dijkstra_csr(abierto, 0)
+		print(f"  dijkstra_csr desde 0:      {time.perf_counter() - t0:7.2f} s  "
+		      f"({int(np.isfinite(dist).sum())} vértices alcanzables)")
+		del abierto, leido
+
+
+def ejemplo():
+	grafo = {
+		'A': [('B', 4), ('C', 2)],
+		'B': [('A', 4), ('C', 1), ('D', 5)],
+		'C': [('A', 2), ('B', 1), ('D', 8), ('E', 10)],
+		'D': [('B', 5), ('C', 8), ('E', 2), ('F', 6)],
+		'E': [('C', 10), ('D', 2), ('F', 3)],
+		'F': [('D', 6), ('E', 3)],
+	}
+	with tempfile.TemporaryDirectory() as d:
+		# la misma red como lista de aristas CSV (no dirigida) y como DIMACS
+		ruta_csv = os.path.join(d, "red.csv")
+		with open(ruta_csv, "w") as f:
+			f.write("# origen,destino,peso\nA,B,4\nA,C,2\nB,C,1\nB,D,5\nC,D,8\nC,E,10\nD,E,2\nD,F,6\nE,F,3\n")
+		g_csv = cargar_csv(ruta_csv, dirigido=False)
+		print(f"CSV: {g_csv}, etiquetas {g_csv.etiquetas}")
+		mismos = all(sorted(vecinos) == sorted(grafo[nodo]) for nodo, vecinos in g_csv.a_dict().items())
+		print(f"  mismas aristas que el diccionario de ejemplo(): {mismos}")
+
+		ruta_gr = os.path.join(d, "red.gr")
+		g_dict = desde_dict(grafo)
+		escribir_dimacs(ruta_gr, g_dict.n, np.repeat(np.arange(g_dict.n), np.diff(g_dict.indptr)),
+		                g_dict.indices.astype(np.int64), g_dict.pesos)
+		g_gr = cargar_dimacs(ruta_gr, tam_bloque=16)
+		print(f"DIMACS (bloques de 16 bytes): {g_gr}")
+
+		ruta_grb = os.path.join(d, "red.grb")
+		guardar_binario(g_csv, ruta_grb)
+		g_bin = abrir_binario(ruta_grb)
+		print(f"Binario: {os.path.getsize(ruta_grb)} bytes -> {g_bin}, indptr {g_bin.indptr.tolist()}")
+		dist, prev = dijkstra_csr(g_bin, "A")
+		for i in range(g_bin.n):
+			camino = []
+			j = i
+			while j != -1:
+				camino.append(g_bin.nombre(j))
+				j = prev[j]
+			print(f"  A -> {g_bin.nombre(i)}: distancia {dist[i]:g}, camino: {' -> '.join(reversed(camino))}")
+		del g_bin
+
+
+if __name__ == "__main__":
+	if "--benchmark" in sys.argv:
+		args = sys.argv[sys.argv.index("--benchmark") + 1:]
+		benchmark(int(float(args[0]))) if args else benchmark()
+	else:
+		ejemplo()
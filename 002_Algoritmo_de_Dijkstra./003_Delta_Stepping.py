@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+003_Delta_Stepping.py
+
+Caminos mínimos desde un origen con Δ-stepping (Meyer y Sanders) sobre un
+GrafoBinario (002_Cargador_Grafos.py).
+
+dijkstra fija un vértice por vez, el mínimo de un heap global, y no hay
+nada que hacer en bloque. Δ-stepping agrupa los vértices en cubetas de
+ancho Δ (la cubeta i tiene las distancias en [iΔ, (i+1)Δ)) y procesa una
+cubeta entera por fase:
+  - los arcos livianos (peso <= Δ) de la cubeta se relajan todos juntos,
+    y se repite con los vértices que mejoraron sin salir de la cubeta
+    (subfases), porque pueden volver a bajar;
+  - cuando la cubeta queda vacía, los arcos pesados (peso > Δ) de todos
+    los vértices que pasaron por ella se relajan una sola vez: su destino
+    cae siempre en una cubeta posterior.
+Cada subfase es una operación vectorizada de numpy sobre la frontera
+(juntar los arcos con el CSR, sumar, quedarse con el mínimo por destino y
+escribir solo los que mejoran); no hay un bucle de Python por arco.
+
+Δ chico se parece a dijkstra (muchas fases, pocas relajaciones de más);
+Δ grande se parece a Bellman-Ford (pocas fases, vértices que se relajan
+varias veces). delta_heuristico elige Δ con el peso medio y el grado
+medio, y ajustar_delta prueba varios múltiplos y se queda con el más
+rápido para ese grafo.
+
+Resultado: (dist, prev) iguales a los de dijkstra_csr. dist coincide
+siempre (el mínimo de las mismas sumas). prev se calcula al final con la
+misma regla de desempate que dijkstra: entre los arcos u -> v con
+dist[u] + w == dist[v], el u de menor (dist[u], índice), que es el
+primero que dijkstra fija. Con pesos 0 en un empate puede elegirse otro
+camino igual de corto.
+
+Requisitos:
+- numpy
+
+Uso:
+  python 003_Delta_Stepping.py                    -> ejemplo pequeño
+  python 003_Delta_Stepping.py --benchmark        -> Δ-stepping vs dijkstra_csr (2e6 aristas)
+  python 003_Delta_Stepping.py --benchmark 1e7
+"""
+import os
+import sys
+import time
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from ia3 import cargar  # noqa: E402
+
+
+_cargador = cargar("cargador_grafos")
+GrafoBinario = _cargador.GrafoBinario
+dijkstra_csr = _cargador.dijkstra_csr
+
+
+# -------------------------
+# Operaciones sobre el CSR
+# -------------------------
+def _separar(grafo: GrafoBinario, delta: float):
+	"""Dos CSR con los arcos livianos (peso <= delta) y los pesados del grafo."""
+	filas = np.repeat(np.arange(grafo.n), np.diff(grafo.indptr))
+	partes = []
+	for mascara in (grafo.pesos <= delta, grafo.pesos > delta):
+		indptr = np.zeros(grafo.n + 1, dtype=np.int64)
+		np.cumsum(np.bincount(filas[mascara], minlength=grafo.n), out=indptr[1:])
+		partes.append((indptr, np.asarray(grafo.indices[mascara]), np.asarray(grafo.pesos[mascara])))
+	return partes
+
+
+def _arcos_de(csr, vertices: np.ndarray, dist: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+	"""Destinos y distancias candidatas (dist[u] + w) de todos los arcos que salen de 'vertices'."""
+	indptr, indices, pesos = csr
+	inicio = indptr[vertices]
+	cuenta = indptr[vertices + 1] - inicio
+	total = int(cuenta.sum())
+	if total == 0:
+		return indices[:0], dist[:0]
+	# posición de cada arco: inicio de su fila + su desplazamiento dentro de ella
+	fin = np.cumsum(cuenta)
+	pos = np.repeat(inicio - (fin - cuenta), cuenta) + np.arange(total)
+	return indices[pos], np.repeat(dist[vertices], cuenta) + pesos[pos]
+
+
+def _relajar(dist: np.ndarray, destinos: np.ndarray, candidatos: np.ndarray) -> np.ndarray:
+	"""Baja dist con el mínimo candidato de cada destino; devuelve los vértices que mejoraron."""
+	mejora = candidatos < dist[destinos]
+	destinos, candidatos = destinos[mejora], candidatos[mejora]
+	if len(destinos) == 0:
+		return destinos
+	orden = np.lexsort((candidatos, destinos))
+	destinos, candidatos = destinos[orden], candidatos[orden]
+	primero = np.empty(len(destinos), dtype=bool)
+	primero[0] = True
+	np.not_equal(destinos[1:], destinos[:-1], out=primero[1:])
+	destinos = destinos[primero]
+	dist[destinos] = candidatos[primero]
+	return destinos
+
+
+def _predecesores(grafo: GrafoBinario, dist: np.ndarray, s: int) -> np.ndarray:
+	"""prev con la regla de dijkstra: el u de menor (dist[u], u) entre los arcos ajustados."""
+	n = grafo.n
+	prev = np.full(n, -1, dtype=np.int64)
+	u = np.repeat(np.arange(n), np.diff(grafo.indptr))
+	v = np.asarray(grafo.indices)
+	ajustado = np.isfinite(dist[u]) & (dist[u] + grafo.pesos == dist[v]) & (u != v) & (v != s)
+	u, v = u[ajustado], v[ajustado]
+	if len(v):
+		orden = np.lexsort((u, dist[u], v))
+		u, v = u[orden], v[orden]
+		primero = np.r_[True, v[1:] != v[:-1]]
+		prev[v[primero]] = u[primero]
+	return prev
+
+
+# -------------------------
+# Δ-stepping
+# -------------------------
+def delta_heuristico(grafo: GrafoBinario) -> float:
+	"""
+	Δ inicial: el peso medio por la raíz del grado medio. Con Δ del orden
+	de un peso las fases son muchas y el costo fijo de cada subfase de numpy
+	domina con fronteras chicas; agrandarlo con el grado (más arcos por
+	vértice, más trabajo por subfase) sin llegar a Bellman-Ford.
+	"""
+	if grafo.m == 0:
+		return 1.0
+	medio = float(np.mean(grafo.pesos))
+	grado = grafo.m / max(grafo.n, 1)
+	delta = medio * max(grado, 1.0) ** 0.5
+	return delta if delta > 0 else 1.0
+
+
+def delta_stepping(grafo: GrafoBinario, origen: Any, delta: Optional[float] = None,
+                   stats: Optional[Dict[str, Any]] = None) -> Tuple[np.ndarray, np.ndarray]:
+	"""
+	Caminos mínimos desde origen (etiqueta, o índice si no hay etiquetas)
+	con cubetas de ancho delta (None = delta_heuristico). Los pesos no
+	pueden ser negativos. Devuelve (dist, prev) como dijkstra_csr.
+	Si se pasa stats, se completa con delta, fases (cubetas procesadas),
+	subfases, relajaciones livianas y pesadas, reinserciones (vértices que
+	se relajaron más de una vez dentro de su cubeta) y tiempo.
+	"""
+	t0 = time.perf_counter()
+	if grafo.m and np.min(grafo.pesos) < 0:
+		raise ValueError("delta_stepping: hay pesos negativos.")
+	if delta is None:
+		delta = delta_heuristico(grafo)
+	if not delta > 0:
+		raise ValueError("delta_stepping: delta debe ser positivo.")
+	s = grafo.indice(origen)
+	livianos, pesados = _separar(grafo, delta)
+	dist = np.full(grafo.n, np.inf)
+	fijado = np.zeros(grafo.n, dtype=bool)
+	dist[s] = 0
+	abiertos = np.array([s], dtype=np.int64)
+	fases = subfases = rel_livianas = rel_pesadas = reinserciones = 0
+	while len(abiertos):
+		cubetas = np.floor(dist[abiertos] / delta)
+		i = cubetas.min()
+		frontera = abiertos[cubetas == i]
+		nuevos = [abiertos[cubetas != i]]
+		pasaron = []
+		while len(frontera):
+			pasaron.append(frontera)
+			subfases += 1
+			destinos, candidatos = _arcos_de(livianos, frontera, dist)
+			rel_livianas += len(destinos)
+			mejorados = _relajar(dist, destinos, candidatos)
+			en_cubeta = np.floor(dist[mejorados] / delta) == i
+			frontera = mejorados[en_cubeta]
+			nuevos.append(mejorados[~en_cubeta])
+		cubeta = np.unique(np.concatenate(pasaron))
+		reinserciones += sum(map(len, pasaron)) - len(cubeta)
+		fijado[cubeta] = True
+		destinos, candidatos = _arcos_de(pesados, cubeta, dist)
+		rel_pesadas += len(destinos)
+		nuevos.append(_relajar(dist, destinos, candidatos))
+		abiertos = np.unique(np.concatenate(nuevos))
+		abiertos = abiertos[~fijado[abiertos]]
+		fases += 1
+	prev = _predecesores(grafo, dist, s)
+	if stats is not None:
+		stats.update(delta=delta, fases=fases, subfases=subfases, relajaciones_livianas=rel_livianas,
+		             relajaciones_pesadas=rel_pesadas, reinserciones=reinserciones,
+		             tiempo=time.perf_counter() - t0)
+	return dist, prev
+
+
+def ajustar_delta(grafo: GrafoBinario, origen: Any = None,
+                  factores: Iterable[float] = (0.125, 0.25, 0.5, 1, 2, 4, 8),
+                  stats: Optional[Dict[str, Any]] = None) -> float:
+	"""
+	Prueba delta_heuristico(grafo) * f para cada factor (desde origen; por
+	defecto el vértice 0) y devuelve el Δ más rápido. Conviene ajustar una
+	vez por grafo y reutilizar el Δ para los demás orígenes. En
+	stats["pruebas"] quedan (delta, tiempo, fases) de cada prueba.
+	"""
+	if origen is None:
+		origen = grafo.nombre(0)
+	base = delta_heuristico(grafo)
+	pruebas = []
+	for f in factores:
+		datos = {}
+		delta_stepping(grafo, origen, base * f, stats=datos)
+		pruebas.append((datos["delta"], datos["tiempo"], datos["fases"]))
+	if stats is not None:
+		stats["pruebas"] = pruebas
+	return min(pruebas, key=lambda p: p[1])[0]
+
+
+# -------------------------
+# Benchmark
+# -------------------------
+def _comparar(nombre: str, grafo: GrafoBinario, origen: int = 0):
+	print(f"{nombre}: {grafo}")
+	t0 = time.perf_counter()
+	dist_d, prev_d = dijkstra_csr(grafo, origen)
+	t_dijkstra = time.perf_counter() - t0
+	print(f"  dijkstra_csr:              {t_dijkstra:7.2f} s")
+	stats = {}
+	dist, prev = delta_stepping(grafo, origen, stats=stats)
+	assert np.array_equal(dist, dist_d) and np.array_equal(prev, prev_d)
+	print(f"  Δ-stepping Δ={stats['delta']:<10.4g}   {stats['tiempo']:7.2f} s  (x{t_dijkstra / stats['tiempo']:.1f}), "
+	      f"{stats['fases']} fases, {stats['subfases']} subfases, {stats['reinserciones']} reinserciones")
+	ajuste = {}
+	delta = ajustar_delta(grafo, origen, stats=ajuste)
+	for d, t, fases in ajuste["pruebas"]:
+		print(f"    Δ={d:<10.4g} {t:7.2f} s  (x{t_dijkstra / t:.1f}), {fases} fases{'  <- ajustado' if d == delta else ''}")
+	dist, prev = delta_stepping(grafo, origen, delta)
+	assert np.array_equal(dist, dist_d) and np.array_equal(prev, prev_d)
+
+
+def benchmark(m: int = 2_000_000, seed: int = 0):
+	generador = cargar("generador_grafos")
+	print(f"Benchmark Δ-stepping vs dijkstra_csr, m={m} aristas (no dirigidas, cada una es dos arcos)")
+	g = generador.gnm(max(m // 5, 2), m, seed=seed)
+	_comparar("G(n, m), pesos 1..20", GrafoBinario(*g.a_csr(), dirigido=False))
+	lado = max(int((m / 2) ** 0.5), 2)
+	g = generador.malla(lado, lado, seed=seed)
+	_comparar("malla, pesos 1..20", GrafoBinario(*g.a_csr(), dirigido=False))
+	g, _ = generador.geometrico(max(m // 3, 2), seed=seed)
+	_comparar("geométrico, pesos = distancia", GrafoBinario(*g.a_csr(), dirigido=False))
+
+
+def ejemplo():
+	dijkstra = cargar("dijkstra").dijkstra
+	grafo = {
+		'A': [('B', 4), ('C', 2)],
+		'B': [('A', 4), ('C', 1), ('D', 5)],
+		'C': [('A', 2), ('B', 1), ('D', 8), ('E', 10)],
+		'D': [('B', 5), ('C', 8), ('E', 2), ('F', 6)],
+		'E': [('C', 10), ('D', 2), ('F', 3)],
+		'F': [('D', 6), ('E', 3)],
+	}
+	g = _cargador.desde_dict(grafo)
+	dist_ref, prev_ref = dijkstra(grafo, 'A', verbose=False)
+	for delta in (1, 3, 100):
+		stats = {}
+		dist, prev = delta_stepping(g, 'A', delta, stats=stats)
+		iguales = all(dist[i] == dist_ref[g.nombre(i)] and
+		              (g.nombre(prev[i]) if prev[i] != -1 else None) == prev_ref[g.nombre(i)]
+		              for i in range(g.n))
+		print(f"Δ={delta}: {stats['fases']} fases, {stats['subfases']} subfases, "
+		      f"{stats['relajaciones_livianas']} livianas, {stats['relajaciones_pesadas']} pesadas; "
+		      f"igual a dijkstra: {iguales}")
+	for i in range(g.n):
+		camino = []
+		j = i
+		while j != -1:
+			camino.append(g.nombre(j))
+			j = prev[j]
+		print(f"  A -> {g.nombre(i)}: distancia {dist[i]:g}, camino: {' -> '.join(reversed(camino))}")
+
+
+if __name__ == "__main__":
+	if "--benchmark" in sys.argv:
+		args = sys.argv[sys.argv.index("--benchmark") + 1:]
+		benchmark(int(float(args[0]))) if args else benchmark()
+	else:
+		ejemplo()
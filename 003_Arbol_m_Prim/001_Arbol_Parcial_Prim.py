@@ -1,8 +1,12 @@
 import heapq
+import math
+import os
 import random
 import sys
-import networkx as nx
-from matplotlib.animation import FuncAnimation
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from ia3 import cargar  # noqa: E402
 
 #!/usr/bin/env python3
 # GitHub Copilot
@@ -10,33 +14,52 @@ from matplotlib.animation import FuncAnimation
 # Genera y grafica los pasos de una ejecución parcial del algoritmo de Prim.
 # Requisitos: networkx, matplotlib
 # Si faltan librerías: pip install networkx matplotlib
+# Uso: python 001_Arbol_Parcial_Prim.py [--headless | --benchmark]
+# networkx, numpy y matplotlib se importan dentro de las funciones que los
+# usan: prim_steps sola no carga ninguna biblioteca de gráficos.
 
 
-import matplotlib.pyplot as plt
-
 def ejemplo_grafo(n_nodes=8, seed=42, density=0.4, weight_range=(1, 20)):
+    """
+    Grafo aleatorio G(n, p) con pesos. En lugar de probar cada par (i, j),
+    se sortea cuántos pares saltar hasta la siguiente arista (distribución
+    geométrica), así el costo es O(n + m). Para grafos grandes en arreglos
+    ver 005_Generador_de_Grafos/001_Generador_Grafos.py.
+    """
+    import networkx as nx
     random.seed(seed)
     G = nx.Graph()
-    for i in range(n_nodes):
-        G.add_node(i)
-    # agregar aristas aleatorias con pesos
-    for i in range(n_nodes):
-        for j in range(i + 1, n_nodes):
-            if random.random() < density:
-                w = random.randint(*weight_range)
-                G.add_edge(i, j, weight=w)
+    G.add_nodes_from(range(n_nodes))
+    aristas = []
+    # agregar aristas aleatorias con pesos (pares i < j en orden por columnas)
+    if density >= 1:
+        aristas = [(i, j, random.randint(*weight_range)) for j in range(n_nodes) for i in range(j)]
+    elif density > 0:
+        log_q = math.log(1.0 - density)
+        j, i = 1, -1
+        while j < n_nodes:
+            i += 1 + int(math.log(1.0 - random.random()) / log_q)
+            while i >= j and j < n_nodes:
+                i -= j
+                j += 1
+            if j < n_nodes:
+                aristas.append((i, j, random.randint(*weight_range)))
     # asegurar conectividad mínima (añadir camino lineal)
+    pares = {(i, j) for i, j, _ in aristas}
     for i in range(n_nodes - 1):
-        if not G.has_edge(i, i + 1):
-            G.add_edge(i, i + 1, weight=random.randint(*weight_range))
+        if (i, i + 1) not in pares:
+            aristas.append((i, i + 1, random.randint(*weight_range)))
+    G.add_weighted_edges_from(aristas)
     return G
 
-def prim_steps(G, start=None):
+def prim_steps(G, start=None, deltas=False):
     """Generador que produce los pasos de Prim.
     En cada paso yield (u, v, w, mst_edges_list, visited_set)
+    Si deltas=True solo se produce la arista nueva (u, v, w) en cada paso,
+    sin copiar el árbol ni los visitados (ver prim_mst en 002_Prim_CSR.py).
     """
     if start is None:
-        start = list(G.nodes())[0]
+        start = next(iter(G.nodes()))
     visited = set([start])
     edges_heap = []
     # añadir aristas incidentes al nodo inicial
@@ -57,11 +80,17 @@ def prim_steps(G, start=None):
         for nbr, attrs in G[new_node].items():
             if nbr not in visited:
                 heapq.heappush(edges_heap, (attrs['weight'], new_node, nbr))
-        yield (u, v, w, list(mst_edges), set(visited))
+        if deltas:
+            yield (u, v, w)
+        else:
+            yield (u, v, w, list(mst_edges), set(visited))
+    if deltas:
+        return
     # último yield para indicar final (puede repetirse con None si ya completo)
     yield (None, None, None, list(mst_edges), set(visited))
 
 def dibujar_paso(ax, G, pos, mst_edges, highlight_edge=None, visited=None):
+    import networkx as nx
     ax.clear()
     ax.set_title("Árbol parcial de Prim: pasos")
     # dibujar todas las aristas en gris con pesos
@@ -71,7 +100,7 @@ def dibujar_paso(ax, G, pos, mst_edges, highlight_edge=None, visited=None):
     nx.draw_networkx_edges(G, pos, ax=ax, edge_color='lightgray', width=1)
     # dibujar pesos
     edge_labels = {(u, v): d['weight'] for u, v, d in G.edges(data=True)}
-    nx.draw_networkx_edge_labels(G, pos, edge_labels=edge_labels, font_size=8)
+    nx.draw_networkx_edge_labels(G, pos, edge_labels=edge_labels, font_size=8, ax=ax)
     # dibujar aristas del MST en rojo
     if mst_edges:
         edges = [(u, v) for (u, v, w) in mst_edges]
@@ -84,46 +113,238 @@ def dibujar_paso(ax, G, pos, mst_edges, highlight_edge=None, visited=None):
     if visited:
         nx.draw_networkx_nodes(G, pos, nodelist=list(visited), node_color='orange', ax=ax)
 
-def main():
+class AnimadorPrim:
+    """
+    Animación de los pasos de Prim sin redibujar el grafo en cada cuadro.
+
+    El grafo estático (aristas grises, pesos, nodos y etiquetas) se dibuja una
+    sola vez en un lienzo Agg y se guarda como fondo. Cada cuadro restaura el
+    estado anterior (MST confirmado), pinta en rojo solo las aristas nuevas y
+    sus extremos como visitados, guarda ese estado y encima resalta en verde
+    la última arista y escribe el título. El costo por cuadro no depende del
+    tamaño del grafo.
+
+    'cada' agrupa varios pasos por cuadro (decimación para grafos grandes).
+    Con fig (p. ej. de plt.subplots) se puede mostrar en pantalla con mostrar().
+    """
+    def __init__(self, G, pos, figsize=(8, 6), dpi=100, pesos=None, fig=None):
+        import networkx as nx
+        from matplotlib.collections import LineCollection
+        if fig is None:
+            from matplotlib.backends.backend_agg import FigureCanvasAgg
+            from matplotlib.figure import Figure
+            fig = Figure(figsize=figsize, dpi=dpi)
+            FigureCanvasAgg(fig)
+        self.fig, self.G, self.pos = fig, G, pos
+        ax = self.ax = fig.add_axes([0.02, 0.02, 0.96, 0.90])
+        ax.axis("off")
+        n = G.number_of_nodes()
+        self.etiquetas = n <= 200
+        self.tam_nodo = 300 if n <= 200 else max(4, 3000 // n)
+        if pesos is None:
+            pesos = G.number_of_edges() <= 300
+
+        # estático
+        nx.draw_networkx_edges(G, pos, ax=ax, edge_color='lightgray', width=1)
+        if pesos:
+            edge_labels = {(u, v): d['weight'] for u, v, d in G.edges(data=True)}
+            nx.draw_networkx_edge_labels(G, pos, edge_labels=edge_labels, font_size=8, ax=ax)
+        nx.draw_networkx_nodes(G, pos, ax=ax, node_color='lightblue', node_size=self.tam_nodo)
+        if self.etiquetas:
+            nx.draw_networkx_labels(G, pos, ax=ax)
+
+        # dinámico: MST (rojo), arista nueva (verde), nodos visitados (naranja)
+        self.mst = LineCollection([], colors='red', linewidths=3, zorder=1.5)
+        self.nueva = LineCollection([], colors='green', linewidths=4, zorder=1.6)
+        ax.add_collection(self.mst)
+        ax.add_collection(self.nueva)
+        self.visitados = ax.scatter([], [], s=self.tam_nodo, c='orange', zorder=2.5)
+        self.etiqueta = ax.text(0, 0, "", ha='center', va='center', fontsize=12, zorder=3)
+        self.titulo = fig.text(0.5, 0.97, "", ha='center', va='top', fontsize=12)
+
+    def _segmento(self, u, v):
+        return [self.pos[u], self.pos[v]]
+
+    def cuadros(self, pasos, cada: int = 1):
+        """
+        Agrupa los pasos (u, v, w) de prim_steps(..., deltas=True) de a 'cada'.
+        Produce (aristas_del_cuadro, título); el último cuadro no trae aristas.
+        """
+        lote, total, k = [], 0, 0
+        for u, v, w in pasos:
+            lote.append((u, v, w))
+            total += w
+            k += 1
+            if len(lote) == cada:
+                yield lote, f"Paso {k}: seleccionar arista ({u}, {v}) peso={w}"
+                lote = []
+        if lote:
+            u, v, w = lote[-1]
+            yield lote, f"Paso {k}: seleccionar arista ({u}, {v}) peso={w}"
+        yield [], f"Finalizado: MST con {k} aristas, peso total = {total}"
+
+    def _pintar_nodos(self, nodos):
+        ax, pos = self.ax, self.pos
+        self.visitados.set_offsets([pos[x] for x in nodos])
+        ax.draw_artist(self.visitados)
+        if self.etiquetas:
+            for x in nodos:
+                self.etiqueta.set_position(pos[x])
+                self.etiqueta.set_text(str(x))
+                ax.draw_artist(self.etiqueta)
+
+    def _pintar(self, lote, titulo: str):
+        """Dibuja un cuadro sobre el lienzo (blit manual, sin redibujar la figura)."""
+        canvas, ax = self.fig.canvas, self.ax
+        canvas.restore_region(self._fijo)
+        if lote:
+            self.mst.set_segments([self._segmento(u, v) for u, v, _ in lote])
+            ax.draw_artist(self.mst)
+            extremos = list(dict.fromkeys(x for u, v, _ in lote for x in (u, v)))
+            self._pintar_nodos(extremos)
+            self._fijo = canvas.copy_from_bbox(self.fig.bbox)
+            u, v, _ = lote[-1]
+            self.nueva.set_segments([self._segmento(u, v)])
+            ax.draw_artist(self.nueva)
+            self._pintar_nodos([u, v])
+        self.titulo.set_text(titulo)
+        self.fig.draw_artist(self.titulo)
+
+    def _iniciar(self):
+        import numpy as np
+        self.mst.set_segments([])
+        self.nueva.set_segments([])
+        self.visitados.set_offsets(np.empty((0, 2)))
+        self.etiqueta.set_text("")
+        self.titulo.set_text("")
+        self.fig.canvas.draw()
+        self._fijo = self.fig.canvas.copy_from_bbox(self.fig.bbox)
+
+    def guardar(self, pasos, archivo: str, fps: float = 1, cada: int = 1,
+                tam_cola: int = 16, politica: str = "bloquear") -> dict:
+        """
+        Escribe la animación en 'archivo' con EscritorFrames
+        (006_Visualizacion/001_Escritor_Frames.py): aquí solo se pinta y se
+        encola cada cuadro; un hilo lo codifica (.gif con Pillow, .mp4 por una
+        tubería a ffmpeg o, sin ffmpeg, PNG en el directorio 'prim/').
+        tam_cola y politica ("bloquear" o "descartar") controlan la contrapresión.
+        Devuelve {"cuadros", "descartados", "render_s", "espera_s",
+        "codificacion_s", "total_s", "formato", "destino"}.
+        """
+        escritor = _frames().EscritorFrames(archivo, self.fig.canvas.get_width_height(), fps=fps,
+                                            tam_cola=tam_cola, politica=politica, prefijo="paso_")
+        stats = escritor.stats
+        try:
+            t0 = time.perf_counter()
+            self._iniciar()
+            stats.render_s += time.perf_counter() - t0
+            for lote, titulo in self.cuadros(pasos, cada):
+                t0 = time.perf_counter()
+                self._pintar(lote, titulo)
+                stats.render_s += time.perf_counter() - t0
+                escritor.escribir_figura(self.fig)
+        finally:
+            escritor.cerrar()
+        return {"cuadros": stats.cuadros, "descartados": stats.descartados, "render_s": stats.render_s,
+                "espera_s": stats.espera_s, "codificacion_s": stats.codificacion_s, "total_s": stats.total_s,
+                "formato": escritor.formato, "destino": escritor.destino}
+
+    def mostrar(self, pasos, intervalo: int = 1000, cada: int = 1):
+        """
+        Muestra la animación en pantalla (requiere fig de pyplot). Los artistas
+        se actualizan (segmentos, posiciones, título) sin limpiar los ejes.
+        """
+        import matplotlib.pyplot as plt
+        from matplotlib.animation import FuncAnimation
+        cuadros = list(self.cuadros(pasos, cada))
+        segmentos, visitados = [], {}
+
+        def update(i):
+            lote, titulo = cuadros[i]
+            for u, v, _ in lote:
+                segmentos.append(self._segmento(u, v))
+                visitados.update(dict.fromkeys((u, v)))
+            self.mst.set_segments(segmentos)
+            self.nueva.set_segments([self._segmento(*lote[-1][:2])] if lote else [])
+            self.visitados.set_offsets([self.pos[x] for x in visitados])
+            self.titulo.set_text(titulo)
+            return self.mst, self.nueva, self.visitados, self.titulo
+
+        global ani
+        ani = FuncAnimation(self.fig, update, frames=len(cuadros), interval=intervalo, repeat=False)
+        plt.show()
+
+
+def _frames():
+    """Módulo 006_Visualizacion/001_Escritor_Frames.py (se carga una sola vez)."""
+    return cargar("escritor_frames")
+
+
+def main(headless=None):
+    """
+    Guarda la animación en prim.mp4 (o PNG en prim/ si no hay ffmpeg) y, si
+    hay pantalla y no se pidió headless, la muestra. headless=None lo detecta.
+    """
+    if headless is None:
+        headless = _frames().sin_pantalla()
+    import networkx as nx
+    if headless:
+        _frames().usar_sin_pantalla()
     # generar grafo de ejemplo
     G = ejemplo_grafo(n_nodes=10, seed=1, density=0.35, weight_range=(1, 15))
     pos = nx.spring_layout(G, seed=2)
-    steps = list(prim_steps(G, start=0))
-    fig, ax = plt.subplots(figsize=(8, 6))
+    pasos = list(prim_steps(G, start=0, deltas=True))
 
-    # preparar frames (todos los pasos incluidos)
-    frames = steps
-
-    def update(i):
-        u, v, w, mst_edges, visited = frames[i]
-        if u is None:
-            titulo = f"Finalizado: MST con {len(mst_edges)} aristas, peso total = {sum(x[2] for x in mst_edges)}"
-            ax.set_title(titulo)
-        else:
-            ax.set_title(f"Paso {i+1}: seleccionar arista ({u}, {v}) peso={w}")
-        dibujar_paso(ax, G, pos, mst_edges, highlight_edge=(u, v, w) if u is not None else None, visited=visited)
-
-    global ani
-    ani = FuncAnimation(fig, update, frames=len(frames), interval=1000, repeat=False)
-    plt.tight_layout()
-    # Intentar guardar la animación en un archivo mp4 usando ffmpeg.
-    # Si no está disponible, se intentará mostrar la figura (si hay backend).
+    t = AnimadorPrim(G, pos).guardar(pasos, "prim.mp4", fps=1)
+    print(f"Animación guardada en '{t['destino']}' ({t['formato']}, {t['cuadros']} cuadros) en {t['total_s']:.2f} s: "
+          f"render {t['render_s']:.2f} s, espera de cola {t['espera_s']:.2f} s, "
+          f"codificación {t['codificacion_s']:.2f} s, descartados {t['descartados']}.")
+    if headless:
+        return
     try:
-        ani.save("prim.mp4", writer="ffmpeg", fps=1)
-        print("Animación guardada en 'prim.mp4'.")
-    except Exception as e:
-        print("No se pudo guardar la animación con ffmpeg:", e)
-        print("Intentando fallback: guardar como GIF usando 'pillow'...")
-        try:
-            ani.save("prim.gif", writer="pillow", fps=1)
-            print("Fallback: animación guardada en 'prim.gif'.")
-        except Exception as e_gif:
-            print("Fallback GIF falló:", e_gif)
-            print("Se intentará mostrar la animación en pantalla (si el backend lo permite)...")
-            try:
-                plt.show()
-            except Exception as e2:
-                print("Mostrar en pantalla falló:", e2)
+        import matplotlib.pyplot as plt
+        fig = plt.figure(figsize=(8, 6))
+        AnimadorPrim(G, pos, fig=fig).mostrar(pasos)
+    except Exception as e2:
+        print("Mostrar en pantalla falló:", e2)
+
+
+def benchmark(n_nodes=150, density=0.05, seed=1):
+    """Tiempo por cuadro: redibujar todo con dibujar_paso vs. AnimadorPrim."""
+    import networkx as nx
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+    G = ejemplo_grafo(n_nodes=n_nodes, seed=seed, density=density)
+    pos = nx.spring_layout(G, seed=2)
+    pasos = list(prim_steps(G, start=0, deltas=True))
+    print(f"Grafo: {G.number_of_nodes()} nodos, {G.number_of_edges()} aristas, {len(pasos)} pasos")
+
+    fig = Figure(figsize=(8, 6))
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
+    muestra = pasos[:20]
+    t0 = time.perf_counter()
+    mst, visitados = [], set()
+    for u, v, w in muestra:
+        mst.append((u, v, w))
+        visitados.update((u, v))
+        dibujar_paso(ax, G, pos, mst, highlight_edge=(u, v, w), visited=visitados)
+        fig.canvas.draw()
+    t_antes = (time.perf_counter() - t0) / len(muestra)
+    print(f"  dibujar_paso (todo el grafo):  {t_antes * 1e3:8.1f} ms/cuadro")
+
+    animador = AnimadorPrim(G, pos)
+    for cada in (1, 10):
+        t = animador.guardar(pasos, "prim_benchmark.gif", fps=10, cada=cada)
+        print(f"  AnimadorPrim cada={cada:<3} {t['render_s'] / t['cuadros'] * 1e3:8.1f} ms/cuadro "
+              f"({t['cuadros']} cuadros; render {t['render_s']:.2f} s, codificación {t['codificacion_s']:.2f} s, "
+              f"total {t['total_s']:.2f} s)")
+    os.remove("prim_benchmark.gif")
+
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    if "--benchmark" in sys.argv:
+        benchmark()
+    else:
+        # --headless: solo escribir la animación, sin ventanas
+        main(headless=True if "--headless" in sys.argv else None)
@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""
+002_Prim_CSR.py
+
+Algoritmo de Prim (variante "eager") sobre un grafo en formato CSR
+(Compressed Sparse Row), sin networkx en el bucle principal.
+
+- El grafo se guarda en tres listas planas: indptr, indices y pesos.
+- Se usa un heap indexado por vértice: cada vértice aparece a lo sumo una vez
+  y su clave se reduce (decrease-key) cuando aparece una arista más barata.
+- La traza paso a paso es opcional y solo produce la arista nueva (delta),
+  sin copiar el árbol ni el conjunto de visitados en cada paso.
+
+Uso:
+  python 002_Prim_CSR.py               -> ejemplo pequeño
+  python 002_Prim_CSR.py --benchmark   -> comparación con networkx (1e6 aristas)
+
+Requisitos: ninguno (el benchmark usa numpy y networkx).
+"""
+import math
+import os
+import sys
+import time
+from typing import Any, Iterator, List, Optional, Sequence, Tuple
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from ia3 import cargar  # noqa: E402
+
+
+# -------------------------
+# Grafo CSR
+# -------------------------
+class GrafoCSR:
+    """
+    Grafo no dirigido en formato CSR.
+      - indptr[i] .. indptr[i+1] delimita los vecinos del vértice i
+      - indices[k] es el vecino, pesos[k] el peso de esa arista
+      - nodos[i] es la etiqueta original del vértice i
+    """
+    def __init__(self, indptr: List[int], indices: List[int], pesos: List[float], nodos: Sequence[Any]):
+        self.indptr = indptr
+        self.indices = indices
+        self.pesos = pesos
+        self.nodos = nodos
+
+    @property
+    def n(self) -> int:
+        return len(self.indptr) - 1
+
+    @property
+    def m(self) -> int:
+        # cada arista no dirigida aparece dos veces
+        return len(self.indices) // 2
+
+    def __repr__(self):
+        return f"GrafoCSR(n={self.n}, m={self.m})"
+
+
+def aristas_a_csr(n: int, origenes: Sequence[int], destinos: Sequence[int], pesos: Sequence[float],
+                  nodos: Optional[Sequence[Any]] = None) -> GrafoCSR:
+    """
+    Construye el CSR a partir de tres arreglos de aristas (u, v, w) con
+    vértices 0..n-1. Se usa un conteo por vértice (counting sort), O(n + m).
+    """
+    grado = [0] * (n + 1)
+    for u in origenes:
+        grado[u + 1] += 1
+    for v in destinos:
+        grado[v + 1] += 1
+    # prefijos -> indptr
+    for i in range(n):
+        grado[i + 1] += grado[i]
+    indptr = grado
+    siguiente = indptr[:-1]
+    indices = [0] * indptr[n]
+    pesos_csr = [0] * indptr[n]
+    for u, v, w in zip(origenes, destinos, pesos):
+        k = siguiente[u]
+        indices[k] = v
+        pesos_csr[k] = w
+        siguiente[u] = k + 1
+        k = siguiente[v]
+        indices[k] = u
+        pesos_csr[k] = w
+        siguiente[v] = k + 1
+    return GrafoCSR(indptr, indices, pesos_csr, nodos if nodos is not None else range(n))
+
+
+def grafo_a_csr(G, weight: str = "weight") -> GrafoCSR:
+    """
+    Convierte un grafo de networkx (como el de ejemplo_grafo) a CSR.
+    La conversión se hace una sola vez; después networkx ya no se toca.
+    """
+    nodos = list(G.nodes())
+    idx = {nodo: i for i, nodo in enumerate(nodos)}
+    origenes, destinos, pesos = [], [], []
+    for u, v, w in G.edges(data=weight, default=1):
+        origenes.append(idx[u])
+        destinos.append(idx[v])
+        pesos.append(w)
+    return aristas_a_csr(len(nodos), origenes, destinos, pesos, nodos)
+
+
+# -------------------------
+# Heap indexado
+# -------------------------
+class HeapIndexado:
+    """
+    Min-heap binario de vértices con clave, indexado por vértice.
+    'pos[v]' guarda la posición de v en el heap (-1 si no está), lo que permite
+    reducir la clave de un vértice en O(log n) sin insertar duplicados.
+    """
+    def __init__(self, n: int):
+        self.heap: List[int] = []
+        self.pos = [-1] * n
+        self.clave = [math.inf] * n
+
+    def __len__(self):
+        return len(self.heap)
+
+    def __contains__(self, v: int):
+        return self.pos[v] >= 0
+
+    def push_or_decrease(self, v: int, clave: float) -> bool:
+        """Inserta v o reduce su clave. Devuelve True si hubo cambio."""
+        if clave >= self.clave[v]:
+            return False
+        self.clave[v] = clave
+        i = self.pos[v]
+        if i < 0:
+            i = len(self.heap)
+            self.heap.append(v)
+        self._subir(i, v)
+        return True
+
+    def pop(self) -> Tuple[int, float]:
+        heap, pos = self.heap, self.pos
+        v = heap[0]
+        ultimo = heap.pop()
+        pos[v] = -1
+        if heap:
+            self._bajar(0, ultimo)
+        return v, self.clave[v]
+
+    def _subir(self, i: int, v: int):
+        heap, pos, clave = self.heap, self.pos, self.clave
+        cv = clave[v]
+        while i > 0:
+            padre = (i - 1) >> 1
+            p = heap[padre]
+            if clave[p] <= cv:
+                break
+            heap[i] = p
+            pos[p] = i
+            i = padre
+        heap[i] = v
+        pos[v] = i
+
+    def _bajar(self, i: int, v: int):
+        heap, pos, clave = self.heap, self.pos, self.clave
+        n = len(heap)
+        cv = clave[v]
+        while True:
+            hijo = 2 * i + 1
+            if hijo >= n:
+                break
+            if hijo + 1 < n and clave[heap[hijo + 1]] < clave[heap[hijo]]:
+                hijo += 1
+            h = heap[hijo]
+            if cv <= clave[h]:
+                break
+            heap[i] = h
+            pos[h] = i
+            i = hijo
+        heap[i] = v
+        pos[v] = i
+
+
+# -------------------------
+# Prim (eager)
+# -------------------------
+def _prim_csr(csr: GrafoCSR, inicio: int) -> Iterator[Tuple[int, int, float]]:
+    """
+    Núcleo de Prim sobre índices 0..n-1. Produce (padre, vértice, peso)
+    cada vez que un vértice entra al árbol. Trabajo extra por paso: O(1).
+    """
+    n = csr.n
+    indptr, indices, pesos = csr.indptr, csr.indices, csr.pesos
+    en_arbol = [False] * n
+    padre = [-1] * n
+    heap = HeapIndexado(n)
+    clave = heap.clave
+    decrease = heap.push_or_decrease
+
+    u = inicio
+    while True:
+        en_arbol[u] = True
+        for k in range(indptr[u], indptr[u + 1]):
+            v = indices[k]
+            if not en_arbol[v] and pesos[k] < clave[v]:
+                decrease(v, pesos[k])
+                padre[v] = u
+        if not heap.heap:
+            return
+        u, w = heap.pop()
+        yield padre[u], u, w
+
+
+def prim_mst(grafo, start=None, trace: bool = False):
+    """
+    Árbol de expansión mínima con Prim sobre un GrafoCSR (o un grafo de
+    networkx, que se convierte una vez a CSR).
+
+    start: etiqueta del nodo inicial (por defecto el primero).
+    trace: si es True devuelve un generador que produce solo la arista
+           agregada en cada paso, (u, v, w), en lugar de la lista completa.
+
+    Devuelve la lista de aristas (u, v, w) del árbol, en el mismo orden y
+    formato que las aristas producidas por prim_steps.
+    """
+    csr = grafo if isinstance(grafo, GrafoCSR) else grafo_a_csr(grafo)
+    if csr.n == 0:
+        return iter(()) if trace else []
+    nodos = csr.nodos
+    if start is None:
+        inicio = 0
+    elif isinstance(nodos, range):
+        inicio = start
+    else:
+        inicio = list(nodos).index(start)
+
+    pasos = ((nodos[u], nodos[v], w) for u, v, w in _prim_csr(csr, inicio))
+    if trace:
+        return pasos
+    return list(pasos)
+
+
+# -------------------------
+# Benchmark contra networkx
+# -------------------------
+def benchmark(n: int = 100_000, m: int = 1_000_000, seed: int = 0):
+    import networkx as nx
+
+    print(f"Benchmark Prim: n={n}, m={m}")
+    g = cargar("generador_grafos").gnm(n, m, seed, weight_range=(1, 1000), conexo=True)
+    origenes, destinos, pesos = g.u.tolist(), g.v.tolist(), g.w.tolist()
+
+    t0 = time.perf_counter()
+    csr = aristas_a_csr(n, origenes, destinos, pesos)
+    t1 = time.perf_counter()
+    mst = prim_mst(csr, start=0)
+    t2 = time.perf_counter()
+    peso = sum(w for _, _, w in mst)
+    print(f"  prim_mst:     construir CSR {t1 - t0:.2f} s, Prim {t2 - t1:.2f} s, "
+          f"{len(mst)} aristas, peso total = {peso}")
+
+    G = nx.Graph()
+    G.add_weighted_edges_from(zip(origenes, destinos, pesos))
+    t3 = time.perf_counter()
+    T = nx.minimum_spanning_tree(G, algorithm="prim")
+    t4 = time.perf_counter()
+    peso_nx = T.size(weight="weight")
+    print(f"  networkx:     Prim {t4 - t3:.2f} s, {T.number_of_edges()} aristas, peso total = {peso_nx}")
+    print(f"  Aceleración (solo algoritmo): {(t4 - t3) / (t2 - t1):.1f}x")
+
+
+def ejemplo():
+    # Grafo pequeño como arreglos de aristas
+    origenes = [0, 0, 1, 1, 2, 2, 3, 4]
+    destinos = [1, 2, 2, 3, 3, 4, 4, 5]
+    pesos = [4, 3, 1, 2, 4, 5, 7, 6]
+    csr = aristas_a_csr(6, origenes, destinos, pesos)
+    print("Grafo:", csr)
+    print("Pasos (solo la arista nueva en cada paso):")
+    for i, (u, v, w) in enumerate(prim_mst(csr, start=0, trace=True), start=1):
+        print(f"  Paso {i}: arista ({u}, {v}) peso={w}")
+    mst = prim_mst(csr, start=0)
+    print(f"MST: {mst}, peso total = {sum(w for _, _, w in mst)}")
+
+
+if __name__ == "__main__":
+    if "--benchmark" in sys.argv:
+        benchmark()
+    else:
+        ejemplo()
@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+"""
+003_MST_Dinamico.py
+
+Mantenimiento incremental de un árbol de expansión mínima (MST) cuando
+llegan aristas nuevas, sin recalcular todo el árbol.
+
+Idea: al insertar (u, v, w)
+  - si u y v están en árboles distintos, la arista se agrega directamente;
+  - si ya están conectados, se busca la arista más pesada en el camino u-v
+    del árbol; si w es menor, se quita esa arista y se agrega la nueva.
+
+El máximo del camino se obtiene con un link-cut tree (árboles splay con
+inversión perezosa). Cada arista del árbol se representa como un nodo
+intermedio u - e - v cuyo valor es su peso, así el máximo del camino es un
+agregado por nodo. Cada inserción cuesta O(log n) amortizado.
+
+Uso:
+  python 003_MST_Dinamico.py
+"""
+import math
+import os
+import random
+import sys
+import time
+from typing import Any, Dict, Iterable, List, Tuple
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from ia3 import cargar  # noqa: E402
+
+
+# -------------------------
+# Link-cut tree (sobre listas)
+# -------------------------
+class LinkCutTree:
+    """
+    Bosque de link-cut trees con agregado "nodo de valor máximo" por camino.
+    Los nodos son enteros >= 1 (el 0 hace de nodo nulo).
+    """
+    def __init__(self):
+        self.izq = [0]
+        self.der = [0]
+        self.padre = [0]
+        self.inv = [False]
+        self.val = [-math.inf]
+        self.mx = [0]  # nodo con el valor máximo en el subárbol splay
+
+    def nuevo_nodo(self, valor: float = -math.inf) -> int:
+        x = len(self.val)
+        self.izq.append(0)
+        self.der.append(0)
+        self.padre.append(0)
+        self.inv.append(False)
+        self.val.append(valor)
+        self.mx.append(x)
+        return x
+
+    def reutilizar_nodo(self, x: int, valor: float):
+        self.izq[x] = self.der[x] = self.padre[x] = 0
+        self.inv[x] = False
+        self.val[x] = valor
+        self.mx[x] = x
+
+    # --- operaciones internas del árbol splay ---
+    def _es_raiz(self, x: int) -> bool:
+        p = self.padre[x]
+        return p == 0 or (self.izq[p] != x and self.der[p] != x)
+
+    def _actualizar(self, x: int):
+        val, mx = self.val, self.mx
+        m = x
+        l, r = self.izq[x], self.der[x]
+        if l and val[mx[l]] > val[m]:
+            m = mx[l]
+        if r and val[mx[r]] > val[m]:
+            m = mx[r]
+        mx[x] = m
+
+    def _invertir(self, x: int):
+        self.izq[x], self.der[x] = self.der[x], self.izq[x]
+        self.inv[x] = not self.inv[x]
+
+    def _propagar(self, x: int):
+        if self.inv[x]:
+            if self.izq[x]:
+                self._invertir(self.izq[x])
+            if self.der[x]:
+                self._invertir(self.der[x])
+            self.inv[x] = False
+
+    def _rotar(self, x: int):
+        izq, der, padre = self.izq, self.der, self.padre
+        y = padre[x]
+        z = padre[y]
+        if not self._es_raiz(y):
+            if izq[z] == y:
+                izq[z] = x
+            else:
+                der[z] = x
+        padre[x] = z
+        if izq[y] == x:
+            b = der[x]
+            izq[y] = b
+            der[x] = y
+        else:
+            b = izq[x]
+            der[y] = b
+            izq[x] = y
+        if b:
+            padre[b] = y
+        padre[y] = x
+        self._actualizar(y)
+        self._actualizar(x)
+
+    def _splay(self, x: int):
+        # propagar inversiones pendientes desde la raíz del splay hasta x
+        pila = [x]
+        y = x
+        while not self._es_raiz(y):
+            y = self.padre[y]
+            pila.append(y)
+        for y in reversed(pila):
+            self._propagar(y)
+        izq, padre = self.izq, self.padre
+        while not self._es_raiz(x):
+            y = padre[x]
+            if not self._es_raiz(y):
+                z = padre[y]
+                if (izq[y] == x) == (izq[z] == y):
+                    self._rotar(y)
+                else:
+                    self._rotar(x)
+            self._rotar(x)
+
+    def _acceder(self, x: int):
+        ultimo = 0
+        y = x
+        while y:
+            self._splay(y)
+            self.der[y] = ultimo
+            self._actualizar(y)
+            ultimo = y
+            y = self.padre[y]
+        self._splay(x)
+
+    # --- operaciones públicas ---
+    def hacer_raiz(self, x: int):
+        self._acceder(x)
+        self._invertir(x)
+
+    def raiz(self, x: int) -> int:
+        self._acceder(x)
+        while True:
+            self._propagar(x)
+            if not self.izq[x]:
+                break
+            x = self.izq[x]
+        self._splay(x)
+        return x
+
+    def conectados(self, x: int, y: int) -> bool:
+        return x == y or self.raiz(x) == self.raiz(y)
+
+    def enlazar(self, x: int, y: int):
+        """Agrega la arista x-y (x e y deben estar en árboles distintos)."""
+        self.hacer_raiz(x)
+        self.padre[x] = y
+
+    def cortar(self, x: int, y: int):
+        """Quita la arista x-y (deben ser adyacentes)."""
+        self.hacer_raiz(x)
+        self._acceder(y)
+        self.izq[y] = 0
+        self.padre[x] = 0
+        self._actualizar(y)
+
+    def maximo_camino(self, x: int, y: int) -> int:
+        """Nodo de valor máximo en el camino x-y (deben estar conectados)."""
+        self.hacer_raiz(x)
+        self._acceder(y)
+        return self.mx[y]
+
+
+# -------------------------
+# MST dinámico
+# -------------------------
+class MSTDinamico:
+    """
+    MST que se mantiene al insertar aristas.
+
+    Se inicializa con el resultado de prim_steps (tuplas cuyo inicio es
+    (u, v, w); se ignora el paso final con u=None) o con cualquier lista de
+    aristas (u, v, w) de un MST.
+    """
+    def __init__(self, aristas: Iterable[Tuple] = ()):
+        self.lct = LinkCutTree()
+        self.ids: Dict[Any, int] = {}
+        # nodo-arista del link-cut tree -> (u, v, w)
+        self.arista_de: Dict[int, Tuple[Any, Any, float]] = {}
+        self._libres: List[int] = []
+        self._peso_total = 0
+        for paso in aristas:
+            u, v, w = paso[:3]
+            if u is None:
+                continue
+            self.add_edge(u, v, w)
+
+    @property
+    def peso_total(self):
+        """Peso total del árbol actual, O(1)."""
+        return self._peso_total
+
+    def __len__(self):
+        return len(self.arista_de)
+
+    def aristas(self) -> List[Tuple[Any, Any, float]]:
+        return list(self.arista_de.values())
+
+    def _id(self, nodo) -> int:
+        x = self.ids.get(nodo)
+        if x is None:
+            x = self.lct.nuevo_nodo()
+            self.ids[nodo] = x
+        return x
+
+    def _enlazar_arista(self, u, v, w, iu: int, iv: int):
+        if self._libres:
+            e = self._libres.pop()
+            self.lct.reutilizar_nodo(e, w)
+        else:
+            e = self.lct.nuevo_nodo(w)
+        self.lct.enlazar(iu, e)
+        self.lct.enlazar(e, iv)
+        self.arista_de[e] = (u, v, w)
+        self._peso_total += w
+
+    def _cortar_arista(self, e: int):
+        u, v, w = self.arista_de.pop(e)
+        self.lct.cortar(self.ids[u], e)
+        self.lct.cortar(e, self.ids[v])
+        self._libres.append(e)
+        self._peso_total -= w
+
+    def add_edge(self, u, v, w) -> bool:
+        """
+        Inserta la arista (u, v, w). Devuelve True si el árbol cambió
+        (se agregó la arista, reemplazando o no a otra).
+        """
+        if u == v:
+            return False
+        iu, iv = self._id(u), self._id(v)
+        if not self.lct.conectados(iu, iv):
+            self._enlazar_arista(u, v, w, iu, iv)
+            return True
+        e = self.lct.maximo_camino(iu, iv)
+        if w >= self.lct.val[e]:
+            return False
+        self._cortar_arista(e)
+        self._enlazar_arista(u, v, w, iu, iv)
+        return True
+
+    def add_edges(self, aristas: Iterable[Tuple[Any, Any, float]]) -> int:
+        """
+        Inserta un lote de aristas. Se procesan de menor a mayor peso para
+        evitar reemplazos que una arista posterior del mismo lote desharía.
+        Devuelve cuántas aristas entraron al árbol.
+        """
+        cambios = 0
+        for u, v, w in sorted(aristas, key=lambda a: a[2]):
+            if self.add_edge(u, v, w):
+                cambios += 1
+        return cambios
+
+
+# -------------------------
+# Ejemplo de uso
+# -------------------------
+def ejemplo(n: int = 2000, m_inicial: int = 8000, inserciones: int = 2000, seed: int = 3):
+    prim = cargar("prim_csr")
+    rnd = random.Random(seed)
+
+    g = cargar("generador_grafos").gnm(n, m_inicial, seed, weight_range=(1, 1000), conexo=True)
+    origenes, destinos, pesos = g.u.tolist(), g.v.tolist(), g.w.tolist()
+    mst = prim.prim_mst(prim.aristas_a_csr(n, origenes, destinos, pesos), start=0)
+    dinamico = MSTDinamico(mst)
+    print(f"MST inicial: {len(dinamico)} aristas, peso total = {dinamico.peso_total}")
+
+    nuevas = [(rnd.randrange(n), rnd.randrange(n), rnd.randint(1, 1000)) for _ in range(inserciones)]
+    t0 = time.perf_counter()
+    cambios = 0
+    for u, v, w in nuevas:
+        cambios += dinamico.add_edge(u, v, w)
+    t1 = time.perf_counter()
+    print(f"{inserciones} inserciones: {cambios} cambiaron el árbol, "
+          f"{(t1 - t0) / inserciones * 1e6:.1f} µs por inserción")
+
+    # Verificación: recalcular desde cero con todas las aristas
+    for u, v, w in nuevas:
+        if u != v:
+            origenes.append(u)
+            destinos.append(v)
+            pesos.append(w)
+    t2 = time.perf_counter()
+    recalculado = prim.prim_mst(prim.aristas_a_csr(n, origenes, destinos, pesos), start=0)
+    t3 = time.perf_counter()
+    print(f"Peso total dinámico = {dinamico.peso_total}, "
+          f"recalculado = {sum(w for _, _, w in recalculado)} ({(t3 - t2) * 1e3:.1f} ms por recálculo)")
+
+
+if __name__ == "__main__":
+    ejemplo()
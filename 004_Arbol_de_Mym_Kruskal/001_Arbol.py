@@ -1,8 +1,13 @@
 import os
 import math
 import random
-from typing import Any, List, Optional, Tuple, Dict
-import networkx as nx
+import sys
+import time
+from array import array
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from ia3 import cargar, crear_pool  # noqa: E402
 
 #!/usr/bin/env python3
 """
@@ -23,14 +28,23 @@ Requisitos:
 
 Si faltan paquetes, instálelos con:
 pip install networkx matplotlib
-"""
 
-import matplotlib.pyplot as plt
+Uso:
+  python 001_Arbol.py              -> ejemplo (guarda los pasos y los muestra si hay pantalla)
+  python 001_Arbol.py --headless   -> solo escribe los cuadros, sin ventanas ni pausas
+  python 001_Arbol.py --benchmark  -> compara los algoritmos de búsqueda
+"""
+# networkx y matplotlib se importan recién al dibujar (tree_to_networkx,
+# SnapshotRenderer, play_snapshots): minimax y las búsquedas no los necesitan.
 
 # -------------------------
 # Estructura de datos
 # -------------------------
 class Node:
+    # __slots__: sin __dict__ por instancia (menos memoria en árboles grandes).
+    # Para árboles muy grandes ver FlatTree en 004_Minimax_Plano.py.
+    __slots__ = ("name", "children", "value")
+
     def __init__(self, name: str, children: Optional[List["Node"]] = None, value: Optional[float] = None):
         self.name = name
         self.children = children or []
@@ -85,95 +99,577 @@ def build_random_full_tree(depth: int, branching: int = 2, leaf_range=(0, 9), na
 # -------------------------
 # Minimax con trazado paso a paso
 # -------------------------
+_NAN = float("nan")
+
+# Tipos de evento de un paso (se guardan como un byte por paso)
+EVENT_START, EVENT_LEAF, EVENT_CHILD, EVENT_BEST, EVENT_PRUNE, EVENT_SET = range(6)
+
+
 class StepRecorder:
     """
-    Guarda "snapshots" para visualizar el árbol en distintos pasos.
-    Cada snapshot contiene:
-      - Qué nodo se está evaluando/actualizando (node.name)
-      - Estado actual de valores en nodos (mapping name -> value or None)
-      - Descripción textual del paso
+    Guarda los pasos para visualizar el árbol como deltas, no como copias.
+    Por cada paso se almacena, en arreglos compactos:
+      - el id del nodo resaltado (node.name -> id entero)
+      - su valor anterior y su valor nuevo (NaN representa None)
+      - el tipo de evento y la descripción textual
+    El árbol solo se recorre una vez (en el primer paso) para tomar el estado
+    base; cualquier snapshot se reconstruye reproduciendo los deltas desde el
+    checkpoint más cercano (uno cada 'checkpoint_every' pasos; None = ninguno).
+
+    'snapshots' sigue ofreciendo la vista de antes (una lista de dicts con
+    "highlight", "state" y "description"), pero construida bajo demanda.
+    Solo se registran cambios de valor del nodo pasado a record().
     """
+    def __init__(self, checkpoint_every: Optional[int] = 1024):
+        self.checkpoint_every = checkpoint_every
+        self.names: List[str] = []
+        self._ids: Dict[str, int] = {}
+        self._base = array("d")
+        self._current = array("d")
+        self.node = array("i")
+        self.old = array("d")
+        self.new = array("d")
+        self.event = array("b")
+        self.descriptions: List[str] = []
+        self._checkpoints: Dict[int, array] = {}
+        # raíz de los nodos explorados en una búsqueda perezosa (minimax con children=...)
+        self.root: Optional[Node] = None
+
+    def _node_id(self, n: Node) -> int:
+        i = self._ids.get(n.name)
+        if i is None:
+            # nodo que no existía al tomar el estado base
+            i = len(self.names)
+            self._ids[n.name] = i
+            self.names.append(n.name)
+            v = _NAN if n.value is None else n.value
+            self._base.append(v)
+            self._current.append(v)
+        return i
+
+    def record(self, root: Node, current_node: Optional[Node], description: str, event: int = EVENT_START):
+        if not self.names:
+            stack = [root]
+            while stack:
+                n = stack.pop()
+                self._node_id(n)
+                stack.extend(reversed(n.children))
+        if current_node is None:
+            i, old, new = -1, _NAN, _NAN
+        else:
+            i = self._node_id(current_node)
+            old = self._current[i]
+            new = _NAN if current_node.value is None else current_node.value
+            self._current[i] = new
+        self.node.append(i)
+        self.old.append(old)
+        self.new.append(new)
+        self.event.append(event)
+        self.descriptions.append(description)
+        k = self.checkpoint_every
+        if k and len(self.node) % k == 0:
+            self._checkpoints[len(self.node)] = array("d", self._current)
+
+    # -------------------------
+    # Reconstrucción de snapshots
+    # -------------------------
+    def _state_after(self, step: int) -> array:
+        """Valores (por id) después de aplicar los pasos 0..step."""
+        start = 0
+        if self.checkpoint_every:
+            start = ((step + 1) // self.checkpoint_every) * self.checkpoint_every
+        values = array("d", self._checkpoints[start]) if start else array("d", self._base)
+        # en una búsqueda perezosa los nodos descubiertos después del checkpoint
+        # no están en él: arrancan con su valor base, como al recorrer desde el paso 0
+        values.extend(self._base[len(values):])
+        node, new = self.node, self.new
+        for j in range(start, step + 1):
+            if node[j] >= 0:
+                values[node[j]] = new[j]
+        return values
+
+    def _as_snapshot(self, step: int, values: array) -> Dict:
+        i = self.node[step]
+        return {
+            "highlight": self.names[i] if i >= 0 else None,
+            "state": {name: (None if math.isnan(v) else v) for name, v in zip(self.names, values)},
+            "description": self.descriptions[step],
+            "event": self.event[step],
+        }
+
+    def snapshot(self, step: int) -> Dict:
+        """Snapshot del paso 'step' (0 = primer paso), reconstruido."""
+        total = len(self.node)
+        if step < 0:
+            step += total
+        if not 0 <= step < total:
+            raise IndexError("paso fuera de rango")
+        return self._as_snapshot(step, self._state_after(step))
+
+    def iter_snapshots(self, start: int = 0, stop: Optional[int] = None):
+        """Recorre los snapshots start..stop-1 en orden aplicando un delta por paso."""
+        values = self._state_after(start - 1) if start > 0 else array("d", self._base)
+        node, new = self.node, self.new
+        for step in range(start, len(node) if stop is None else min(stop, len(node))):
+            if node[step] >= 0:
+                values[node[step]] = new[step]
+            yield self._as_snapshot(step, values)
+
+    @property
+    def snapshots(self) -> "_SnapshotView":
+        return _SnapshotView(self)
+
+
+class _SnapshotView:
+    """Vista de solo lectura tipo lista sobre los snapshots de un StepRecorder."""
+    def __init__(self, recorder: StepRecorder):
+        self._recorder = recorder
+
+    def __len__(self):
+        return len(self._recorder.node)
+
+    def __getitem__(self, step):
+        if isinstance(step, slice):
+            return [self._recorder.snapshot(i) for i in range(*step.indices(len(self)))]
+        return self._recorder.snapshot(step)
+
+    def __iter__(self):
+        return self._recorder.iter_snapshots()
+
+
+# -------------------------
+# Tabla de transposición, ordenamiento de jugadas y estadísticas
+# -------------------------
+EXACT, LOWER, UPPER = 0, 1, 2  # tipo de valor guardado en la tabla
+_UNLIMITED = 1 << 30           # profundidad "sin límite"
+
+
+class SearchStats:
+    """Contadores de una búsqueda (se acumulan si se reutiliza el objeto)."""
     def __init__(self):
-        self.snapshots = []
-
-    def record(self, root: Node, current_node: Optional[Node], description: str):
-        state = {}
-        def _collect(n: Node):
-            state[n.name] = n.value
-            for c in n.children:
-                _collect(c)
-        _collect(root)
-        self.snapshots.append({
-            "highlight": current_node.name if current_node else None,
-            "state": state,
-            "description": description
-        })
-
-def minimax(root: Node, maximizing_player: bool = True, recorder: Optional[StepRecorder] = None, alpha_beta: bool = False) -> float:
+        self.nodes = 0
+        self.leaves = 0
+        self.cutoffs = 0
+        self.tt_probes = 0
+        self.tt_hits = 0
+        self.tt_cutoffs = 0
+
+    @property
+    def tt_hit_rate(self) -> float:
+        return self.tt_hits / self.tt_probes if self.tt_probes else 0.0
+
+    def pruned_fraction(self, root: Node) -> float:
+        """Fracción del árbol (ya construido) que no se visitó."""
+        total = 0
+        stack = [root]
+        while stack:
+            n = stack.pop()
+            total += 1
+            stack.extend(n.children)
+        return 1.0 - self.nodes / total if total else 0.0
+
+    def __repr__(self):
+        return (f"SearchStats(nodes={self.nodes}, leaves={self.leaves}, cutoffs={self.cutoffs}, "
+                f"tt_hits={self.tt_hits}/{self.tt_probes} ({self.tt_hit_rate:.1%}), tt_cutoffs={self.tt_cutoffs})")
+
+
+class TranspositionTable:
+    """
+    Tabla de transposición de tamaño fijo: 'size' casillas indexadas por
+    hash(clave) % size. Cada casilla guarda (clave, valor, profundidad
+    restante, tipo EXACT/LOWER/UPPER, índice del mejor hijo).
+
+    Política de reemplazo cuando la casilla ya está ocupada por otra clave:
+      - "depth": solo si la nueva entrada se buscó a igual o mayor profundidad
+      - "always": siempre
+    La clave la da la función 'key' de minimax (por defecto node.name); para
+    juegos se puede usar un hash de Zobrist del estado (ver ZobristHash).
+    """
+    def __init__(self, size: int = 1 << 16, policy: str = "depth"):
+        if policy not in ("depth", "always"):
+            raise ValueError("policy debe ser 'depth' o 'always'.")
+        self.size = size
+        self.policy = policy
+        self.slots: List[Optional[Tuple]] = [None] * size
+
+    def probe(self, key) -> Optional[Tuple]:
+        entry = self.slots[hash(key) % self.size]
+        if entry is not None and entry[0] == key:
+            return entry
+        return None
+
+    def store(self, key, value: float, depth: int, flag: int, best: int = -1):
+        i = hash(key) % self.size
+        old = self.slots[i]
+        if old is None or old[0] == key or self.policy == "always" or depth >= old[2]:
+            self.slots[i] = (key, value, depth, flag, best)
+
+    def clear(self):
+        self.slots = [None] * self.size
+
+
+class ZobristHash:
+    """
+    Hash de Zobrist para estados de juego: un número aleatorio de 64 bits
+    por (pieza, casilla); el hash del estado es el XOR de los presentes y se
+    actualiza en O(1) por jugada con toggle().
+    """
+    def __init__(self, pieces: int, squares: int, seed: int = 0):
+        rnd = random.Random(seed)
+        self.table = [[rnd.getrandbits(64) for _ in range(squares)] for _ in range(pieces)]
+        self.side = rnd.getrandbits(64)
+
+    def hash(self, board: Dict[int, int], max_to_move: bool = True) -> int:
+        """board: {casilla: pieza}."""
+        h = self.side if max_to_move else 0
+        for square, piece in board.items():
+            h ^= self.table[piece][square]
+        return h
+
+    def toggle(self, h: int, piece: int, square: int) -> int:
+        return h ^ self.table[piece][square]
+
+
+class StaticOrder:
+    """Ordena los hijos por una evaluación estática (mejores primero)."""
+    def __init__(self, evaluate: Callable[[Node], float]):
+        self.evaluate = evaluate
+
+    def order(self, node: Node, children: List[Node], maximizing: bool, ply: int) -> List[Node]:
+        return sorted(children, key=self.evaluate, reverse=maximizing)
+
+
+class HistoryHeuristic:
+    """
+    Heurísticas "killer" e "history": las jugadas que produjeron un corte se
+    prueban primero. Una jugada se identifica con move_key(padre, i, hijo);
+    por defecto es el índice i del hijo.
+    """
+    def __init__(self, killers_per_ply: int = 2, move_key: Optional[Callable] = None):
+        self.killers_per_ply = killers_per_ply
+        self.move_key = move_key or (lambda parent, i, child: i)
+        self.killers: Dict[int, List] = {}
+        self.history: Dict[Any, int] = {}
+
+    def order(self, node: Node, children: List[Node], maximizing: bool, ply: int) -> List[Node]:
+        killers = self.killers.get(ply, ())
+        history = self.history
+        keys = [self.move_key(node, i, c) for i, c in enumerate(children)]
+        ranked = sorted(range(len(children)),
+                        key=lambda i: (keys[i] not in killers, -history.get(keys[i], 0)))
+        return [children[i] for i in ranked]
+
+    def cutoff(self, node: Node, index: int, child: Node, ply: int, depth: int):
+        k = self.move_key(node, index, child)
+        killers = self.killers.setdefault(ply, [])
+        if k not in killers:
+            killers.insert(0, k)
+            del killers[self.killers_per_ply:]
+        self.history[k] = self.history.get(k, 0) + min(depth, 64) ** 2
+
+
+class StateNode(Node):
+    """Nodo creado durante la búsqueda perezosa; guarda el estado del juego."""
+    __slots__ = ("state",)
+
+    def __init__(self, name: str, state: Any):
+        super().__init__(name)
+        self.state = state
+
+
+ALGORITHMS = ("minimax", "alphabeta", "pvs", "mtdf")
+
+
+def _flip(flag: int) -> int:
+    # una cota inferior para un jugador es una cota superior para el otro
+    return flag if flag == EXACT else LOWER + UPPER - flag
+
+
+def minimax(root: Any, maximizing_player: bool = True, recorder: Optional[StepRecorder] = None,
+            alpha_beta: bool = False, depth: Optional[int] = None,
+            evaluate: Optional[Callable[[Any], float]] = None,
+            table: Optional[TranspositionTable] = None, key: Optional[Callable[[Any], Any]] = None,
+            order=None, stats: Optional[SearchStats] = None,
+            children: Optional[Callable[[Any], Iterable[Any]]] = None,
+            algorithm: Optional[str] = None, guess: float = 0.0) -> float:
     """
     Ejecuta Minimax sobre 'root', actualiza node.value en cada nodo y opcionalmente
     graba pasos en recorder. Retorna el valor calculado para la raíz.
 
     Si alpha_beta=True, realiza poda alfa-beta y también registra los pasos importantes.
+
+    Opciones:
+      - algorithm: "minimax", "alphabeta", "pvs" (Principal Variation Search /
+        NegaScout: el primer hijo con ventana completa y los demás con ventana
+        nula, re-buscando solo si la mejoran) o "mtdf" (MTD(f): búsquedas
+        sucesivas de ventana nula sobre la tabla de transposición, empezando
+        en 'guess'). Por defecto "alphabeta" si alpha_beta=True y "minimax"
+        si no. Con poda, node.value de un nodo interno puede ser solo una
+        cota; el valor de la raíz siempre es exacto.
+      - depth: límite de profundidad; los nodos internos en el límite se
+        valoran con evaluate(node).
+      - table: TranspositionTable compartida (guarda valores exactos y cotas).
+        MTD(f) crea una si no se pasa.
+      - key: clave del nodo para la tabla (por defecto node.name); debe
+        distinguir también al jugador en turno.
+      - order: objeto con order(node, hijos, maximizing, ply) y opcionalmente
+        cutoff(node, i, hijo, ply, depth) (StaticOrder, HistoryHeuristic).
+      - stats: SearchStats donde se cuentan nodos, cortes y aciertos de tabla.
+
+    Búsqueda perezosa (sin construir el árbol):
+      - children: función children(estado) -> iterable de estados hijos.
+        En este modo 'root' es un estado, evaluate(estado) valora los estados
+        terminales (sin hijos) y los del límite de profundidad, y key/order
+        reciben estados (key por defecto: el propio estado).
+        Los hijos se generan a medida que se recorren, así que las ramas podadas
+        nunca se generan (si no hay 'order' ni mejor jugada en la tabla, ni
+        siquiera los hermanos restantes). Con recorder, los nodos visitados se
+        guardan como StateNode bajo una raíz StateNode para poder graficarlos.
     """
     INF = float("inf")
+    if algorithm is None:
+        algorithm = "alphabeta" if alpha_beta else "minimax"
+    if algorithm not in ALGORITHMS:
+        raise ValueError(f"algorithm debe ser uno de {ALGORITHMS}.")
+    prune = algorithm != "minimax"
+    pvs = algorithm == "pvs"
+    if algorithm == "mtdf" and table is None:
+        table = TranspositionTable()
+    lazy = children is not None
+    if lazy and evaluate is None:
+        raise ValueError("La búsqueda perezosa (children=...) requiere 'evaluate'.")
+    if lazy:
+        view = lambda p: p.state
+        key = key or (lambda state: state)
+        counter = [0]
+        root_pos = StateNode("S0" if recorder else "", root)
+    else:
+        view = lambda p: p
+        key = key or (lambda n: n.name)
+        root_pos = root
+    on_cutoff = getattr(order, "cutoff", None)
+
+    def _wrap(state: Any, parent: StateNode) -> StateNode:
+        if recorder:
+            counter[0] += 1
+            child = StateNode(f"S{counter[0]}", state)
+            parent.children.append(child)
+            return child
+        return StateNode("", state)
+
+    def _ordered(node, kids: List, maximizing: bool, ply: int, best: int) -> List[Tuple[int, Any]]:
+        indexed = list(enumerate(kids))
+        if order is not None:
+            # el hook ve estados (o Node); se mapea su orden de vuelta a índices
+            slots: Dict[int, List[int]] = {}
+            for i, c in reversed(indexed):
+                slots.setdefault(id(view(c)), []).append(i)
+            ranked = order.order(view(node), [view(c) for c in kids], maximizing, ply)
+            indexed = [(i, kids[i]) for i in (slots[id(v)].pop() for v in ranked)]
+        if best >= 0:
+            # la mejor jugada guardada en la tabla se prueba primero
+            indexed.sort(key=lambda ic: ic[0] != best)
+        return indexed
+
+    def _children(node, maximizing: bool, ply: int, best: int) -> Iterator[Tuple[int, Any]]:
+        if not lazy:
+            if order is None and best < 0:
+                return enumerate(node.children)
+            return iter(_ordered(node, node.children, maximizing, ply, best))
+        generated = children(node.state)
+        if order is None and best < 0:
+            return ((i, _wrap(st, node)) for i, st in enumerate(generated))
+        return iter(_ordered(node, [_wrap(st, node) for st in generated], maximizing, ply, best))
 
-    def _minimax(node: Node, maximizing: bool, alpha: float, beta: float) -> float:
-        # Record start of evaluation
+    def _leaf(node, value: float, description: str) -> float:
+        if stats:
+            stats.leaves += 1
         if recorder:
-            recorder.record(root, node, f"Comienza evaluación de {node.name} (maximizing={maximizing})")
+            recorder.record(root_pos, node, description, EVENT_LEAF)
+        return value
 
-        if node.is_leaf():
+    def _negamax(node, color: int, alpha: float, beta: float, remaining: int, ply: int) -> float:
+        # Negamax: valores y ventana (alpha, beta) desde el punto de vista de
+        # quien mueve (color = +1 max, -1 min); node.value, la tabla y la traza
+        # guardan siempre el valor "real" color * valor (+ 0.0 evita el -0.0).
+        maximizing = color > 0
+        if recorder:
+            recorder.record(root_pos, node, f"Comienza evaluación de {node.name} (maximizing={maximizing})", EVENT_START)
+        if stats:
+            stats.nodes += 1
+
+        if not lazy and node.is_leaf():
             # Leaf: su value ya está definido
-            if recorder:
-                recorder.record(root, node, f"Hoja {node.name} con valor {node.value}")
-            return node.value
+            return color * _leaf(node, node.value, f"Hoja {node.name} con valor {node.value}")
 
-        if maximizing:
-            value = -INF
-            for child in node.children:
-                v = _minimax(child, False, alpha, beta)
-                if recorder:
-                    recorder.record(root, child, f"{node.name}: evaluar hijo {child.name} -> {v}")
-                if v > value:
-                    value = v
-                    if recorder:
-                        recorder.record(root, node, f"{node.name}: nuevo mejor valor (max) = {value}")
-                alpha = max(alpha, value)
-                if alpha_beta and beta <= alpha:
-                    if recorder:
-                        recorder.record(root, node, f"{node.name}: poda beta (alpha={alpha} >= beta={beta})")
-                    break
-            node.value = value
+        if remaining <= 0:
+            value = evaluate(view(node)) if evaluate else None
+            if value is None:
+                raise ValueError(f"Nodo {node.name} en el límite de profundidad sin 'evaluate'.")
+            if lazy:
+                node.value = value
+            return color * _leaf(node, value, f"{node.name}: límite de profundidad, evaluación = {value}")
+
+        alpha0, beta0 = alpha, beta
+        best = -1
+        if table is not None:
+            k = key(view(node))
+            if stats:
+                stats.tt_probes += 1
+            entry = table.probe(k)
+            if entry is not None:
+                if stats:
+                    stats.tt_hits += 1
+                _, t_value, t_depth, t_flag, best = entry
+                if t_depth >= remaining:
+                    t_value, t_flag = color * t_value, t_flag if maximizing else _flip(t_flag)
+                    if t_flag == EXACT:
+                        hit = True
+                    elif t_flag == LOWER:
+                        alpha = max(alpha, t_value)
+                        hit = alpha >= beta
+                    else:
+                        beta = min(beta, t_value)
+                        hit = alpha >= beta
+                    if hit:
+                        if stats:
+                            stats.tt_cutoffs += 1
+                        if t_flag == EXACT:
+                            node.value = color * t_value + 0.0
+                        if recorder:
+                            recorder.record(root_pos, node, f"{node.name}: valor {color * t_value + 0.0} desde la tabla de transposición", EVENT_SET)
+                        return t_value
+
+        value = -INF
+        searched = False
+        for i, child in _children(node, maximizing, ply, best):
+            if pvs and searched:
+                # ventana nula: solo se pregunta si el hijo mejora a alpha
+                score = -_negamax(child, -color, -math.nextafter(alpha, INF), -alpha, remaining - 1, ply + 1)
+                if alpha < score < beta:
+                    score = -_negamax(child, -color, -beta, -score, remaining - 1, ply + 1)
+            else:
+                score = -_negamax(child, -color, -beta, -alpha, remaining - 1, ply + 1)
+            searched = True
             if recorder:
-                recorder.record(root, node, f"{node.name} fijado a {node.value} (max)")
-            return value
-        else:
-            value = INF
-            for child in node.children:
-                v = _minimax(child, True, alpha, beta)
+                recorder.record(root_pos, child, f"{node.name}: evaluar hijo {child.name} -> {color * score + 0.0}", EVENT_CHILD)
+            if score > value:
+                value = score
+                best = i
                 if recorder:
-                    recorder.record(root, child, f"{node.name}: evaluar hijo {child.name} -> {v}")
-                if v < value:
-                    value = v
-                    if recorder:
-                        recorder.record(root, node, f"{node.name}: nuevo mejor valor (min) = {value}")
-                beta = min(beta, value)
-                if alpha_beta and beta <= alpha:
-                    if recorder:
-                        recorder.record(root, node, f"{node.name}: poda alpha (beta={beta} <= alpha={alpha})")
-                    break
-            node.value = value
-            if recorder:
-                recorder.record(root, node, f"{node.name} fijado a {node.value} (min)")
-            return value
+                    recorder.record(root_pos, node, f"{node.name}: nuevo mejor valor ({'max' if maximizing else 'min'}) = {color * value + 0.0}", EVENT_BEST)
+            alpha = max(alpha, value)
+            if prune and beta <= alpha:
+                if stats:
+                    stats.cutoffs += 1
+                if on_cutoff:
+                    on_cutoff(view(node), i, view(child), ply, remaining)
+                if recorder:
+                    if maximizing:
+                        description = f"{node.name}: poda beta (alpha={alpha + 0.0} >= beta={beta + 0.0})"
+                    else:
+                        description = f"{node.name}: poda alpha (beta={-alpha + 0.0} <= alpha={-beta + 0.0})"
+                    recorder.record(root_pos, node, description, EVENT_PRUNE)
+                break
+
+        if not searched:
+            # estado terminal de la búsqueda perezosa (children() no dio hijos)
+            node.value = evaluate(node.state)
+            return color * _leaf(node, node.value, f"Hoja {node.name} con valor {node.value}")
+
+        node.value = color * value + 0.0
+        if recorder:
+            recorder.record(root_pos, node, f"{node.name} fijado a {node.value} ({'max' if maximizing else 'min'})", EVENT_SET)
 
-    return _minimax(root, maximizing_player, -INF, INF)
+        if table is not None:
+            if value <= alpha0:
+                flag = UPPER
+            elif value >= beta0:
+                flag = LOWER
+            else:
+                flag = EXACT
+            table.store(k, node.value, remaining, flag if maximizing else _flip(flag), best)
+        return value
+
+    color = 1 if maximizing_player else -1
+    remaining = _UNLIMITED if depth is None else depth
+    if algorithm == "mtdf":
+        # MTD(f): cada pasada con ventana nula (beta - ε, beta) dice si el valor
+        # es >= beta; las cotas se acercan hasta coincidir. La tabla evita
+        # repetir el trabajo de las pasadas anteriores.
+        g, lower, upper = color * guess, -INF, INF
+        while lower < upper:
+            beta = g if g > lower else math.nextafter(lower, INF)
+            g = _negamax(root_pos, color, math.nextafter(beta, -INF), beta, remaining, 0)
+            if g < beta:
+                upper = g
+            else:
+                lower = g
+    else:
+        g = _negamax(root_pos, color, -INF, INF, remaining, 0)
+    result = root_pos.value = color * g + 0.0
+    if lazy and recorder:
+        recorder.root = root_pos
+    return result
+
+
+def iterative_deepening(root: Node, max_depth: int, maximizing_player: bool = True,
+                        evaluate: Optional[Callable[[Node], float]] = None,
+                        table: Optional[TranspositionTable] = None, **kwargs) -> List[float]:
+    """
+    Profundización iterativa: ejecuta minimax con depth = 1, 2, ..., max_depth
+    reutilizando la misma tabla de transposición, de modo que la mejor jugada
+    de cada iteración se prueba primero en la siguiente (con MTD(f), además,
+    el valor de cada iteración es el 'guess' de la siguiente).
+    Devuelve la lista de valores de la raíz por profundidad.
+    """
+    table = table if table is not None else TranspositionTable()
+    kwargs.setdefault("alpha_beta", True)
+    values: List[float] = []
+    for d in range(1, max_depth + 1):
+        if kwargs.get("algorithm") == "mtdf" and values:
+            kwargs["guess"] = values[-1]
+        values.append(minimax(root, maximizing_player, depth=d, evaluate=evaluate, table=table, **kwargs))
+    return values
+
+
+def order_tree(root: Node, maximizing_player: bool = True, best_first: bool = True) -> Node:
+    """
+    Reordena (in situ) los hijos de cada nodo por su valor minimax exacto:
+    la mejor jugada primero para quien mueve (orden perfecto, el mejor caso
+    de la poda) o la peor primero (orden adversario, el peor caso).
+    """
+    minimax(root, maximizing_player)
+    stack = [(root, maximizing_player)]
+    while stack:
+        n, maximizing = stack.pop()
+        n.children.sort(key=lambda c: c.value, reverse=(maximizing == best_first))
+        stack.extend((c, not maximizing) for c in n.children)
+    return root
+
+
+def benchmark(depth: int = 7, branching: int = 4, leaf_range=(0, 99), seed: int = 0):
+    """Hojas evaluadas y tiempo de cada algoritmo en árboles aleatorios, ordenados y adversarios."""
+    print(f"Árbol completo depth={depth}, branching={branching} ({branching ** depth} hojas)")
+    print(f"  {'árbol':<11} {'algoritmo':<10} {'valor':>6} {'hojas':>7} {'nodos':>7} {'tiempo (s)':>11}")
+    for kind in ("aleatorio", "ordenado", "adversario"):
+        random.seed(seed)
+        root = build_random_full_tree(depth, branching, leaf_range)
+        if kind != "aleatorio":
+            order_tree(root, True, best_first=(kind == "ordenado"))
+        for algorithm in ALGORITHMS:
+            stats = SearchStats()
+            t0 = time.perf_counter()
+            value = minimax(root, True, algorithm=algorithm, stats=stats,
+                            table=TranspositionTable(1 << 18) if algorithm == "mtdf" else None)
+            t1 = time.perf_counter()
+            print(f"  {kind:<11} {algorithm:<10} {value:>6} {stats.leaves:>7} {stats.nodes:>7} {t1 - t0:>11.3f}")
 
 # -------------------------
 # Visualización con networkx + matplotlib
 # -------------------------
-def tree_to_networkx(root: Node) -> nx.DiGraph:
+def tree_to_networkx(root: Node) -> "nx.DiGraph":
+    import networkx as nx
     G = nx.DiGraph()
     def _add(n: Node):
         label = f"{n.name}\n{'' if n.value is None else n.value}"
@@ -202,73 +698,292 @@ def hierarchy_pos(G, root, width=1., vert_gap=0.2, vert_loc=0, xcenter=0.5, pos=
                                 vert_loc=vert_loc-vert_gap, xcenter=nextx, pos=pos, parent=root)
     return pos
 
+_COLOR_HIGHLIGHT, _COLOR_LEAF, _COLOR_INTERNAL = "#ff6666", "#cccccc", "#88c0ff"
+
+
+class SnapshotRenderer:
+    """
+    Dibuja los snapshots de un StepRecorder reutilizando una sola figura.
+
+    El grafo, la disposición (hierarchy_pos), las aristas y un círculo y un
+    texto por nodo se crean una vez. Cada cuadro solo cambia el color/tamaño
+    del nodo resaltado, las etiquetas cuyo valor cambió y el título.
+
+    Con blit=True (por defecto) tampoco se redibuja la figura completa: cada
+    nodo está recortado a su celda de la disposición (franjas entre vecinos
+    del mismo nivel), así que basta con restaurar el fondo (las aristas) en
+    las celdas que cambiaron y volver a pintar solo esos nodos y el título.
+    Sin 'fig' se usa una Figure con lienzo Agg (sin pyplot), que sirve en
+    procesos sin pantalla.
+    """
+    def __init__(self, root: Node, figsize=(10, 6), dpi: int = 100, fig=None, blit: bool = True):
+        import networkx as nx
+        from matplotlib.transforms import Bbox
+        if fig is None:
+            from matplotlib.backends.backend_agg import FigureCanvasAgg
+            from matplotlib.figure import Figure
+            fig = Figure(figsize=figsize, dpi=dpi)
+            FigureCanvasAgg(fig)
+        self.fig = fig
+        G = tree_to_networkx(root)
+        pos = hierarchy_pos(G, root.name, width=1.0, vert_gap=0.15, vert_loc=0.9, xcenter=0.5)
+        self.names = list(G.nodes)
+        self._index = {n: i for i, n in enumerate(self.names)}
+        leaf = [G.nodes[n]["node_obj"].is_leaf() for n in self.names]
+        self._colors = [_COLOR_LEAF if l else _COLOR_INTERNAL for l in leaf]
+        self._sizes = [700 if l else 900 for l in leaf]
+
+        ax = self.ax = fig.add_axes([0.0, 0.0, 1.0, 0.93])
+        ax.axis("off")
+        nx.draw_networkx_edges(G, pos, ax=ax, arrows=False)
+        self.circles, self.labels = [], []
+        for n, color, size in zip(self.names, self._colors, self._sizes):
+            x, y = pos[n]
+            self.circles.append(ax.scatter([x], [y], s=size, c=color, zorder=2))
+            self.labels.append(ax.text(x, y, n, ha="center", va="center", fontsize=10,
+                                       fontweight="bold", zorder=3))
+        self.title = ax.set_title("", fontsize=10)
+        ax.margins(0.05)
+        ax.autoscale_view()
+
+        self.blit = blit and hasattr(fig.canvas, "copy_from_bbox")
+        if self.blit:
+            # celdas en píxeles: entre los puntos medios con los vecinos del nivel
+            to_px = ax.transData.transform
+            (x_lo, y_lo), (x_hi, y_hi) = to_px([(ax.get_xlim()[0], ax.get_ylim()[0]),
+                                               (ax.get_xlim()[1], ax.get_ylim()[1])])
+            px = {n: to_px(pos[n]) for n in self.names}
+            levels: Dict[float, List[str]] = {}
+            for n in self.names:
+                levels.setdefault(round(pos[n][1], 9), []).append(n)
+            ys = sorted(px[level[0]][1] for level in levels.values())
+            self._cells = [None] * len(self.names)
+            for level in levels.values():
+                level.sort(key=lambda n: px[n][0])
+                y = px[level[0]][1]
+                j = ys.index(y)
+                bottom = (ys[j - 1] + y) / 2 if j > 0 else y_lo
+                top = (ys[j + 1] + y) / 2 if j + 1 < len(ys) else y_hi
+                for k, n in enumerate(level):
+                    left = (px[level[k - 1]][0] + px[n][0]) / 2 if k > 0 else x_lo
+                    right = (px[level[k + 1]][0] + px[n][0]) / 2 if k + 1 < len(level) else x_hi
+                    cell = Bbox.from_extents(round(left), round(bottom), round(right), round(top))
+                    # el suavizado puede pasar medio píxel del recorte: un píxel
+                    # de margen deja todo lo que pinta el nodo dentro de su celda
+                    clip = Bbox.from_extents(cell.x0 + 1, cell.y0 + 1, cell.x1 - 1, cell.y1 - 1)
+                    i = self._index[n]
+                    self._cells[i] = cell
+                    self.circles[i].set_clip_box(clip)
+                    self.labels[i].set_clip_box(clip)
+                    self.labels[i].set_clip_on(True)
+            width, height = fig.canvas.get_width_height()
+            self._title_band = Bbox.from_extents(0, round(y_hi), width, height)
+            # fondo: solo aristas (sin nodos ni título)
+            dynamic = self.circles + self.labels + [self.title]
+            for a in dynamic:
+                a.set_visible(False)
+            fig.canvas.draw()
+            self._background = fig.canvas.copy_from_bbox(fig.bbox)
+            for a in dynamic:
+                a.set_visible(True)
+            fig.canvas.draw()
+        self._shown: List[Any] = [None] * len(self.names)
+        self._highlight: Optional[int] = None
+
+    def draw(self, snapshot: Dict, step_index: int):
+        """Actualiza los artistas con 'snapshot' (y el lienzo si blit=True)."""
+        state = snapshot["state"]
+        dirty = set()
+        for i, n in enumerate(self.names):
+            val = state.get(n)
+            if self._shown[i] != val:
+                self._shown[i] = val
+                self.labels[i].set_text(f"{n}\n{'' if val is None else val}")
+                dirty.add(i)
+        highlight = self._index.get(snapshot.get("highlight"))
+        if highlight != self._highlight:
+            for i in (self._highlight, highlight):
+                if i is not None:
+                    on = i == highlight
+                    self.circles[i].set_facecolor(_COLOR_HIGHLIGHT if on else self._colors[i])
+                    self.circles[i].set_sizes([900 if on else self._sizes[i]])
+                    dirty.add(i)
+            self._highlight = highlight
+        self.title.set_text(f"Paso {step_index}: {snapshot.get('description', '')}")
+        if self.blit:
+            canvas = self.fig.canvas
+            height = canvas.get_width_height()[1]
+            for i in list(dirty) + [None]:
+                # restore_region cuenta las filas desde arriba e incluye ambos bordes
+                x0, y0, x1, y1 = (self._title_band if i is None else self._cells[i]).extents
+                canvas.restore_region(self._background, bbox=(x0, height - y1, x1 - 1, height - y0 - 1), xy=(0, 0))
+                if i is None:
+                    self.ax.draw_artist(self.title)
+                else:
+                    self.ax.draw_artist(self.circles[i])
+                    self.ax.draw_artist(self.labels[i])
+
+    def image(self):
+        """El cuadro actual como imagen PIL (RGBA)."""
+        from PIL import Image
+        return Image.frombuffer("RGBA", self.fig.canvas.get_width_height(), self.frame(), "raw", "RGBA", 0, 1)
+
+    def paletted_image(self):
+        """El cuadro actual con paleta de 256 colores (octree rápido): el gráfico
+        tiene pocos colores y así el PNG/GIF se codifica ~2-3 veces más rápido."""
+        return self.image().convert("RGB").quantize(method=2)
+
+    def save(self, filename: str):
+        self.paletted_image().save(filename, compress_level=1)
+
+    def frame(self):
+        """Buffer RGBA del cuadro actual (memoryview del lienzo; se sobrescribe en el próximo draw)."""
+        if not self.blit:
+            self.fig.canvas.draw()
+        return self.fig.canvas.buffer_rgba()
+
+    def stream(self, snapshots: Iterable[Dict], writer, start: int = 1):
+        """
+        Dibuja cada snapshot y lo encola en 'writer' (EscritorFrames de
+        006_Visualizacion), que lo codifica en segundo plano. El tiempo de
+        dibujo se suma a writer.stats.render_s. Devuelve las estadísticas.
+        """
+        try:
+            for i, snap in enumerate(snapshots, start=start):
+                t0 = time.perf_counter()
+                self.draw(snap, i)
+                buffer = self.frame()
+                writer.stats.render_s += time.perf_counter() - t0
+                writer.escribir(buffer)
+        finally:
+            stats = writer.cerrar()
+        return stats
+
+    def render(self, snapshots: Iterable[Dict], out_dir: str, start: int = 1,
+               queue_size: int = 16, policy: str = "bloquear", threads: int = 2) -> List[str]:
+        """
+        Guarda un PNG por snapshot (step_001.png, ...) y devuelve los nombres.
+        Los PNG se codifican en 'threads' hilos mientras se dibuja el siguiente
+        paso (queue_size y policy: ver 006_Visualizacion/001_Escritor_Frames.py).
+        """
+        writer = _frames().EscritorFrames(out_dir, self.fig.canvas.get_width_height(), tam_cola=queue_size,
+                                          politica=policy, hilos=threads, inicio=start)
+        self.stats = self.stream(snapshots, writer, start=start)
+        return writer.archivos
+
+    def write_video(self, snapshots: Iterable[Dict], filename: str, fps: float = 2.0,
+                    queue_size: int = 16, policy: str = "bloquear"):
+        """
+        Escribe los snapshots directamente como video, sin PNG intermedios:
+        .gif con Pillow, cualquier otra extensión (.mp4, ...) pasando los
+        cuadros RGBA crudos a ffmpeg por una tubería. Sin ffmpeg se guardan
+        PNG en el directorio con el mismo nombre. Devuelve el EscritorFrames
+        (formato, destino y stats).
+        """
+        writer = _frames().EscritorFrames(filename, self.fig.canvas.get_width_height(), fps=fps,
+                                          tam_cola=queue_size, politica=policy)
+        self.stats = self.stream(snapshots, writer)
+        return writer
+
+
+def _frames():
+    """Módulo 006_Visualizacion/001_Escritor_Frames.py (se carga una sola vez)."""
+    return cargar("escritor_frames")
+
+
+def _render_chunk(args):
+    root, recorder, out_dir, start, stop, figsize, dpi, queue_size, policy = args
+    renderer = SnapshotRenderer(root, figsize=figsize, dpi=dpi)
+    files = renderer.render(recorder.iter_snapshots(start, stop), out_dir, start=start + 1,
+                            queue_size=queue_size, policy=policy)
+    return files, renderer.stats
+
+
+def render_steps(root: Node, recorder: StepRecorder, out_dir: str = "minimax_steps", processes: int = 1,
+                 figsize=(10, 6), dpi: int = 100, queue_size: int = 16, policy: str = "bloquear"):
+    """
+    Guarda un PNG por paso. Con processes > 1 los pasos se reparten en tramos
+    contiguos entre procesos; cada uno arma su propio SnapshotRenderer y
+    reconstruye los snapshots de su tramo desde el checkpoint más cercano.
+    Devuelve (archivos, estadísticas sumadas de los escritores).
+    """
+    total = len(recorder.snapshots)
+    if processes <= 1 or total < 2 * processes:
+        return _render_chunk((root, recorder, out_dir, 0, total, figsize, dpi, queue_size, policy))
+    size = -(-total // processes)
+    chunks = [(root, recorder, out_dir, a, min(a + size, total), figsize, dpi, queue_size, policy)
+              for a in range(0, total, size)]
+    with crear_pool(processes) as pool:
+        results = pool.map(_render_chunk, chunks)
+    stats = _frames().EstadisticasEscritor()
+    for _, s in results:
+        stats.sumar(s)
+    return [f for files, _ in results for f in files], stats
+
+
 def plot_snapshot(root: Node, snapshot: Dict, step_index: int, out_dir: str):
-    G = tree_to_networkx(root)
-    pos = hierarchy_pos(G, root.name, width=1.0, vert_gap=0.15, vert_loc=0.9, xcenter=0.5)
-
-    labels = {}
-    node_colors = []
-    node_sizes = []
-    highlight = snapshot.get("highlight")
-
-    # Map node values from snapshot
-    state = snapshot["state"]
-
-    for n in G.nodes:
-        val = state.get(n, None)
-        label = f"{n}\n{'' if val is None else val}"
-        labels[n] = label
-        node_obj = G.nodes[n].get("node_obj")
-        # color logic: highlight node in red, leaves grey, internal blue
-        if n == highlight:
-            node_colors.append("#ff6666")
-            node_sizes.append(900)
-        elif (node_obj and node_obj.is_leaf()):
-            node_colors.append("#cccccc")
-            node_sizes.append(700)
-        else:
-            node_colors.append("#88c0ff")
-            node_sizes.append(900)
-
-    plt.figure(figsize=(10, 6))
-    nx.draw(G, pos, labels=labels, with_labels=True,
-            node_color=node_colors, node_size=node_sizes,
-            font_size=10, font_weight='bold', arrows=False)
-    # add step description
-    desc = snapshot.get("description", "")
-    plt.title(f"Paso {step_index}: {desc}", fontsize=10)
-    plt.axis('off')
+    """Guarda un solo paso (para muchos pasos use SnapshotRenderer o render_steps)."""
     os.makedirs(out_dir, exist_ok=True)
+    renderer = SnapshotRenderer(root, blit=False)
+    renderer.draw(snapshot, step_index)
     filename = os.path.join(out_dir, f"step_{step_index:03d}.png")
-    plt.savefig(filename, bbox_inches='tight')
-    plt.close()
+    renderer.save(filename)
     return filename
 
-def play_snapshots(root: Node, recorder: StepRecorder, delay: float = 1.0, out_dir="minimax_steps"):
+
+def play_snapshots(root: Node, recorder: StepRecorder, delay: float = 1.0, out_dir="minimax_steps",
+                   video: Optional[str] = None, processes: int = 1, headless: Optional[bool] = None,
+                   queue_size: int = 16, policy: str = "bloquear"):
     """
-    Dibuja/guarda cada snapshot y muestra en ventana secuencialmente.
+    Guarda cada snapshot (un PNG por paso en out_dir, o un solo video si se
+    da 'video', p. ej. "minimax.mp4" o "minimax.gif") y, si hay pantalla,
+    los muestra en secuencia en una misma figura.
+
+    Los cuadros se encolan (queue_size cuadros como máximo) y se codifican en
+    segundo plano; con policy="descartar" el dibujo nunca espera al
+    codificador y los cuadros que no entran se descartan. headless=True no
+    abre ventanas ni espera 'delay'; None lo detecta (sin DISPLAY, MPLBACKEND=Agg).
     """
-    files = []
-    for i, snap in enumerate(recorder.snapshots, start=1):
-        fname = plot_snapshot(root, snap, i, out_dir)
-        files.append(fname)
-        # Mostrar en pantalla si hay display disponible
-        try:
-            img = plt.imread(fname)
-            plt.figure(figsize=(10, 6))
-            plt.imshow(img)
-            plt.axis('off')
+    frames = _frames()
+    if headless is None:
+        headless = frames.sin_pantalla()
+    t0 = time.perf_counter()
+    if video:
+        writer = SnapshotRenderer(root).write_video(recorder.snapshots, video, fps=1.0 / delay if delay > 0 else 2.0,
+                                                    queue_size=queue_size, policy=policy)
+        stats, where = writer.stats, f"'{writer.destino}' ({writer.formato})"
+    else:
+        files, stats = render_steps(root, recorder, out_dir, processes=processes,
+                                    queue_size=queue_size, policy=policy)
+        where = f"'{out_dir}/' (png)"
+    print(f"Se escribieron {stats.cuadros} cuadros en {where} en {time.perf_counter() - t0:.2f} s: "
+          f"dibujo {stats.render_s:.2f} s, espera de cola {stats.espera_s:.2f} s, "
+          f"codificación {stats.codificacion_s:.2f} s, descartados {stats.descartados}.")
+
+    if headless:
+        return
+    import matplotlib.pyplot as plt
+    fig = plt.figure(figsize=(10, 6))
+    # lienzos no interactivos (Agg): no hay nada que mostrar
+    if getattr(fig.canvas, "required_interactive_framework", None):
+        renderer = SnapshotRenderer(root, fig=fig, blit=False)
+        for i, snap in enumerate(recorder.snapshots, start=1):
+            renderer.draw(snap, i)
             plt.pause(delay)
-            plt.close()
-        except Exception:
-            # si no es posible mostrar (p. ej. headless), solo seguimos
-            pass
-    print(f"Se guardaron {len(files)} imágenes en '{out_dir}/' (una por paso).")
+    plt.close(fig)
 
 # -------------------------
 # Ejemplo de uso
 # -------------------------
 if __name__ == "__main__":
+    if "--benchmark" in sys.argv:
+        benchmark()
+        sys.exit(0)
+    # --headless: solo escribir los cuadros, sin ventanas ni pausas
+    headless = True if "--headless" in sys.argv else None
+    if headless:
+        _frames().usar_sin_pantalla()
+
     # Ejemplo: podemos definir un árbol manualmente o generar uno aleatorio.
 
     # 1) Árbol definido manualmente (listas anidadas):
@@ -298,11 +1013,34 @@ if __name__ == "__main__":
 
     # Guardar y mostrar gráficos paso a paso
     print("\nGenerando imágenes por paso y mostrando...")
-    play_snapshots(root, recorder, delay=0.8, out_dir="minimax_steps_manual")
+    play_snapshots(root, recorder, delay=0.8, out_dir="minimax_steps_manual", headless=headless)
 
     # También puede probar con poda alfa-beta:
     # recorder2 = StepRecorder()
     # minimax(root, maximizing_player=True, recorder=recorder2, alpha_beta=True)
     # play_snapshots(root, recorder2, delay=0.8, out_dir="minimax_steps_ab")
 
+    # Alfa-beta con tabla de transposición, ordenamiento y estadísticas:
+    stats = SearchStats()
+    valor_ab = minimax(root, maximizing_player=True, alpha_beta=True,
+                       table=TranspositionTable(), order=HistoryHeuristic(), stats=stats)
+    print(f"\nAlfa-beta = {valor_ab}; {stats}; podado {stats.pruned_fraction(root):.0%} del árbol")
+    # Búsqueda perezosa: el árbol no se construye, se genera con children(estado).
+    # Juego de ejemplo: se quitan 1-3 fichas de un montón; pierde quien no puede mover.
+    def nim_children(state):
+        fichas, turno_max = state
+        for k in (1, 2, 3):
+            if k <= fichas:
+                yield (fichas - k, not turno_max)
+
+    def nim_evaluate(state):
+        fichas, turno_max = state
+        if fichas == 0:
+            return -1.0 if turno_max else 1.0
+        return 0.0  # límite de profundidad: posición desconocida
+
+    stats = SearchStats()
+    valor_nim = minimax((21, True), True, alpha_beta=True, children=nim_children, evaluate=nim_evaluate,
+                        depth=30, table=TranspositionTable(), stats=stats)
+    print(f"Nim con 21 fichas (perezoso) = {valor_nim}; {stats}")
     print("\nProceso terminado. Revise la carpeta 'minimax_steps_manual/' para ver las capturas.")
\ No newline at end of file
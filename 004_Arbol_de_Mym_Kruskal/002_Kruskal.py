@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+002_Kruskal.py
+
+Algoritmo de Kruskal para árbol de expansión mínima (MST) sobre listas de aristas.
+
+Características:
+- Ordena las aristas de forma vectorizada con numpy.argsort sobre el arreglo de pesos.
+- Conjuntos disjuntos (union-find) sobre arreglos, con compresión por mitades
+  (path halving) y unión por rango.
+- Termina en cuanto el árbol tiene V-1 aristas.
+- Acepta el mismo grafo de networkx que prim_steps o tres arreglos (u, v, w).
+
+Requisitos:
+- numpy (networkx solo para la entrada como grafo y el benchmark)
+
+Uso:
+  python 002_Kruskal.py               -> ejemplo pequeño
+  python 002_Kruskal.py --benchmark   -> comparación con Prim en varias densidades
+"""
+import os
+import sys
+import time
+from typing import Any, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from ia3 import cargar  # noqa: E402
+
+
+# -------------------------
+# Conjuntos disjuntos
+# -------------------------
+class UnionFind:
+    """
+    Union-find sobre arreglos: 'padre' y 'rango' indexados por vértice.
+    find usa path halving (cada nodo apunta a su abuelo mientras se sube).
+    """
+    def __init__(self, n: int):
+        self.padre = list(range(n))
+        self.rango = [0] * n
+        self.componentes = n
+
+    def find(self, x: int) -> int:
+        padre = self.padre
+        while padre[x] != x:
+            padre[x] = padre[padre[x]]
+            x = padre[x]
+        return x
+
+    def union(self, a: int, b: int) -> bool:
+        """Une los conjuntos de a y b. Devuelve False si ya estaban unidos."""
+        ra, rb = self.find(a), self.find(b)
+        if ra == rb:
+            return False
+        rango = self.rango
+        if rango[ra] < rango[rb]:
+            ra, rb = rb, ra
+        self.padre[rb] = ra
+        if rango[ra] == rango[rb]:
+            rango[ra] += 1
+        self.componentes -= 1
+        return True
+
+
+# -------------------------
+# Kruskal
+# -------------------------
+def kruskal_aristas(n: int, origenes, destinos, pesos) -> List[Tuple[int, int, Any]]:
+    """
+    Kruskal sobre arreglos de aristas con vértices 0..n-1.
+    Devuelve la lista de aristas (u, v, w) del árbol (o bosque si el grafo
+    no es conexo), en orden creciente de peso.
+    """
+    w = np.asarray(pesos)
+    orden = np.argsort(w, kind="stable")
+    # Se pasan a listas de Python: el bucle de union-find es escalar y
+    # el acceso a listas es más rápido que indexar arreglos de numpy.
+    us = np.asarray(origenes)[orden].tolist()
+    vs = np.asarray(destinos)[orden].tolist()
+    ws = w[orden].tolist()
+
+    union = UnionFind(n).union
+    objetivo = n - 1
+    mst = []
+    if objetivo <= 0:
+        return mst
+    for u, v, peso in zip(us, vs, ws):
+        if not union(u, v):
+            continue
+        mst.append((u, v, peso))
+        # terminación temprana: ya hay V-1 aristas
+        if len(mst) == objetivo:
+            break
+    return mst
+
+
+def kruskal_mst(grafo=None, n: Optional[int] = None, origenes=None, destinos=None, pesos=None,
+                weight: str = "weight") -> List[Tuple[Any, Any, Any]]:
+    """
+    Árbol de expansión mínima con Kruskal.
+
+    Entrada (una de las dos):
+      - grafo: nx.Graph con atributo 'weight' (el mismo que usa prim_steps).
+      - n, origenes, destinos, pesos: arreglos de aristas con vértices 0..n-1.
+
+    Devuelve la lista de aristas (u, v, w) del MST con las etiquetas originales.
+    """
+    if grafo is not None:
+        nodos = list(grafo.nodes())
+        idx = {nodo: i for i, nodo in enumerate(nodos)}
+        origenes, destinos, pesos = [], [], []
+        for u, v, w in grafo.edges(data=weight, default=1):
+            origenes.append(idx[u])
+            destinos.append(idx[v])
+            pesos.append(w)
+        mst = kruskal_aristas(len(nodos), origenes, destinos, pesos)
+        return [(nodos[u], nodos[v], w) for u, v, w in mst]
+    if n is None or origenes is None or destinos is None or pesos is None:
+        raise ValueError("Use 'grafo' o bien 'n', 'origenes', 'destinos' y 'pesos'.")
+    return kruskal_aristas(n, origenes, destinos, pesos)
+
+
+# -------------------------
+# Benchmark contra Prim
+# -------------------------
+def benchmark(n: int = 20_000, densidades: Sequence[float] = (2, 8, 32, 128), seed: int = 0):
+    """
+    Compara Kruskal con prim_mst (003_Arbol_m_Prim/002_Prim_CSR.py) para
+    grafos con grado medio creciente (m = n * densidad / 2).
+    """
+    prim = cargar("prim_csr")
+    generador = cargar("generador_grafos")
+
+    print(f"Benchmark Kruskal vs Prim (n={n})")
+    print(f"  {'grado medio':>11} {'m':>10} {'Kruskal (s)':>12} {'Prim (s)':>10} {'peso igual':>11}")
+    for grado in densidades:
+        m = min(int(n * grado / 2), n * (n - 1) // 2)
+        g = generador.gnm(n, m, seed, weight_range=(1, 1000), conexo=True)
+        o, d, w = g.u, g.v, g.w
+        origenes, destinos, pesos = o.tolist(), d.tolist(), w.tolist()
+
+        t0 = time.perf_counter()
+        mst_k = kruskal_mst(n=n, origenes=o, destinos=d, pesos=w)
+        t1 = time.perf_counter()
+        csr = prim.aristas_a_csr(n, origenes, destinos, pesos)
+        t2 = time.perf_counter()
+        mst_p = prim.prim_mst(csr, start=0)
+        t3 = time.perf_counter()
+
+        igual = sum(x[2] for x in mst_k) == sum(x[2] for x in mst_p)
+        print(f"  {grado:>11} {m:>10} {t1 - t0:>12.3f} {t3 - t2:>10.3f} {str(igual):>11}")
+
+
+def ejemplo():
+    # Grafo pequeño como arreglos de aristas (u, v, w)
+    origenes = [0, 0, 1, 1, 2, 2, 3, 4]
+    destinos = [1, 2, 2, 3, 3, 4, 4, 5]
+    pesos = [4, 3, 1, 2, 4, 5, 7, 6]
+    mst = kruskal_mst(n=6, origenes=origenes, destinos=destinos, pesos=pesos)
+    print("Aristas del MST (Kruskal):")
+    for u, v, w in mst:
+        print(f"  ({u}, {v}) peso={w}")
+    print(f"Peso total = {sum(w for _, _, w in mst)}")
+
+
+if __name__ == "__main__":
+    if "--benchmark" in sys.argv:
+        benchmark()
+    else:
+        ejemplo()
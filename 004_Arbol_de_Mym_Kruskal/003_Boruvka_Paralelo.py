@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+003_Boruvka_Paralelo.py
+
+Algoritmo de Borůvka para árbol de expansión mínima (MST) en paralelo.
+
+En cada ronda:
+  1. Cada proceso revisa su bloque de aristas (en memoria compartida) y
+     encuentra la arista más barata que sale de cada componente.
+  2. El proceso principal combina los candidatos de todos los bloques y
+     contrae las componentes con union-find.
+Las aristas internas a una componente se descartan en cada ronda, así que
+el trabajo por ronda disminuye a medida que las componentes se unen.
+
+Los empates de peso se rompen por el índice original de la arista, lo que
+garantiza que nunca se forman ciclos.
+
+Requisitos:
+- numpy
+
+Uso:
+  python 003_Boruvka_Paralelo.py               -> ejemplo pequeño
+  python 003_Boruvka_Paralelo.py --benchmark   -> tiempos para 1..N procesos
+"""
+import os
+import sys
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from ia3 import cargar, crear_pool  # noqa: E402
+from ia3.compartido import ArreglosCompartidos, arreglos_trabajador, cerrar_trabajador, iniciar_trabajador  # noqa: E402
+
+# union-find de 002_Kruskal.py (path halving y unión por rango)
+UnionFind = cargar("kruskal").UnionFind
+
+
+# -------------------------
+# Trabajo por bloque de aristas
+# -------------------------
+def _buscar_en_bloque(args):
+    """
+    Revisa el bloque [inicio, inicio + cuantas) de aristas activas:
+    compacta al frente del bloque las que siguen uniendo componentes
+    distintas y devuelve, para cada componente, su arista más barata.
+
+    Las aristas están ordenadas por (peso, índice) y 'eid' es su rango en
+    ese orden, así que "la más barata" es la de menor 'eid' y el mínimo por
+    componente se calcula en O(m) con np.minimum.at, sin ordenar.
+    """
+    inicio, cuantas = args
+    a = arreglos_trabajador()
+    fin = inicio + cuantas
+    u, v, w, eid = a["u"][inicio:fin], a["v"][inicio:fin], a["w"][inicio:fin], a["eid"][inicio:fin]
+    comp = a["comp"]
+    cu, cv = comp[u], comp[v]
+    vivas = cu != cv
+    quedan = int(np.count_nonzero(vivas))
+    if quedan < cuantas:
+        # compactación local del bloque (cada proceso es dueño de su bloque)
+        for arr in (u, v, w, eid):
+            arr[:quedan] = arr[vivas]
+        cu, cv = cu[vivas], cv[vivas]
+        u, v, w, eid = u[:quedan], v[:quedan], w[:quedan], eid[:quedan]
+
+    # cada arista es candidata para las dos componentes que toca
+    sin_arista = len(a["eid"])
+    mejor = np.full(len(comp), sin_arista, dtype=np.int64)
+    np.minimum.at(mejor, cu, eid)
+    np.minimum.at(mejor, cv, eid)
+    tocadas = np.flatnonzero(mejor < sin_arista)
+    sel = np.flatnonzero((mejor[cu] == eid) | (mejor[cv] == eid))
+    return quedan, (tocadas, mejor[tocadas], eid[sel], u[sel], v[sel], w[sel])
+
+
+# -------------------------
+# Borůvka
+# -------------------------
+def boruvka_mst(grafo=None, n: Optional[int] = None, origenes=None, destinos=None, pesos=None,
+                procesos: Optional[int] = None, weight: str = "weight"
+                ) -> Tuple[List[Tuple[Any, Any, Any]], List[Dict[str, float]]]:
+    """
+    MST con Borůvka en paralelo.
+
+    Entrada: un nx.Graph (como el de prim_steps) o arreglos (u, v, w) con
+    vértices 0..n-1. 'procesos' es el tamaño del pool (1 = sin pool).
+
+    Devuelve (aristas, rondas):
+      - aristas: lista (u, v, w) del MST (bosque si el grafo no es conexo)
+      - rondas: por ronda, componentes, aristas activas y tiempos en segundos
+    """
+    nodos = None
+    if grafo is not None:
+        nodos = list(grafo.nodes())
+        idx = {nodo: i for i, nodo in enumerate(nodos)}
+        origenes, destinos, pesos = [], [], []
+        for a, b, p in grafo.edges(data=weight, default=1):
+            origenes.append(idx[a])
+            destinos.append(idx[b])
+            pesos.append(p)
+        n = len(nodos)
+    elif n is None or origenes is None or destinos is None or pesos is None:
+        raise ValueError("Use 'grafo' o bien 'n', 'origenes', 'destinos' y 'pesos'.")
+
+    procesos = procesos or os.cpu_count() or 1
+    m = len(origenes)
+    compartido = ArreglosCompartidos()
+    pool = None
+    try:
+        # orden global por (peso, índice): el rango de cada arista desempata
+        w = np.asarray(pesos)
+        orden = np.argsort(w, kind="stable")
+        compartido.crear("u", np.asarray(origenes, dtype=np.int64)[orden])
+        compartido.crear("v", np.asarray(destinos, dtype=np.int64)[orden])
+        compartido.crear("w", w[orden])
+        compartido.crear("eid", np.arange(m, dtype=np.int64))
+        comp = compartido.crear("comp", np.arange(n, dtype=np.int64))
+        del orden
+
+        # bloques fijos: cada proceso compacta solo el suyo
+        tam = max(1, -(-m // (procesos * 4)))
+        bloques = [[i, min(tam, m - i)] for i in range(0, m, tam)]
+
+        if procesos > 1:
+            pool = crear_pool(procesos, initializer=iniciar_trabajador, initargs=(compartido.descriptor,))
+            mapear = pool.map
+        else:
+            iniciar_trabajador(compartido.descriptor)
+            mapear = lambda f, xs: [f(x) for x in xs]
+
+        uf = UnionFind(n)
+        mst: List[Tuple[Any, Any, Any]] = []
+        rondas: List[Dict[str, float]] = []
+        componentes = n
+        while componentes > 1:
+            t0 = time.perf_counter()
+            resultados = mapear(_buscar_en_bloque, [tuple(b) for b in bloques])
+            activas = 0
+            for b, (quedan, _) in zip(bloques, resultados):
+                b[1] = quedan
+                activas += quedan
+            candidatos = [r for _, r in resultados if len(r[0])]
+            if not candidatos:
+                break  # no quedan aristas entre componentes (grafo no conexo)
+            tocadas, rangos, eids, us, vs, ws = (np.concatenate(x) for x in zip(*candidatos))
+            mejor = np.full(n, m, dtype=np.int64)
+            np.minimum.at(mejor, tocadas, rangos)
+            ganadoras = np.isin(eids, mejor[tocadas])
+            t1 = time.perf_counter()
+
+            # contracción: una misma arista puede ser la mejor de sus dos componentes
+            for a, b, p in zip(us[ganadoras].tolist(), vs[ganadoras].tolist(), ws[ganadoras].tolist()):
+                if uf.union(a, b):
+                    mst.append((a, b, p))
+                    componentes -= 1
+            # reetiquetar solo las componentes que participaron en la ronda
+            raices = np.unique(tocadas)
+            mapa = np.arange(n, dtype=np.int64)
+            mapa[raices] = [uf.find(r) for r in raices.tolist()]
+            comp[:] = mapa[comp]
+            t2 = time.perf_counter()
+
+            rondas.append({
+                "ronda": len(rondas) + 1,
+                "componentes": componentes,
+                "aristas_activas": activas,
+                "busqueda_s": t1 - t0,
+                "contraccion_s": t2 - t1,
+            })
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+        else:
+            cerrar_trabajador()
+        compartido.cerrar(liberar=True)
+
+    if nodos is not None:
+        mst = [(nodos[a], nodos[b], p) for a, b, p in mst]
+    return mst, rondas
+
+
+# -------------------------
+# Benchmark
+# -------------------------
+def benchmark(n: int = 1_000_000, m: int = 10_000_000, seed: int = 0):
+    g = cargar("generador_grafos").gnm(n, m, seed, weight_range=(0.0, 1.0), conexo=True)
+    origenes, destinos, pesos = g.u, g.v, g.w
+
+    print(f"Benchmark Borůvka paralelo: n={n}, m={m}")
+    base = None
+    for p in range(1, (os.cpu_count() or 1) + 1):
+        t0 = time.perf_counter()
+        mst, rondas = boruvka_mst(n=n, origenes=origenes, destinos=destinos, pesos=pesos, procesos=p)
+        t = time.perf_counter() - t0
+        base = base or t
+        print(f"  procesos={p}: {t:.2f} s, {len(rondas)} rondas, {len(mst)} aristas, "
+              f"peso={sum(x[2] for x in mst):.4f}, aceleración={base / t:.2f}x")
+
+
+def ejemplo():
+    origenes = [0, 0, 1, 1, 2, 2, 3, 4]
+    destinos = [1, 2, 2, 3, 3, 4, 4, 5]
+    pesos = [4, 3, 1, 2, 4, 5, 7, 6]
+    mst, rondas = boruvka_mst(n=6, origenes=origenes, destinos=destinos, pesos=pesos, procesos=2)
+    print("Aristas del MST (Borůvka):")
+    for u, v, w in mst:
+        print(f"  ({u}, {v}) peso={w}")
+    print(f"Peso total = {sum(w for _, _, w in mst)}")
+    for r in rondas:
+        print(f"  Ronda {r['ronda']}: componentes={r['componentes']}, aristas activas={r['aristas_activas']}, "
+              f"búsqueda={r['busqueda_s'] * 1e3:.2f} ms, contracción={r['contraccion_s'] * 1e3:.2f} ms")
+
+
+if __name__ == "__main__":
+    if "--benchmark" in sys.argv:
+        benchmark()
+    else:
+        ejemplo()
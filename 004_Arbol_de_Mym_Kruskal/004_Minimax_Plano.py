@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+004_Minimax_Plano.py
+
+Minimax y poda alfa-beta sobre un árbol de juego guardado en arreglos planos,
+sin objetos por nodo y sin recursión.
+
+Representación (orden por niveles, los hijos de un nodo son contiguos):
+  - first[i]:  índice del primer hijo de i
+  - count[i]:  número de hijos de i (0 = hoja)
+  - value[i]:  valor de la hoja, o valor calculado para nodos internos (NaN antes)
+
+El evaluador usa una pila explícita con un marco por nivel (nodo, siguiente
+hijo, alpha, beta, mejor valor) preasignada a la altura del árbol, así que no
+hay límite de recursión ni asignación de memoria por nodo visitado.
+
+Requisitos:
+- numpy (solo para generar árboles aleatorios grandes)
+
+Uso:
+  python 004_Minimax_Plano.py               -> ejemplo pequeño
+  python 004_Minimax_Plano.py --benchmark   -> árbol con 1e7 hojas
+"""
+import math
+import os
+import sys
+import time
+from array import array
+from collections import deque
+from typing import Optional, Tuple
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from ia3 import cargar  # noqa: E402
+
+INF = float("inf")
+
+
+# -------------------------
+# Árbol en arreglos
+# -------------------------
+class FlatTree:
+    """Árbol de juego en arreglos compactos (ver docstring del módulo)."""
+    def __init__(self, first: array, count: array, value: array, height: int):
+        self.first = first
+        self.count = count
+        self.value = value
+        self.height = height
+
+    def __len__(self):
+        return len(self.count)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(a.itemsize * len(a) for a in (self.first, self.count, self.value))
+
+    def __repr__(self):
+        return f"FlatTree(nodes={len(self)}, height={self.height}, {self.nbytes / 2**20:.1f} MiB)"
+
+    @classmethod
+    def from_node(cls, root) -> Tuple["FlatTree", list]:
+        """
+        Convierte un árbol de Node (001_Arbol.py) recorriéndolo por niveles.
+        Devuelve (árbol, nodos) donde nodos[i] es el Node del índice i.
+        """
+        nodes = [root]
+        first, count, value = array("q"), array("H"), array("d")
+        levels = deque([(root, 0)])
+        height = 0
+        while levels:
+            n, level = levels.popleft()
+            height = max(height, level)
+            first.append(len(nodes) if n.children else 0)
+            count.append(len(n.children))
+            value.append(n.value if not n.children else math.nan)
+            for c in n.children:
+                nodes.append(c)
+                levels.append((c, level + 1))
+        return cls(first, count, value, height), nodes
+
+    @classmethod
+    def random_full(cls, depth: int, branching: int = 2, leaf_range=(0, 9), seed: Optional[int] = None) -> "FlatTree":
+        """
+        Árbol completo de profundidad 'depth' con hojas aleatorias en leaf_range.
+        Por niveles, los hijos del nodo i son branching*i + 1 ... branching*i + branching.
+        """
+        rng = np.random.default_rng(seed)
+        internal = (branching ** depth - 1) // (branching - 1) if branching > 1 else depth
+        total = internal * branching + 1
+        first = np.zeros(total, dtype=np.int64)
+        first[:internal] = np.arange(internal, dtype=np.int64) * branching + 1
+        count = np.zeros(total, dtype=np.uint16)
+        count[:internal] = branching
+        value = np.full(total, math.nan)
+        value[internal:] = rng.integers(leaf_range[0], leaf_range[1] + 1, total - internal)
+        return cls(_to_array("q", first), _to_array("H", count), _to_array("d", value), depth)
+
+
+_DTYPES = {"q": np.int64, "H": np.uint16, "d": np.float64}
+
+
+def _to_array(typecode: str, data: np.ndarray) -> array:
+    # array de la biblioteca estándar: misma memoria compacta que numpy, pero
+    # el acceso escalar desde Python es más rápido que indexar un ndarray.
+    out = array(typecode)
+    out.frombytes(data.astype(_DTYPES[typecode], copy=False).tobytes())
+    return out
+
+
+# -------------------------
+# Evaluación iterativa
+# -------------------------
+class FlatStats:
+    def __init__(self):
+        self.leaves = 0
+        self.cutoffs = 0
+
+    def __repr__(self):
+        return f"FlatStats(leaves={self.leaves}, cutoffs={self.cutoffs})"
+
+
+def minimax_flat(tree: FlatTree, maximizing_player: bool = True, alpha_beta: bool = False,
+                 root: int = 0, stats: Optional[FlatStats] = None,
+                 alpha: float = -INF, beta: float = INF) -> float:
+    """
+    Minimax (o alfa-beta si alpha_beta=True) con pila explícita.
+    Escribe el valor calculado de cada nodo interno visitado en tree.value.
+    'root' permite evaluar un subárbol y (alpha, beta) la ventana inicial;
+    con una ventana estrecha el resultado fuera de ella es solo una cota.
+    """
+    first, count, value = tree.first, tree.count, tree.value
+    h = tree.height + 1
+    st_node = [0] * h
+    st_next = [0] * h
+    st_alpha = [0.0] * h
+    st_beta = [0.0] * h
+    st_best = [0.0] * h
+    leaves = cutoffs = 0
+
+    sp = -1
+    n, a, b = root, alpha, beta
+    while True:
+        # bajar por el primer hijo hasta una hoja
+        while count[n]:
+            sp += 1
+            st_node[sp] = n
+            st_next[sp] = 1
+            st_alpha[sp] = a
+            st_beta[sp] = b
+            st_best[sp] = -INF if ((sp & 1) == 0) == maximizing_player else INF
+            n = first[n]
+        v = value[n]
+        leaves += 1
+
+        # subir propagando v mientras el marco actual esté terminado
+        while True:
+            if sp < 0:
+                if stats is not None:
+                    stats.leaves += leaves
+                    stats.cutoffs += cutoffs
+                return v
+            if ((sp & 1) == 0) == maximizing_player:
+                if v > st_best[sp]:
+                    st_best[sp] = v
+                    if v > st_alpha[sp]:
+                        st_alpha[sp] = v
+            else:
+                if v < st_best[sp]:
+                    st_best[sp] = v
+                    if v < st_beta[sp]:
+                        st_beta[sp] = v
+            p = st_node[sp]
+            k = st_next[sp]
+            pruned = alpha_beta and st_alpha[sp] >= st_beta[sp]
+            if pruned or k >= count[p]:
+                if pruned and k < count[p]:
+                    cutoffs += 1
+                v = st_best[sp]
+                value[p] = v
+                sp -= 1
+                continue
+            st_next[sp] = k + 1
+            n = first[p] + k
+            a, b = st_alpha[sp], st_beta[sp]
+            break
+
+
+# -------------------------
+# Benchmark
+# -------------------------
+def benchmark(depth: int = 7, branching: int = 10, seed: int = 0):
+    arbol = cargar("arbol_minimax")
+
+    # 1) Comparación con el árbol de Node en un tamaño que este aún soporta
+    import random
+    random.seed(seed)
+    root = arbol.build_random_full_tree(depth=5, branching=branching)
+    flat, _ = FlatTree.from_node(root)
+    for ab in (False, True):
+        t0 = time.perf_counter()
+        v_nodes = arbol.minimax(root, True, alpha_beta=ab)
+        t1 = time.perf_counter()
+        v_flat = minimax_flat(flat, True, alpha_beta=ab)
+        t2 = time.perf_counter()
+        print(f"1e5 hojas, alpha_beta={ab}: Node {t1 - t0:.3f} s, plano {t2 - t1:.3f} s "
+              f"(valores {v_nodes} / {v_flat})")
+
+    # 2) Árbol plano con branching**depth hojas
+    t0 = time.perf_counter()
+    tree = FlatTree.random_full(depth, branching, seed=seed)
+    t1 = time.perf_counter()
+    print(f"\n{branching ** depth:.0e} hojas: {tree}, construido en {t1 - t0:.1f} s")
+    for ab in (True, False):
+        stats = FlatStats()
+        t0 = time.perf_counter()
+        v = minimax_flat(tree, True, alpha_beta=ab, stats=stats)
+        t1 = time.perf_counter()
+        print(f"  alpha_beta={ab}: valor={v}, {t1 - t0:.3f} s, {stats}")
+
+
+def ejemplo():
+    # Árbol [[3, 5], [6, [9, 1]], [2, 7]] construido a mano en arreglos
+    first = array("q", [1, 4, 6, 8, 0, 0, 0, 10, 0, 0, 0, 0])
+    count = array("H", [3, 2, 2, 2, 0, 0, 0, 2, 0, 0, 0, 0])
+    nan = math.nan
+    value = array("d", [nan, nan, nan, nan, 3, 5, 6, nan, 2, 7, 9, 1])
+    tree = FlatTree(first, count, value, height=3)
+    stats = FlatStats()
+    print("Minimax plano =", minimax_flat(tree, True, stats=stats), stats)
+    stats = FlatStats()
+    print("Alfa-beta plano =", minimax_flat(tree, True, alpha_beta=True, stats=stats), stats)
+    print("Valores calculados:", list(tree.value))
+
+
+if __name__ == "__main__":
+    if "--benchmark" in sys.argv:
+        benchmark()
+    else:
+        ejemplo()
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+005_Minimax_Paralelo.py
+
+Búsqueda alfa-beta en paralelo sobre el árbol plano de 004_Minimax_Plano.py.
+
+Dos modos:
+- "split" (división de la raíz): los nodos a 'split_depth' jugadas de la raíz
+  se reparten entre un pool de procesos y se evalúan con ventana completa;
+  las primeras jugadas se combinan después con minimax. Es simple pero cada
+  subárbol se busca sin las cotas de sus hermanos (más nodos visitados).
+- "ybw" (Young Brothers Wait): el primer hijo de la raíz se busca en serie
+  para fijar una cota; los demás hermanos se buscan en paralelo con la ventana
+  (alpha, +inf) -- o (-inf, beta) si la raíz minimiza --, leyendo la cota
+  compartida más reciente (multiprocessing.Value) al empezar cada tarea.
+
+Ambos devuelven el mismo valor que alfa-beta en serie. El benchmark informa
+la aceleración y la sobrecarga de búsqueda (hojas visitadas en paralelo
+respecto a la búsqueda serie) para 1..N procesos.
+
+Uso:
+  python 005_Minimax_Paralelo.py               -> ejemplo pequeño
+  python 005_Minimax_Paralelo.py --benchmark   -> aceleración para 1..N procesos
+"""
+import multiprocessing as mp
+import os
+import sys
+import time
+from typing import List, Optional, Tuple
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from ia3 import cargar, crear_pool  # noqa: E402
+
+
+plano = cargar("minimax_plano")
+FlatTree, FlatStats, minimax_flat = plano.FlatTree, plano.FlatStats, plano.minimax_flat
+INF = plano.INF
+
+
+# -------------------------
+# Trabajadores
+# -------------------------
+_tree = None
+_shared_bound = None
+
+
+def _init_worker(tree, shared_bound):
+    global _tree, _shared_bound
+    _tree = tree
+    _shared_bound = shared_bound
+
+
+def _search_task(args) -> Tuple[int, float, int]:
+    """
+    Busca el subárbol de 'node'. Si use_bound, la ventana se ajusta con la
+    cota compartida vigente al empezar (alpha si la raíz maximiza, beta si no).
+    Devuelve (nodo, valor, hojas visitadas).
+    """
+    node, maximizing, root_maximizing, use_bound = args
+    alpha, beta = -INF, INF
+    if use_bound:
+        if root_maximizing:
+            alpha = _shared_bound.value
+        else:
+            beta = _shared_bound.value
+    stats = FlatStats()
+    value = minimax_flat(_tree, maximizing, alpha_beta=True, root=node, stats=stats, alpha=alpha, beta=beta)
+    return node, value, stats.leaves
+
+
+def _children(tree, n: int) -> List[int]:
+    first = tree.first[n]
+    return list(range(first, first + tree.count[n]))
+
+
+# -------------------------
+# Búsqueda paralela
+# -------------------------
+class ParallelResult:
+    def __init__(self, value: float, leaves: int, seconds: float):
+        self.value = value
+        self.leaves = leaves
+        self.seconds = seconds
+
+    def __repr__(self):
+        return f"ParallelResult(value={self.value}, leaves={self.leaves}, seconds={self.seconds:.3f})"
+
+
+def parallel_alphabeta(tree: FlatTree, maximizing_player: bool = True, workers: Optional[int] = None,
+                       mode: str = "ybw", split_depth: int = 1) -> ParallelResult:
+    """
+    Alfa-beta en paralelo sobre 'tree' (raíz = nodo 0).
+      mode="split": reparte los nodos a 'split_depth' jugadas de la raíz.
+      mode="ybw":   Young Brothers Wait en la raíz con cota compartida.
+    """
+    if mode not in ("split", "ybw"):
+        raise ValueError("mode debe ser 'split' o 'ybw'.")
+    workers = workers or os.cpu_count() or 1
+    t0 = time.perf_counter()
+    shared_bound = mp.Value("d", -INF if maximizing_player else INF)
+
+    if tree.count[0] == 0:
+        return ParallelResult(tree.value[0], 1, time.perf_counter() - t0)
+
+    with crear_pool(workers, initializer=_init_worker, initargs=(tree, shared_bound)) as pool:
+        if mode == "split":
+            # frontera a split_depth jugadas (o hojas antes de llegar)
+            levels = [[0]]
+            for _ in range(split_depth):
+                nxt = [c for n in levels[-1] if tree.count[n] for c in _children(tree, n)]
+                if not nxt:
+                    break
+                levels.append(nxt)
+            frontier = [n for level in levels[1:-1] for n in level if tree.count[n] == 0] + levels[-1]
+            depth_of = {n: d for d, level in enumerate(levels) for n in level}
+            tasks = [(n, (depth_of[n] % 2 == 0) == maximizing_player, maximizing_player, False) for n in frontier]
+            values = {}
+            leaves = 0
+            for node, value, n_leaves in pool.imap_unordered(_search_task, tasks):
+                values[node] = value
+                leaves += n_leaves
+            # combinar las jugadas superiores (minimax sobre los valores de la frontera)
+            for d in range(len(levels) - 2, -1, -1):
+                for n in levels[d]:
+                    if n in values:
+                        continue
+                    kids = [values[c] for c in _children(tree, n)]
+                    values[n] = max(kids) if (d % 2 == 0) == maximizing_player else min(kids)
+            return ParallelResult(values[0], leaves, time.perf_counter() - t0)
+
+        # Young Brothers Wait: hermano mayor en serie
+        kids = _children(tree, 0)
+        stats = FlatStats()
+        best = minimax_flat(tree, not maximizing_player, alpha_beta=True, root=kids[0], stats=stats)
+        leaves = stats.leaves
+        shared_bound.value = best
+        tasks = [(c, not maximizing_player, maximizing_player, True) for c in kids[1:]]
+        for _, value, n_leaves in pool.imap_unordered(_search_task, tasks):
+            leaves += n_leaves
+            if (value > best) if maximizing_player else (value < best):
+                best = value
+                with shared_bound.get_lock():
+                    if (best > shared_bound.value) if maximizing_player else (best < shared_bound.value):
+                        shared_bound.value = best
+        return ParallelResult(best, leaves, time.perf_counter() - t0)
+
+
+# -------------------------
+# Benchmark
+# -------------------------
+def benchmark(depth: int = 7, branching: int = 10, seed: int = 0, max_workers: Optional[int] = None):
+    # hojas con muchos valores distintos: con pocos valores casi todo se poda
+    tree = FlatTree.random_full(depth, branching, leaf_range=(0, 10**6), seed=seed)
+    print(f"Benchmark alfa-beta paralelo: {tree}")
+    stats = FlatStats()
+    t0 = time.perf_counter()
+    serial = minimax_flat(tree, True, alpha_beta=True, stats=stats)
+    t_serial = time.perf_counter() - t0
+    print(f"  serie: valor={serial}, {t_serial:.2f} s, {stats.leaves} hojas")
+    print(f"  {'modo':<6} {'procesos':>8} {'valor':>7} {'tiempo (s)':>11} {'aceleración':>12} {'sobrecarga':>11}")
+    for mode in ("split", "ybw"):
+        for w in range(1, (max_workers or os.cpu_count() or 1) + 1):
+            r = parallel_alphabeta(tree, True, workers=w, mode=mode, split_depth=2)
+            assert r.value == serial
+            print(f"  {mode:<6} {w:>8} {r.value:>7} {r.seconds:>11.2f} {t_serial / r.seconds:>11.2f}x "
+                  f"{r.leaves / stats.leaves:>10.2f}x")
+
+
+def ejemplo():
+    tree = FlatTree.random_full(depth=6, branching=5, seed=1)
+    serial = minimax_flat(tree, True, alpha_beta=True)
+    for mode in ("split", "ybw"):
+        r = parallel_alphabeta(tree, True, workers=2, mode=mode)
+        print(f"{mode}: {r} (serie = {serial})")
+
+
+if __name__ == "__main__":
+    if "--benchmark" in sys.argv:
+        benchmark()
+    else:
+        ejemplo()
@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+001_Generador_Grafos.py
+
+Generadores vectorizados de grafos aleatorios (no dirigidos, con pesos)
+para los benchmarks de Prim, Kruskal, Borůvka y Dijkstra.
+
+Modelos:
+- G(n, p): cada par con probabilidad p, en O(n + m) saltando pares con
+  una distribución geométrica (no se prueban los n² pares).
+- G(n, m): m pares distintos elegidos al azar.
+- Malla (grid) de filas x columnas, con 4 vecinos por nodo.
+- Geométrico ("tipo carretera"): puntos en el cuadrado unitario unidos si
+  están a distancia <= r; el peso es la distancia.
+- Ley de potencias (Chung-Lu): grados esperados con cola pesada.
+
+Todos devuelven un GrafoAristas (arreglos u, v, w) con semilla reproducible,
+que se puede pasar a CSR, a networkx o al diccionario que usa dijkstra.
+
+Requisitos:
+- numpy (networkx solo para a_networkx)
+"""
+import math
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+# -------------------------
+# Contenedor de aristas
+# -------------------------
+class GrafoAristas:
+    """
+    Grafo no dirigido como tres arreglos paralelos: u[k] - v[k] con peso w[k].
+    Los vértices son 0..n-1. No hay lazos ni aristas repetidas.
+    """
+    def __init__(self, n: int, u: np.ndarray, v: np.ndarray, w: np.ndarray):
+        self.n = n
+        self.u = u
+        self.v = v
+        self.w = w
+
+    @property
+    def m(self) -> int:
+        return len(self.u)
+
+    def __repr__(self):
+        return f"GrafoAristas(n={self.n}, m={self.m})"
+
+    def a_csr(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Devuelve (indptr, indices, pesos) con cada arista en ambos sentidos."""
+        origen = np.concatenate((self.u, self.v))
+        destino = np.concatenate((self.v, self.u))
+        pesos = np.concatenate((self.w, self.w))
+        orden = np.argsort(origen, kind="stable")
+        indptr = np.zeros(self.n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(origen, minlength=self.n), out=indptr[1:])
+        return indptr, destino[orden], pesos[orden]
+
+    def a_networkx(self):
+        """Grafo de networkx con atributo 'weight' (como el de ejemplo_grafo)."""
+        import networkx as nx
+        G = nx.Graph()
+        G.add_nodes_from(range(self.n))
+        G.add_weighted_edges_from(zip(self.u.tolist(), self.v.tolist(), self.w.tolist()))
+        return G
+
+    def a_dict(self) -> Dict[int, List[Tuple[int, Any]]]:
+        """Diccionario {nodo: [(vecino, peso), ...]} en el formato de dijkstra."""
+        indptr, indices, pesos = self.a_csr()
+        indices, pesos = indices.tolist(), pesos.tolist()
+        return {i: list(zip(indices[indptr[i]:indptr[i + 1]], pesos[indptr[i]:indptr[i + 1]]))
+                for i in range(self.n)}
+
+
+def _pesos(rng: np.random.Generator, m: int, weight_range) -> np.ndarray:
+    lo, hi = weight_range
+    if isinstance(lo, float) or isinstance(hi, float):
+        return rng.uniform(lo, hi, m)
+    return rng.integers(lo, hi + 1, m)
+
+
+def _par_desde_indice(k: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Convierte el índice lineal k de un par (i, j), i < j, en el orden
+    (0,1), (0,2), (1,2), (0,3), (1,3), (2,3), ... a sus extremos.
+    """
+    j = ((1 + np.sqrt(1 + 8 * k.astype(np.float64))) / 2).astype(np.int64)
+    # corregir errores de redondeo de la raíz
+    j -= (j * (j - 1) // 2) > k
+    j += ((j + 1) * j // 2) <= k
+    i = k - j * (j - 1) // 2
+    return i, j
+
+
+# -------------------------
+# Modelos
+# -------------------------
+def gnp(n: int, p: float, seed: Optional[int] = None, weight_range=(1, 20)) -> GrafoAristas:
+    """
+    G(n, p) en O(n + m): en lugar de lanzar una moneda por par, se sortea
+    cuántos pares se saltan hasta el siguiente éxito (distribución geométrica).
+    """
+    rng = np.random.default_rng(seed)
+    total = n * (n - 1) // 2
+    if p <= 0 or total == 0:
+        vacio = np.empty(0, dtype=np.int64)
+        return GrafoAristas(n, vacio, vacio, _pesos(rng, 0, weight_range))
+    if p >= 1:
+        k = np.arange(total, dtype=np.int64)
+    else:
+        bloques = []
+        ultimo = -1
+        lote = max(1024, int(total * p * 1.05) + 16)
+        while ultimo < total:
+            saltos = rng.geometric(p, lote).astype(np.int64)
+            pos = ultimo + np.cumsum(saltos)
+            bloques.append(pos)
+            ultimo = int(pos[-1])
+            lote = max(1024, lote // 8)
+        k = np.concatenate(bloques)
+        k = k[k < total]
+    u, v = _par_desde_indice(k)
+    return GrafoAristas(n, u, v, _pesos(rng, len(k), weight_range))
+
+
+def gnm(n: int, m: int, seed: Optional[int] = None, weight_range=(1, 20),
+        conexo: bool = False) -> GrafoAristas:
+    """
+    G(n, m): m pares distintos elegidos uniformemente. Con conexo=True el
+    grafo incluye el camino 0-1-...-n-1 y los m - (n - 1) pares restantes
+    se eligen entre los que no son del camino.
+    """
+    rng = np.random.default_rng(seed)
+    total = n * (n - 1) // 2
+    if m > total:
+        raise ValueError(f"m={m} supera el número de pares posibles ({total}).")
+    if not conexo:
+        k = np.sort(rng.choice(total, size=m, replace=False))
+    else:
+        if m < n - 1:
+            raise ValueError(f"m={m} no alcanza para un grafo conexo de {n} nodos.")
+        # índice lineal de (j-1, j) y, restando su posición, cuántos pares libres hay antes de cada uno
+        j = np.arange(1, n, dtype=np.int64)
+        camino = j * (j - 1) // 2 + j - 1
+        libres = np.sort(rng.choice(total - (n - 1), size=m - (n - 1), replace=False))
+        libres += np.searchsorted(camino - np.arange(n - 1), libres, side="right")
+        k = np.concatenate((camino, libres))
+    u, v = _par_desde_indice(k.astype(np.int64))
+    return GrafoAristas(n, u, v, _pesos(rng, m, weight_range))
+
+
+def malla(filas: int, columnas: int, seed: Optional[int] = None, weight_range=(1, 20)) -> GrafoAristas:
+    """Malla filas x columnas; el nodo (f, c) es f * columnas + c."""
+    rng = np.random.default_rng(seed)
+    ids = np.arange(filas * columnas, dtype=np.int64).reshape(filas, columnas)
+    u = np.concatenate((ids[:, :-1].ravel(), ids[:-1, :].ravel()))
+    v = np.concatenate((ids[:, 1:].ravel(), ids[1:, :].ravel()))
+    return GrafoAristas(filas * columnas, u, v, _pesos(rng, len(u), weight_range))
+
+
+def geometrico(n: int, grado_medio: float = 6.0, radio: Optional[float] = None,
+               seed: Optional[int] = None) -> Tuple[GrafoAristas, np.ndarray]:
+    """
+    Grafo geométrico aleatorio ("tipo carretera"): n puntos en [0, 1)²,
+    unidos si su distancia es <= radio. Por defecto el radio se elige para
+    obtener el grado medio pedido. El peso es la distancia euclidiana.
+
+    Los pares candidatos se buscan por celdas de lado 'radio', así que el
+    costo es O(n + m) en lugar de comparar todos los pares.
+    Devuelve (grafo, puntos).
+    """
+    rng = np.random.default_rng(seed)
+    if radio is None:
+        radio = math.sqrt(grado_medio / (math.pi * max(n, 1)))
+    puntos = rng.random((n, 2))
+    celdas_lado = max(1, int(1 / radio))
+    cx = np.minimum((puntos[:, 0] * celdas_lado).astype(np.int64), celdas_lado - 1)
+    cy = np.minimum((puntos[:, 1] * celdas_lado).astype(np.int64), celdas_lado - 1)
+    celda = cx * celdas_lado + cy
+    orden = np.argsort(celda, kind="stable")
+    celda_ord = celda[orden]
+    inicio_celda = np.searchsorted(celda_ord, np.arange(celdas_lado * celdas_lado), side="left")
+    fin_celda = np.searchsorted(celda_ord, np.arange(celdas_lado * celdas_lado), side="right")
+    cx_o, cy_o = cx[orden], cy[orden]
+    pos = np.arange(n, dtype=np.int64)
+
+    us, vs = [], []
+    # media vecindad: cada par de celdas se revisa una sola vez
+    for dx, dy in ((0, 0), (1, -1), (1, 0), (1, 1), (0, 1)):
+        nx_, ny_ = cx_o + dx, cy_o + dy
+        valido = (nx_ < celdas_lado) & (ny_ >= 0) & (ny_ < celdas_lado)
+        origen = pos[valido]
+        vecina = nx_[valido] * celdas_lado + ny_[valido]
+        ini, fin = inicio_celda[vecina], fin_celda[vecina]
+        if dx == 0 and dy == 0:
+            ini = origen + 1  # misma celda: solo posteriores en el orden
+        cuantos = np.maximum(fin - ini, 0)
+        total = int(cuantos.sum())
+        if total == 0:
+            continue
+        # "arange irregular": para cada origen, los índices ini..fin-1
+        a = np.repeat(origen, cuantos)
+        desplaz = np.repeat(np.cumsum(cuantos) - cuantos, cuantos)
+        b = np.repeat(ini, cuantos) + (np.arange(total) - desplaz)
+        us.append(a)
+        vs.append(b)
+
+    if us:
+        a, b = np.concatenate(us), np.concatenate(vs)
+    else:
+        a = b = np.empty(0, dtype=np.int64)
+    pa, pb = puntos[orden[a]], puntos[orden[b]]
+    dist = np.hypot(pa[:, 0] - pb[:, 0], pa[:, 1] - pb[:, 1])
+    cerca = dist <= radio
+    u, v = orden[a[cerca]], orden[b[cerca]]
+    menor = np.minimum(u, v)
+    mayor = np.maximum(u, v)
+    return GrafoAristas(n, menor, mayor, dist[cerca]), puntos
+
+
+def ley_potencias(n: int, m: int, exponente: float = 2.5, seed: Optional[int] = None,
+                  weight_range=(1, 20)) -> GrafoAristas:
+    """
+    Grafo con distribución de grados de cola pesada (modelo de Chung-Lu):
+    el nodo i tiene grado esperado proporcional a (i + 1) ** (-1 / (exponente - 1)).
+    Se sortean ~m extremos por peso; se descartan lazos y repetidas.
+    """
+    rng = np.random.default_rng(seed)
+    pesos_nodo = (np.arange(1, n + 1, dtype=np.float64)) ** (-1.0 / (exponente - 1.0))
+    prob = pesos_nodo / pesos_nodo.sum()
+    u = rng.choice(n, size=m, p=prob)
+    v = rng.choice(n, size=m, p=prob)
+    menor, mayor = np.minimum(u, v), np.maximum(u, v)
+    sin_lazo = menor != mayor
+    clave = np.unique(menor[sin_lazo].astype(np.int64) * n + mayor[sin_lazo])
+    u, v = clave // n, clave % n
+    return GrafoAristas(n, u, v, _pesos(rng, len(u), weight_range))
+
+
+# -------------------------
+# Ejemplo de uso
+# -------------------------
+if __name__ == "__main__":
+    for nombre, fabrica in [
+        ("G(n,p) n=1e5 p=1e-4", lambda: gnp(100_000, 1e-4, seed=1)),
+        ("G(n,m) n=1e5 m=5e5", lambda: gnm(100_000, 500_000, seed=1)),
+        ("Malla 300x300", lambda: malla(300, 300, seed=1)),
+        ("Geométrico n=1e5", lambda: geometrico(100_000, grado_medio=6, seed=1)[0]),
+        ("Ley de potencias n=1e5", lambda: ley_potencias(100_000, 500_000, seed=1)),
+    ]:
+        t0 = time.perf_counter()
+        g = fabrica()
+        t1 = time.perf_counter()
+        print(f"{nombre:<24} -> {g}  ({(t1 - t0) * 1e3:.0f} ms)")
+
+    # Conversión al formato de dijkstra
+    pequeno = gnp(6, 0.5, seed=4)
+    print("\nFormato de dijkstra:", pequeno.a_dict())
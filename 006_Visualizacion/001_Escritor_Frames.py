@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+001_Escritor_Frames.py
+
+Escritor asíncrono de cuadros para las animaciones del repositorio
+(pasos de minimax en 001_Arbol.py, pasos de Prim en 001_Arbol_Parcial_Prim.py).
+
+El algoritmo (o el que dibuja) solo copia el lienzo RGBA y lo pone en una
+cola acotada; uno o más hilos en segundo plano lo codifican:
+  - .mp4 (u otra extensión de video): los cuadros crudos van por una tubería
+    a ffmpeg, que codifica en su propio proceso;
+  - .gif: se cuantizan a 256 colores en el hilo y se guardan al cerrar;
+  - directorio (o video sin ffmpeg disponible): un PNG por cuadro. La
+    compresión de PNG (zlib) libera el GIL, así que varios hilos sí
+    codifican en paralelo.
+
+Contrapresión (cola llena):
+  - politica="bloquear": el productor espera a que se libere lugar (no se
+    pierde ningún cuadro; el tiempo de espera se informa);
+  - politica="descartar": el cuadro se descarta y se cuenta; el productor
+    nunca espera al codificador.
+La memoria máxima en cola es tam_cola * ancho * alto * 4 bytes.
+
+Requisitos:
+- Pillow (incluido con matplotlib); ffmpeg opcional
+
+Uso:
+  python 001_Escritor_Frames.py   -> escribe cuadros sintéticos y muestra los tiempos
+"""
+import os
+import queue
+import shutil
+import subprocess
+import sys
+import threading
+import time
+from typing import List, Optional, Tuple
+
+_FIN = None  # centinela de la cola
+
+
+def ffmpeg_disponible() -> Optional[str]:
+    """Ruta de ffmpeg (la que usaría matplotlib) o None."""
+    try:
+        import matplotlib
+        ruta = matplotlib.rcParams["animation.ffmpeg_path"]
+    except ImportError:
+        ruta = "ffmpeg"
+    return shutil.which(ruta)
+
+
+def sin_pantalla() -> bool:
+    """
+    True si no hay dónde mostrar figuras: MPLBACKEND no interactivo
+    (Agg, pdf, svg, ...) o Linux sin DISPLAY ni WAYLAND_DISPLAY.
+    """
+    backend = os.environ.get("MPLBACKEND", "").lower()
+    if backend in ("agg", "pdf", "ps", "svg", "cairo", "template"):
+        return True
+    return sys.platform.startswith("linux") and not (os.environ.get("DISPLAY") or os.environ.get("WAYLAND_DISPLAY"))
+
+
+def usar_sin_pantalla():
+    """Modo sin pantalla explícito: backend Agg, plt.show()/plt.pause() no abren ventanas."""
+    import matplotlib
+    matplotlib.use("Agg", force=True)
+
+
+class EstadisticasEscritor:
+    def __init__(self):
+        self.cuadros = 0           # cuadros escritos
+        self.descartados = 0       # cuadros descartados por cola llena
+        self.render_s = 0.0        # tiempo dibujando (lo suma el productor)
+        self.espera_s = 0.0        # tiempo que el productor esperó por la cola
+        self.codificacion_s = 0.0  # tiempo de los hilos escribiendo/codificando
+        self.total_s = 0.0         # desde que se abrió hasta que terminó cerrar()
+
+    def sumar(self, otra: "EstadisticasEscritor") -> "EstadisticasEscritor":
+        """Acumula otra (p. ej. de otro proceso); el total es el mayor de los dos."""
+        self.cuadros += otra.cuadros
+        self.descartados += otra.descartados
+        self.render_s += otra.render_s
+        self.espera_s += otra.espera_s
+        self.codificacion_s += otra.codificacion_s
+        self.total_s = max(self.total_s, otra.total_s)
+        return self
+
+    def __repr__(self):
+        return (f"EstadisticasEscritor(cuadros={self.cuadros}, descartados={self.descartados}, "
+                f"render={self.render_s:.2f} s, espera={self.espera_s:.2f} s, "
+                f"codificación={self.codificacion_s:.2f} s, total={self.total_s:.2f} s)")
+
+
+class EscritorFrames:
+    """
+    Cola acotada + hilos escritores (ver docstring del módulo).
+
+    destino: "video.mp4", "anim.gif" o un directorio para PNG (step_001.png, ...).
+    Si se pide video y ffmpeg no está disponible, se escriben PNG en el
+    directorio con el mismo nombre sin extensión (self.formato dice cuál quedó).
+    tam: (ancho, alto) en píxeles de los cuadros RGBA.
+    """
+    def __init__(self, destino: str, tam: Tuple[int, int], fps: float = 2.0, tam_cola: int = 16,
+                 politica: str = "bloquear", hilos: int = 1, prefijo: str = "step_", inicio: int = 1):
+        if politica not in ("bloquear", "descartar"):
+            raise ValueError("politica debe ser 'bloquear' o 'descartar'.")
+        self.tam = tam
+        self.fps = fps
+        self.politica = politica
+        self.prefijo = prefijo
+        self.stats = EstadisticasEscritor()
+        self.archivos: List[str] = []
+        self._t0 = time.perf_counter()
+        self._siguiente = inicio
+        self._error: Optional[BaseException] = None
+        self._lock = threading.Lock()
+        self._proc = None
+        self._gif: List = []
+
+        base, ext = os.path.splitext(destino)
+        ext = ext.lower()
+        if ext == ".gif":
+            self.formato = "gif"
+        elif ext and ffmpeg_disponible():
+            self.formato = "video"
+        else:
+            self.formato = "png"
+            destino = base if ext else destino
+            os.makedirs(destino, exist_ok=True)
+        self.destino = destino
+        if self.formato == "video":
+            ancho, alto = tam
+            self._proc = subprocess.Popen(
+                [ffmpeg_disponible(), "-y", "-loglevel", "error", "-f", "rawvideo", "-pix_fmt", "rgba",
+                 "-s", f"{ancho}x{alto}", "-r", str(fps), "-i", "-",
+                 "-vf", "pad=ceil(iw/2)*2:ceil(ih/2)*2", "-pix_fmt", "yuv420p", destino],
+                stdin=subprocess.PIPE)
+        # video y GIF necesitan los cuadros en orden: un solo hilo
+        n_hilos = max(1, hilos) if self.formato == "png" else 1
+        self._cola: "queue.Queue" = queue.Queue(maxsize=max(1, tam_cola))
+        self._hilos = [threading.Thread(target=self._trabajar, daemon=True) for _ in range(n_hilos)]
+        for h in self._hilos:
+            h.start()
+
+    # -------------------------
+    # Productor
+    # -------------------------
+    def escribir(self, rgba) -> bool:
+        """
+        Encola un cuadro RGBA (bytes, memoryview o buffer del lienzo; se copia).
+        Devuelve False si se descartó por la política "descartar".
+        """
+        if self._error is not None:
+            raise RuntimeError("el escritor de cuadros falló") from self._error
+        item = (self._siguiente, bytes(rgba))
+        if self.politica == "descartar":
+            try:
+                self._cola.put_nowait(item)
+            except queue.Full:
+                self.stats.descartados += 1
+                return False
+        else:
+            t0 = time.perf_counter()
+            self._cola.put(item)
+            self.stats.espera_s += time.perf_counter() - t0
+        self._siguiente += 1
+        return True
+
+    def escribir_figura(self, fig) -> bool:
+        """Encola el contenido actual del lienzo Agg de 'fig' (no lo redibuja)."""
+        return self.escribir(fig.canvas.buffer_rgba())
+
+    def cerrar(self) -> EstadisticasEscritor:
+        """Espera a que se escriban los cuadros en cola y cierra el destino."""
+        for _ in self._hilos:
+            self._cola.put(_FIN)
+        for h in self._hilos:
+            h.join()
+        try:
+            if self._proc is not None:
+                self._proc.stdin.close()
+                if self._proc.wait() != 0 and self._error is None:
+                    self._error = RuntimeError(f"ffmpeg terminó con código {self._proc.returncode}.")
+            if self.formato == "gif" and self._gif:
+                t0 = time.perf_counter()
+                self._gif[0].save(self.destino, save_all=True, append_images=self._gif[1:],
+                                  duration=round(1000 / self.fps), loop=0)
+                self.stats.codificacion_s += time.perf_counter() - t0
+                self._gif = []
+        finally:
+            self.archivos.sort()
+            self.stats.total_s = time.perf_counter() - self._t0
+        if self._error is not None:
+            raise RuntimeError("el escritor de cuadros falló") from self._error
+        return self.stats
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+    # -------------------------
+    # Hilos escritores
+    # -------------------------
+    def _imagen(self, datos: bytes):
+        from PIL import Image
+        imagen = Image.frombuffer("RGBA", self.tam, datos, "raw", "RGBA", 0, 1)
+        # el gráfico tiene pocos colores: con paleta se codifica bastante más rápido
+        return imagen.convert("RGB").quantize(method=2)
+
+    def _trabajar(self):
+        while True:
+            item = self._cola.get()
+            if item is _FIN:
+                return
+            if self._error is not None:
+                continue  # vaciar la cola sin escribir
+            numero, datos = item
+            t0 = time.perf_counter()
+            try:
+                if self.formato == "video":
+                    self._proc.stdin.write(datos)
+                    archivo = None
+                elif self.formato == "gif":
+                    imagen = self._imagen(datos)
+                    archivo = None
+                else:
+                    archivo = os.path.join(self.destino, f"{self.prefijo}{numero:03d}.png")
+                    self._imagen(datos).save(archivo, compress_level=1)
+            except BaseException as e:
+                self._error = e
+                continue
+            with self._lock:
+                self.stats.cuadros += 1
+                self.stats.codificacion_s += time.perf_counter() - t0
+                if archivo:
+                    self.archivos.append(archivo)
+                elif self.formato == "gif":
+                    self._gif.append(imagen)
+
+
+# -------------------------
+# Ejemplo de uso
+# -------------------------
+if __name__ == "__main__":
+    ancho, alto, n = 800, 600, 120
+    cuadro = bytearray(ancho * alto * 4)
+    for destino, politica in (("cuadros_demo", "bloquear"), ("cuadros_demo", "descartar"), ("demo.gif", "bloquear")):
+        escritor = EscritorFrames(destino, (ancho, alto), fps=10, tam_cola=8, politica=politica, hilos=2)
+        t0 = time.perf_counter()
+        for i in range(n):
+            # "render" sintético: una franja que avanza
+            t1 = time.perf_counter()
+            cuadro[:] = b"\xff" * len(cuadro)
+            fila = (i * 5) % alto
+            cuadro[fila * ancho * 4:(fila + 10) * ancho * 4] = b"\x20\x60\xc0\xff" * (ancho * 10)
+            escritor.stats.render_s += time.perf_counter() - t1
+            escritor.escribir(cuadro)
+        t_productor = time.perf_counter() - t0
+        stats = escritor.cerrar()
+        print(f"{destino} ({escritor.formato}, {politica}): productor {t_productor:.2f} s; {stats}")
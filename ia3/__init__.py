@@ -0,0 +1,106 @@
+"""
+ia3
+
+Punto de entrada único para los algoritmos del repositorio:
+
+  python -m ia3 sort      [archivo] [--algoritmo mergesort] [--salida archivo] [--lineas]
+  python -m ia3 dijkstra  [archivo] [--origen A] [--no-dirigido]   (también .gr, .gr.gz y .grb)
+  python -m ia3 prim      [archivo] [--inicio 0] [--graficar prim.mp4]
+  python -m ia3 minimax   [archivo] [--algoritmo alphabeta] [--graficar minimax_steps]
+
+Sin archivo (o con "-") la entrada se lee de stdin. Al terminar se informa
+en stderr el tiempo de importación (cargar los scripts y, si se grafica,
+networkx/matplotlib) y el de ejecución.
+
+Los scripts numerados (001_..., 002_...) no son importables por su nombre
+de archivo: al importar ia3 se registra un buscador (sys.meta_path) que los
+importa con los nombres de SCRIPTS, y cargar() los carga solo cuando el
+comando los usa. Los scripts que usan otros scripts también los cargan con
+cargar(), así cada uno se carga una sola vez y con el mismo nombre de
+módulo. Ninguno importa bibliotecas de gráficos al cargarse; eso ocurre
+recién con --graficar.
+
+Los pools de procesos se crean con crear_pool(): cada trabajador importa ia3
+antes que nada, así puede deserializar funciones y objetos de los scripts
+también con los métodos de inicio spawn y forkserver (los procesos nuevos no
+heredan los módulos que el padre cargó con cargar()).
+"""
+import importlib
+import importlib.abc
+import importlib.util
+import os
+import sys
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# nombre del módulo -> ruta del script, relativa a la raíz del repositorio
+SCRIPTS = {
+    "burbuja": ("001_Metodos_de_Ordenamientos", "001_Metodo_Interno", "001_Bubuja.py"),
+    "insercion": ("001_Metodos_de_Ordenamientos", "001_Metodo_Interno", "002_Insercion_con_Simulacion.py"),
+    "seleccion": ("001_Metodos_de_Ordenamientos", "001_Metodo_Interno", "003_Seleccion_con_Simulacion.py"),
+    "quicksort": ("001_Metodos_de_Ordenamientos", "001_Metodo_Interno", "004_QuickSort.py"),
+    "mergesort": ("001_Metodos_de_Ordenamientos", "001_Metodo_Interno", "005_MergeSort.py"),
+    "radixsort": ("001_Metodos_de_Ordenamientos", "001_Metodo_Interno", "006_RadixSort.py"),
+    "shellsort": ("001_Metodos_de_Ordenamientos", "001_Metodo_Interno", "007_ShellSort.py"),
+    "samplesort": ("001_Metodos_de_Ordenamientos", "001_Metodo_Interno", "008_SampleSort_Paralelo.py"),
+    "cadenas": ("001_Metodos_de_Ordenamientos", "001_Metodo_Interno", "009_Ordenamiento_Cadenas.py"),
+    "straight_merging": ("001_Metodos_de_Ordenamientos", "002_Metodo_Externo", "001_Staright_Merging.py"),
+    "natural_merging": ("001_Metodos_de_Ordenamientos", "002_Metodo_Externo", "002_Natural_Merging.py"),
+    "balanced_merging": ("001_Metodos_de_Ordenamientos", "002_Metodo_Externo", "003_Balanced_MM.py"),
+    "polyphase": ("001_Metodos_de_Ordenamientos", "002_Metodo_Externo", "004_Polyphase_sort..py"),
+    "distribucion_runs": ("001_Metodos_de_Ordenamientos", "002_Metodo_Externo", "005_Distribution_Initial_Runs.py"),
+    "codec_runs": ("001_Metodos_de_Ordenamientos", "002_Metodo_Externo", "006_Codec_Runs.py"),
+    "cascada": ("001_Metodos_de_Ordenamientos", "002_Metodo_Externo", "007_Cascade_Oscilante.py"),
+    "mezcla_particionada": ("001_Metodos_de_Ordenamientos", "002_Metodo_Externo", "008_Mezcla_Particionada.py"),
+    "dijkstra": ("002_Algoritmo_de_Dijkstra.", "001_Algoritmo de Dijkstra.py"),
+    "cargador_grafos": ("002_Algoritmo_de_Dijkstra.", "002_Cargador_Grafos.py"),
+    "delta_stepping": ("002_Algoritmo_de_Dijkstra.", "003_Delta_Stepping.py"),
+    "prim_animado": ("003_Arbol_m_Prim", "001_Arbol_Parcial_Prim.py"),
+    "prim_csr": ("003_Arbol_m_Prim", "002_Prim_CSR.py"),
+    "mst_dinamico": ("003_Arbol_m_Prim", "003_MST_Dinamico.py"),
+    "arbol_minimax": ("004_Arbol_de_Mym_Kruskal", "001_Arbol.py"),
+    "kruskal": ("004_Arbol_de_Mym_Kruskal", "002_Kruskal.py"),
+    "boruvka_paralelo": ("004_Arbol_de_Mym_Kruskal", "003_Boruvka_Paralelo.py"),
+    "minimax_plano": ("004_Arbol_de_Mym_Kruskal", "004_Minimax_Plano.py"),
+    "minimax_paralelo": ("004_Arbol_de_Mym_Kruskal", "005_Minimax_Paralelo.py"),
+    "generador_grafos": ("005_Generador_de_Grafos", "001_Generador_Grafos.py"),
+    "escritor_frames": ("006_Visualizacion", "001_Escritor_Frames.py"),
+}
+
+
+class _BuscadorScripts(importlib.abc.MetaPathFinder):
+    """Hace importables los scripts de SCRIPTS con su nombre ("import codec_runs")."""
+    def find_spec(self, nombre, path=None, target=None):
+        if path is None and nombre in SCRIPTS:
+            return importlib.util.spec_from_file_location(nombre, os.path.join(RAIZ, *SCRIPTS[nombre]))
+        return None
+
+
+if not any(isinstance(b, _BuscadorScripts) for b in sys.meta_path):
+    sys.meta_path.insert(0, _BuscadorScripts())
+
+
+def cargar(nombre: str):
+    """Carga (una sola vez) el script registrado en SCRIPTS con ese nombre."""
+    if nombre not in SCRIPTS:
+        raise KeyError(nombre)
+    return importlib.import_module(nombre)
+
+
+def _iniciar_trabajador(inicializador, initargs):
+    # este módulo ya está importado (y el buscador registrado) al llegar aquí
+    if inicializador is not None:
+        modulo, nombre = inicializador
+        getattr(importlib.import_module(modulo), nombre)(*initargs)
+
+
+def crear_pool(procesos: int, initializer=None, initargs=()):
+    """
+    multiprocessing.Pool(procesos, initializer, initargs) cuyos trabajadores
+    importan ia3 primero. initializer, si se da, se pasa por nombre (módulo y
+    función) y el trabajador lo importa con el buscador ya registrado.
+    """
+    import multiprocessing as mp
+    if initializer is not None:
+        initializer = (initializer.__module__, initializer.__qualname__)
+    return mp.Pool(procesos, initializer=_iniciar_trabajador, initargs=(initializer, initargs))
@@ -0,0 +1,324 @@
+"""
+Línea de comandos de ia3 (ver el docstring del paquete).
+
+Formatos de entrada:
+  - sort: números separados por espacios, comas o saltos de línea; con
+    --lineas, una cadena por línea (URLs, rutas, ...).
+  - dijkstra / prim: una arista por línea, "u v [peso]" (espacios o comas;
+    '#' inicia un comentario; sin peso vale 1). Los nodos son etiquetas.
+    dijkstra acepta además archivos DIMACS (.gr, .gr.gz) y el formato
+    binario .grb (ver 002_Cargador_Grafos.py); en DIMACS los vértices se
+    numeran desde 1, también en --origen/--destino y en la salida.
+  - minimax: el árbol como listas anidadas de Python, p. ej. [[3, 5], [6, [9, 1]], [2, 7]].
+
+La salida (lista ordenada, distancias, aristas del árbol, valor) va a stdout;
+los resúmenes y los tiempos, a stderr.
+"""
+import argparse
+import contextlib
+import os
+import sys
+import time
+from typing import Any, Iterator, List, Tuple
+
+from ia3 import cargar
+
+# algoritmo -> (script, función); los "_simulacion" imprimen cada paso
+ORDENAMIENTOS = {
+    "mergesort": ("mergesort", "merge_sort"),
+    "quicksort": ("quicksort", "quicksort"),
+    "shellsort": ("shellsort", "shell_sort_simulacion"),
+    "radixsort": ("radixsort", "radix_sort"),
+    "samplesort": ("samplesort", "sample_sort"),  # numpy, en paralelo
+    "msdradix": ("cadenas", "msd_radix_sort"),  # solo cadenas (--lineas)
+    "multikey": ("cadenas", "multikey_quicksort"),
+    "insercion": ("insercion", "insertion_sort_simulacion_corregida"),
+    "seleccion": ("seleccion", "selection_sort_simulacion"),
+    "burbuja": ("burbuja", "bubble_sort_simulacion"),
+    "straight": ("straight_merging", "straight_merging_sort"),
+    "natural": ("natural_merging", "natural_merging_sort"),
+    "balanced": ("balanced_merging", "balanced_multiway_sort"),
+    "polyphase": ("polyphase", "polyphase_sort"),
+    "cascade": ("cascada", "cascade_sort"),
+    "oscillating": ("cascada", "oscillating_sort"),
+    "python": (None, "sorted"),
+}
+EXTERNOS = ("straight", "balanced", "polyphase", "cascade", "oscillating")  # reciben el tamaño de run (--ram)
+CONSULTAS = ("natural", "balanced")  # aceptan --limite y --rango
+ALGORITMOS_MINIMAX = ("minimax", "alphabeta", "pvs", "mtdf")  # = ALGORITHMS de 001_Arbol.py
+
+
+class Tiempos:
+    """Separa el tiempo de importación (scripts y bibliotecas) del de ejecución."""
+    def __init__(self):
+        self.importacion = 0.0
+        self.grafico = 0.0
+
+    def cargar(self, nombre: str):
+        t0 = time.perf_counter()
+        modulo = cargar(nombre)
+        self.importacion += time.perf_counter() - t0
+        return modulo
+
+    @contextlib.contextmanager
+    def importando(self):
+        t0 = time.perf_counter()
+        yield
+        self.importacion += time.perf_counter() - t0
+
+
+# -------------------------
+# Lectura de la entrada
+# -------------------------
+def _leer(archivo: str) -> str:
+    if archivo in (None, "-"):
+        return sys.stdin.read()
+    with open(archivo, encoding="utf-8") as f:
+        return f.read()
+
+
+def _numero(texto: str):
+    try:
+        return int(texto)
+    except ValueError:
+        return float(texto)
+
+
+def _aristas(texto: str) -> Iterator[Tuple[str, str, Any]]:
+    for n, linea in enumerate(texto.splitlines(), start=1):
+        campos = linea.split("#", 1)[0].replace(",", " ").split()
+        if not campos:
+            continue
+        if len(campos) not in (2, 3):
+            raise ValueError(f"línea {n}: se esperaba 'u v [peso]', se leyó {linea.strip()!r}.")
+        yield campos[0], campos[1], _numero(campos[2]) if len(campos) == 3 else 1
+
+
+# -------------------------
+# Comandos
+# -------------------------
+def cmd_sort(args, t: Tiempos):
+    if args.algoritmo in ("msdradix", "multikey") and not args.lineas:
+        raise ValueError(f"{args.algoritmo} ordena cadenas: use --lineas.")
+    texto = _leer(args.archivo)
+    if args.lineas:
+        datos = texto.splitlines()
+    else:
+        datos = [_numero(x) for x in texto.replace(",", " ").split()]
+    script, funcion = ORDENAMIENTOS[args.algoritmo]
+    ordenar = getattr(t.cargar(script), funcion) if script else sorted
+    extra = (args.ram,) if args.algoritmo in EXTERNOS else ()
+    consulta = {}
+    if args.limite is not None or args.rango is not None:
+        if args.algoritmo not in CONSULTAS:
+            raise ValueError(f"--limite y --rango solo valen con {' o '.join(CONSULTAS)}.")
+        consulta = {"limit": args.limite, "key_range": tuple(args.rango) if args.rango else None}
+    # los scripts imprimen cada paso: sin --traza esa salida se descarta
+    with open(os.devnull, "w") as nulo, contextlib.redirect_stdout(sys.stderr if args.traza else nulo):
+        resultado = ordenar(datos, *extra, **consulta)
+        if consulta:  # devuelven un iterador
+            resultado = list(resultado)
+    if resultado is None:  # merge_sort ordena en el lugar
+        resultado = datos
+    texto = "\n".join(map(str, resultado))
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as f:
+            f.write(texto + "\n")
+    elif texto:
+        print(texto)
+    print(f"{args.algoritmo}: {len(resultado)} elementos", file=sys.stderr)
+
+
+FORMATOS_GRAFO = (".gr", ".gr.gz", ".grb")
+
+
+def _dijkstra_archivo(args, t: Tiempos):
+    """
+    dijkstra sobre un .gr / .grb, en CSR (sin pasar por el diccionario).
+    Los vértices DIMACS se numeran desde 1, en --origen/--destino y en la
+    salida; los de un .grb sin etiquetas son sus índices (desde 0).
+    """
+    if args.no_dirigido or args.traza:
+        raise ValueError(f"--no-dirigido y --traza no se usan con archivos {', '.join(FORMATOS_GRAFO)}.")
+    cargador = t.cargar("cargador_grafos")
+    dimacs = not args.archivo.endswith(".grb")
+    grafo = cargador.cargar_dimacs(args.archivo) if dimacs else cargador.abrir_binario(args.archivo)
+    if grafo.n == 0:
+        raise ValueError("el grafo está vacío.")
+    base = 1 if dimacs else 0
+
+    def indice(nodo):
+        return int(nodo) - base if grafo.etiquetas is None else grafo.indice(nodo)
+
+    def nombre(i):
+        return i + base if grafo.etiquetas is None else grafo.nombre(i)
+
+    try:
+        origen = indice(args.origen) if args.origen is not None else 0
+        destinos = [indice(args.destino)] if args.destino is not None else range(grafo.n)
+    except (KeyError, ValueError):
+        raise ValueError("el origen o el destino no está en el grafo.") from None
+    if not all(0 <= i < grafo.n for i in (origen, *destinos)):
+        raise ValueError("el origen o el destino no está en el grafo.")
+    dist, prev = cargador.dijkstra_csr(grafo, grafo.nombre(origen))
+    for i in destinos:
+        if dist[i] == float("inf"):
+            print(f"{nombre(i)}\tinf\t-")
+            continue
+        camino = []
+        j = i
+        while j != -1:
+            camino.append(str(nombre(j)))
+            j = prev[j]
+        print(f"{nombre(i)}\t{dist[i]:g}\t{' -> '.join(reversed(camino))}")
+    alcanzados = int((dist != float("inf")).sum())
+    print(f"dijkstra desde {nombre(origen)}: {alcanzados}/{grafo.n} nodos alcanzables", file=sys.stderr)
+
+
+def cmd_dijkstra(args, t: Tiempos):
+    if args.archivo.endswith(FORMATOS_GRAFO):
+        return _dijkstra_archivo(args, t)
+    grafo = {}
+    for u, v, w in _aristas(_leer(args.archivo)):
+        grafo.setdefault(u, []).append((v, w))
+        grafo.setdefault(v, [])
+        if args.no_dirigido:
+            grafo[v].append((u, w))
+    if not grafo:
+        raise ValueError("el grafo está vacío.")
+    origen = args.origen if args.origen is not None else next(iter(grafo))
+    if origen not in grafo:
+        raise ValueError(f"el origen {origen!r} no está en el grafo.")
+    modulo = t.cargar("dijkstra")
+    with contextlib.redirect_stdout(sys.stderr):
+        dist, prev = modulo.dijkstra(grafo, origen, verbose=args.traza)
+    destinos = [args.destino] if args.destino is not None else list(grafo)
+    for destino in destinos:
+        if destino not in dist:
+            raise ValueError(f"el destino {destino!r} no está en el grafo.")
+        if dist[destino] == float("inf"):
+            print(f"{destino}\tinf\t-")
+        else:
+            print(f"{destino}\t{dist[destino]}\t{' -> '.join(modulo.reconstruir_camino(prev, destino))}")
+    alcanzados = sum(d != float("inf") for d in dist.values())
+    print(f"dijkstra desde {origen}: {alcanzados}/{len(dist)} nodos alcanzables", file=sys.stderr)
+
+
+def cmd_prim(args, t: Tiempos):
+    aristas = list(_aristas(_leer(args.archivo)))
+    ids = {}
+    for u, v, _ in aristas:
+        ids.setdefault(u, len(ids))
+        ids.setdefault(v, len(ids))
+    nodos = list(ids)
+    if not nodos:
+        raise ValueError("el grafo está vacío.")
+    inicio = args.inicio if args.inicio is not None else nodos[0]
+    if inicio not in ids:
+        raise ValueError(f"el nodo inicial {inicio!r} no está en el grafo.")
+    prim = t.cargar("prim_csr")
+    csr = prim.aristas_a_csr(len(nodos), [ids[u] for u, _, _ in aristas], [ids[v] for _, v, _ in aristas],
+                             [w for _, _, w in aristas], nodos)
+    mst = prim.prim_mst(csr, start=inicio)
+    for u, v, w in mst:
+        print(f"{u}\t{v}\t{w}")
+    print(f"prim desde {inicio}: {len(mst)} aristas, peso total = {sum(w for _, _, w in mst)}", file=sys.stderr)
+    if len(mst) < len(nodos) - 1:
+        print(f"aviso: el grafo no es conexo; es el árbol de la componente de {inicio}.", file=sys.stderr)
+
+    if args.graficar:
+        with t.importando():
+            animado = cargar("prim_animado")
+            import networkx as nx
+            import matplotlib.figure  # noqa: F401 (se cuenta como importación)
+        t0 = time.perf_counter()
+        G = nx.Graph()
+        G.add_weighted_edges_from(aristas)
+        pos = nx.spring_layout(G, seed=2)
+        pasos = list(animado.prim_steps(G, start=inicio, deltas=True))
+        r = animado.AnimadorPrim(G, pos).guardar(pasos, args.graficar, fps=args.fps)
+        t.grafico = time.perf_counter() - t0
+        print(f"animación en '{r['destino']}' ({r['formato']}, {r['cuadros']} cuadros)", file=sys.stderr)
+
+
+def cmd_minimax(args, t: Tiempos):
+    import ast
+    estructura = ast.literal_eval(_leer(args.archivo).strip())
+    arbol = t.cargar("arbol_minimax")
+    root = arbol.build_tree_from_nested(estructura, name_prefix="N")
+    recorder = arbol.StepRecorder() if args.graficar else None
+    stats = arbol.SearchStats()
+    valor = arbol.minimax(root, maximizing_player=not args.min, recorder=recorder,
+                          algorithm=args.algoritmo, stats=stats)
+    print(valor)
+    print(f"{args.algoritmo}: {stats}", file=sys.stderr)
+
+    if args.graficar:
+        with t.importando():
+            import networkx  # noqa: F401
+            import matplotlib.figure  # noqa: F401
+        t0 = time.perf_counter()
+        # con extensión (.mp4, .gif) un solo archivo; si no, un PNG por paso en ese directorio
+        destino = {"video": args.graficar} if os.path.splitext(args.graficar)[1] else {"out_dir": args.graficar}
+        with contextlib.redirect_stdout(sys.stderr):
+            arbol.play_snapshots(root, recorder, delay=1.0 / args.fps, headless=True, **destino)
+        t.grafico = time.perf_counter() - t0
+
+
+# -------------------------
+# Argumentos
+# -------------------------
+def crear_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m ia3", description="Algoritmos del curso IA 3.")
+    sub = parser.add_subparsers(dest="comando", required=True)
+
+    def comando(nombre, funcion, ayuda):
+        p = sub.add_parser(nombre, help=ayuda, description=ayuda)
+        p.add_argument("archivo", nargs="?", default="-", help="entrada (por defecto stdin)")
+        p.add_argument("--traza", action="store_true", help="mostrar (en stderr) la traza paso a paso del script")
+        p.set_defaults(funcion=funcion)
+        return p
+
+    p = comando("sort", cmd_sort, "Ordena una lista de números (o de cadenas, con --lineas).")
+    p.add_argument("--algoritmo", choices=list(ORDENAMIENTOS), default="mergesort")
+    p.add_argument("--ram", type=int, default=1000, help="tamaño de run de los ordenamientos externos (por defecto 1000)")
+    p.add_argument("--salida", help="archivo de salida (por defecto stdout)")
+    p.add_argument("--lineas", action="store_true", help="ordenar cadenas, una por línea, en lugar de números")
+    p.add_argument("--limite", type=int, help="solo los N menores (natural, balanced)")
+    p.add_argument("--rango", nargs=2, type=_numero, metavar=("LO", "HI"),
+                   help="solo las claves con LO <= x < HI (natural, balanced)")
+
+    p = comando("dijkstra", cmd_dijkstra, "Caminos más cortos desde un origen (Dijkstra).")
+    p.add_argument("--origen", help="nodo de origen (por defecto el primero de la entrada)")
+    p.add_argument("--destino", help="solo este destino")
+    p.add_argument("--no-dirigido", action="store_true", help="cada arista vale en ambos sentidos")
+
+    p = comando("prim", cmd_prim, "Árbol de expansión mínima (Prim).")
+    p.add_argument("--inicio", help="nodo inicial (por defecto el primero de la entrada)")
+    p.add_argument("--graficar", metavar="DESTINO", help="guardar la animación (.mp4, .gif o directorio de PNG)")
+    p.add_argument("--fps", type=float, default=1.0)
+
+    p = comando("minimax", cmd_minimax, "Valor minimax de un árbol dado como listas anidadas.")
+    p.add_argument("--algoritmo", choices=ALGORITMOS_MINIMAX, default="alphabeta")
+    p.add_argument("--min", action="store_true", help="la raíz minimiza")
+    p.add_argument("--graficar", metavar="DESTINO", help="guardar los pasos (.mp4, .gif o directorio de PNG)")
+    p.add_argument("--fps", type=float, default=2.0)
+    return parser
+
+
+def main(argv: List[str] = None) -> int:
+    args = crear_parser().parse_args(argv)
+    t = Tiempos()
+    t0 = time.perf_counter()
+    try:
+        args.funcion(args, t)
+    except (OSError, ValueError, SyntaxError, RecursionError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    total = time.perf_counter() - t0
+    ejecucion = total - t.importacion - t.grafico
+    linea = f"tiempos: importación {t.importacion * 1e3:.1f} ms, ejecución {ejecucion * 1e3:.1f} ms"
+    if args.__dict__.get("graficar"):
+        linea += f", gráfico {t.grafico:.2f} s"
+    print(linea, file=sys.stderr)
+    return 0
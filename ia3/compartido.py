@@ -0,0 +1,88 @@
+"""
+Arreglos de numpy en memoria compartida (multiprocessing.shared_memory).
+
+Los usan los scripts que reparten un arreglo grande entre procesos sin
+copiarlo ni serializarlo: 008_SampleSort_Paralelo.py y 003_Boruvka_Paralelo.py.
+
+Del lado de los trabajadores: iniciar_trabajador es el initializer del pool
+(abre los arreglos una vez por proceso), arreglos_trabajador los devuelve
+y cerrar_trabajador los cierra; en un proceso hijo se llama sola al salir.
+"""
+import multiprocessing
+from multiprocessing import shared_memory, util
+from typing import Dict, Optional
+
+import numpy as np
+
+
+class ArreglosCompartidos:
+    """
+    Agrupa arreglos de numpy respaldados por memoria compartida.
+    'descriptor' (nombre, forma, dtype por arreglo) basta para abrirlos
+    desde otro proceso sin copiar los datos.
+    """
+    def __init__(self):
+        self.bloques: Dict[str, shared_memory.SharedMemory] = {}
+        self.arreglos: Dict[str, np.ndarray] = {}
+
+    def crear(self, nombre: str, datos: np.ndarray) -> np.ndarray:
+        arr = self.crear_vacio(nombre, datos.shape, datos.dtype)
+        arr[...] = datos
+        return arr
+
+    def crear_vacio(self, nombre: str, forma, dtype) -> np.ndarray:
+        """Como crear, pero sin copiar datos (el contenido queda sin inicializar)."""
+        dtype = np.dtype(dtype)
+        shm = shared_memory.SharedMemory(create=True, size=max(int(np.prod(forma)) * dtype.itemsize, 1))
+        arr = np.ndarray(forma, dtype=dtype, buffer=shm.buf)
+        self.bloques[nombre] = shm
+        self.arreglos[nombre] = arr
+        return arr
+
+    @property
+    def descriptor(self):
+        return {k: (self.bloques[k].name, a.shape, a.dtype.str) for k, a in self.arreglos.items()}
+
+    @classmethod
+    def abrir(cls, descriptor) -> "ArreglosCompartidos":
+        obj = cls()
+        for k, (nombre, forma, dtype) in descriptor.items():
+            shm = shared_memory.SharedMemory(name=nombre)
+            obj.bloques[k] = shm
+            obj.arreglos[k] = np.ndarray(forma, dtype=np.dtype(dtype), buffer=shm.buf)
+        return obj
+
+    def cerrar(self, liberar: bool = False):
+        self.arreglos.clear()
+        for shm in self.bloques.values():
+            shm.close()
+            if liberar:
+                shm.unlink()
+        self.bloques.clear()
+
+
+# -------------------------
+# Lado de los trabajadores
+# -------------------------
+_abiertos: Optional[ArreglosCompartidos] = None
+
+
+def iniciar_trabajador(descriptor):
+    """Abre los arreglos de 'descriptor' para este proceso (initializer del pool)."""
+    global _abiertos
+    cerrar_trabajador()
+    _abiertos = ArreglosCompartidos.abrir(descriptor)
+    if multiprocessing.parent_process() is not None:
+        # el trabajador termina con pool.close() + join(): cerrar los segmentos al salir
+        util.Finalize(None, cerrar_trabajador, exitpriority=10)
+
+
+def arreglos_trabajador() -> Dict[str, np.ndarray]:
+    return _abiertos.arreglos
+
+
+def cerrar_trabajador():
+    global _abiertos
+    if _abiertos is not None:
+        _abiertos.cerrar()
+        _abiertos = None
@@ -0,0 +1,44 @@
+"""Snapshots de StepRecorder en una búsqueda perezosa (nodos descubiertos después de los checkpoints)."""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ia3 import cargar
+
+arbol = cargar("arbol_minimax")
+
+
+def nim_children(state):
+    fichas, turno_max = state
+    for k in (1, 2, 3):
+        if k <= fichas:
+            yield (fichas - k, not turno_max)
+
+
+def nim_evaluate(state):
+    fichas, turno_max = state
+    if fichas == 0:
+        return -1.0 if turno_max else 1.0
+    return 0.0
+
+
+def _busqueda_perezosa(checkpoint_every):
+    recorder = arbol.StepRecorder(checkpoint_every=checkpoint_every)
+    arbol.minimax((12, True), True, recorder=recorder, alpha_beta=True, children=nim_children,
+                  evaluate=nim_evaluate, depth=30)
+    return recorder
+
+
+def test_snapshot_igual_a_iter_snapshots_con_checkpoints():
+    for checkpoint_every in (4, 1024):
+        recorder = _busqueda_perezosa(checkpoint_every)
+        total = len(recorder.snapshots)
+        # la búsqueda pasa varios checkpoints y sigue descubriendo nodos después
+        assert total > 3 * 1024
+        recorridos = list(recorder.iter_snapshots())
+        for i, esperado in enumerate(recorridos):
+            assert recorder.snapshot(i) == esperado
+        assert recorder.snapshots[-1] == recorridos[-1]
+        # los tramos de render_steps(processes > 1) arrancan desde un checkpoint
+        assert list(recorder.iter_snapshots(1500, 2100)) == recorridos[1500:2100]
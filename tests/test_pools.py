@@ -0,0 +1,86 @@
+"""
+Pools de procesos con los métodos de inicio spawn y forkserver: los
+trabajadores no heredan los módulos cargados con ia3.cargar y tienen que
+poder importarlos por su nombre (antes quedaban colgados en Pool.map).
+Cada caso corre en un intérprete aparte, con un tiempo límite.
+"""
+import multiprocessing
+import os
+import subprocess
+import sys
+import textwrap
+
+import pytest
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+METODOS = [m for m in ("spawn", "forkserver") if m in multiprocessing.get_all_start_methods()]
+
+CASOS = {
+    "boruvka": """
+        b = cargar("boruvka_paralelo")
+        mst, _ = b.boruvka_mst(n=6, origenes=[0, 0, 1, 1, 2, 2, 3, 4], destinos=[1, 2, 2, 3, 3, 4, 4, 5],
+                               pesos=[4, 3, 1, 2, 4, 5, 7, 6], procesos=2)
+        assert sum(w for _, _, w in mst) == 17
+    """,
+    "samplesort": """
+        import numpy as np
+        s = cargar("samplesort")
+        datos = np.random.default_rng(0).integers(0, 1000, 5000)
+        assert np.array_equal(s.sample_sort(datos, procesos=2), np.sort(datos))
+    """,
+    "minimax": """
+        p, plano = cargar("minimax_paralelo"), cargar("minimax_plano")
+        arbol = plano.FlatTree.random_full(5, 4, seed=0)
+        for modo in ("split", "ybw"):
+            assert p.parallel_alphabeta(arbol, True, workers=2, mode=modo).value == \\
+                plano.minimax_flat(arbol, True, alpha_beta=True)
+    """,
+    "mezcla_particionada": """
+        m, codec = cargar("mezcla_particionada"), cargar("codec_runs")
+        runs = [sorted(range(i, 300, 7)) for i in range(7)]
+        assert m.mezcla_particionada(runs, procesos=2) == sorted(x for r in runs for x in r)
+        almacen = codec.AlmacenRuns("varint", bloque=16)
+        try:
+            archivos = [almacen.escribir(r) for r in runs]
+            assert m.mezcla_particionada(archivos, almacen, procesos=2).leer() == sorted(range(300))
+        finally:
+            almacen.cerrar()
+    """,
+    "mezcla_final": """
+        straight, balanced = cargar("straight_merging"), cargar("balanced_merging")
+        datos = list(range(50, 0, -1))
+        assert balanced.balanced_multiway_sort(datos, 5, 3, procesos=2) == sorted(datos)
+        assert straight.straight_merging_sort(datos, 5, procesos=2) == sorted(datos)
+    """,
+    "render_steps": """
+        import tempfile
+        import matplotlib
+        matplotlib.use("Agg")
+        a = cargar("arbol_minimax")
+        raiz = a.build_tree_from_nested([[3, 5], [6, [9, 1]], [2, 7]])
+        rec = a.StepRecorder()
+        a.minimax(raiz, True, recorder=rec, alpha_beta=False)
+        with tempfile.TemporaryDirectory() as d:
+            archivos, stats = a.render_steps(raiz, rec, d, processes=2)
+        assert len(archivos) == stats.cuadros == len(rec.snapshots)
+    """,
+}
+
+
+def correr_con_metodo(metodo: str, codigo: str, tiempo: float = 180):
+    """Corre 'codigo' (con 'cargar' ya importado) con el método de inicio dado."""
+    programa = (f"import multiprocessing, sys\n"
+                f"sys.path.insert(0, {RAIZ!r})\n"
+                f"multiprocessing.set_start_method({metodo!r})\n"
+                f"from ia3 import cargar\n" + textwrap.dedent(codigo))
+    r = subprocess.run([sys.executable, "-c", programa], capture_output=True, text=True, timeout=tiempo)
+    assert r.returncode == 0, r.stderr
+
+
+@pytest.mark.parametrize("metodo", METODOS)
+@pytest.mark.parametrize("caso", sorted(CASOS))
+def test_pool_con_metodo_de_inicio(metodo, caso):
+    if caso == "render_steps":
+        pytest.importorskip("matplotlib")
+        pytest.importorskip("networkx")
+    correr_con_metodo(metodo, CASOS[caso])